@@ -8,3 +8,10 @@ class AuthPort(ABC):
     def get_current_user(self, token: str) -> dict:
         """Valida un token y retorna la identidad del usuario"""
         pass
+
+
+class AsyncAuthPort(ABC):
+    @abstractmethod
+    async def get_current_user(self, token: str) -> dict:
+        """Valida un token y retorna la identidad del usuario"""
+        pass
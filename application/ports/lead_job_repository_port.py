@@ -0,0 +1,26 @@
+# application/ports/lead_job_repository_port.py
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from domain.models.lead_conversion_job import LeadConversionJob
+
+
+class LeadJobRepositoryPort(ABC):
+
+    @abstractmethod
+    def create(self, job: LeadConversionJob) -> LeadConversionJob:
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[LeadConversionJob]:
+        pass
+
+    @abstractmethod
+    def save(self, job: LeadConversionJob) -> LeadConversionJob:
+        """Guarda el checkpoint del job; falla con ConflictException si otro worker lo modificó"""
+        pass
+
+    @abstractmethod
+    def list_unfinished(self) -> List[LeadConversionJob]:
+        """Jobs pendientes o en curso, para reanudarlos al reiniciar"""
+        pass
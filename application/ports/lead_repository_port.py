@@ -1,10 +1,49 @@
 # application/ports/lead_repository_port.py
 from abc import ABC, abstractmethod
+from typing import Dict, List, Set
 from domain.models.lead import Lead
+from domain.models.lead_bulk_result import LeadBulkResult
 
 
 class LeadRepositoryPort(ABC):
     @abstractmethod
-    def create_lead(self, lead: Lead) -> None:
+    def create_lead(self, lead: Lead, lead_id: str) -> None:
         """Crea un lead en el repositorio (ej. SQL Server)"""
         pass
+
+    @abstractmethod
+    def create_leads_bulk(self, leads: Dict[str, Lead], verify_user: bool = True) -> LeadBulkResult:
+        """Crea varios leads (lead_id -> Lead) en una sola operación, reportando fallos por fila"""
+        pass
+
+    @abstractmethod
+    def user_exists(self, user_id: str) -> bool:
+        """Indica si el usuario asignado existe"""
+        pass
+
+    @abstractmethod
+    def get_existing_ids(self, lead_ids: List[str]) -> Set[str]:
+        """Devuelve cuáles de los Ids indicados ya existen, para reanudar conversiones sin duplicar"""
+        pass
+
+
+class AsyncLeadRepositoryPort(ABC):
+    @abstractmethod
+    async def create_lead(self, lead: Lead, lead_id: str) -> None:
+        """Crea un lead en el repositorio (ej. SQL Server)"""
+        pass
+
+    @abstractmethod
+    async def create_leads_bulk(self, leads: Dict[str, Lead], verify_user: bool = True) -> LeadBulkResult:
+        """Crea varios leads (lead_id -> Lead) en una sola operación, reportando fallos por fila"""
+        pass
+
+    @abstractmethod
+    async def user_exists(self, user_id: str) -> bool:
+        """Indica si el usuario asignado existe"""
+        pass
+
+    @abstractmethod
+    async def get_existing_ids(self, lead_ids: List[str]) -> Set[str]:
+        """Devuelve cuáles de los Ids indicados ya existen, para reanudar conversiones sin duplicar"""
+        pass
@@ -1,8 +1,9 @@
 # application/ports/opportunity_detail_repository_port.py
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 
 from domain.models.opportunity_detail import OpportunityDetail
+from domain.models.page import Page
 
 
 class OpportunityDetailRepositoryPort(ABC):
@@ -11,6 +12,47 @@ class OpportunityDetailRepositoryPort(ABC):
     def get_all(self) -> List[OpportunityDetail]:
         pass
 
+    @abstractmethod
+    def get_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityDetail]:
+        """Obtiene una página de Details a partir de un token de continuación"""
+        pass
+
+    @abstractmethod
+    def iter_all(self) -> Iterator[OpportunityDetail]:
+        """Recorre todos los Details a medida que llegan del feed, sin cargarlos en memoria"""
+        pass
+
     @abstractmethod
     def get_by_opportunity_id(self, opportunity_id: int) -> OpportunityDetail:
         pass
+
+    @abstractmethod
+    def get_by_opportunity_ids(self, opportunity_ids: List[int]) -> List[OpportunityDetail]:
+        """Obtiene en una sola consulta los Details de varias oportunidades"""
+        pass
+
+
+class AsyncOpportunityDetailRepositoryPort(ABC):
+
+    @abstractmethod
+    async def get_all(self) -> List[OpportunityDetail]:
+        pass
+
+    @abstractmethod
+    async def get_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityDetail]:
+        """Obtiene una página de Details a partir de un token de continuación"""
+        pass
+
+    @abstractmethod
+    def iter_all(self) -> AsyncIterator[OpportunityDetail]:
+        """Recorre todos los Details a medida que llegan del feed, sin cargarlos en memoria"""
+        pass
+
+    @abstractmethod
+    async def get_by_opportunity_id(self, opportunity_id: int) -> OpportunityDetail:
+        pass
+
+    @abstractmethod
+    async def get_by_opportunity_ids(self, opportunity_ids: List[int]) -> List[OpportunityDetail]:
+        """Obtiene en una sola consulta los Details de varias oportunidades"""
+        pass
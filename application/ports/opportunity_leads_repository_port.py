@@ -1,8 +1,11 @@
 # application/ports/opportunity_leads_repository_port.py
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 
+from domain.models.opportunity_lead import OpportunityLead
+from domain.models.opportunity_lead_count import OpportunityLeadCount
 from domain.models.opportunity_leads import OpportunityLeads
+from domain.models.page import Page
 
 
 class OpportunityLeadsRepositoryPort(ABC):
@@ -11,16 +14,123 @@ class OpportunityLeadsRepositoryPort(ABC):
     def get_all(self) -> List[OpportunityLeads]:
         pass
 
+    @abstractmethod
+    def get_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityLeads]:
+        """Obtiene una página de OpportunityLeads a partir de un token de continuación"""
+        pass
+
+    @abstractmethod
+    def iter_all(self) -> Iterator[OpportunityLeads]:
+        """Recorre todos los OpportunityLeads a medida que llegan del feed, sin cargarlos en memoria"""
+        pass
+
+    @abstractmethod
+    def get_agent_ids(self) -> List[int]:
+        """Obtiene los IdAgte distintos con OpportunityLeads"""
+        pass
+
     @abstractmethod
     def get_by_agte_id(self, agte_id: int) -> List[OpportunityLeads]:
         pass
 
+    @abstractmethod
+    def get_lead_counts_by_agte_id(self, agte_id: int) -> List[OpportunityLeadCount]:
+        """Obtiene OpportunityId, Priority y número de leads de las oportunidades activas del agente"""
+        pass
+
     @abstractmethod
     def get_by_opportunity_id_and_agte(self, opportunity_id: int, id_agte: int) -> Optional[OpportunityLeads]:
         """Obtiene un OpportunityLeads desde el repositorio por opportunity_id y idAgte"""
         pass
 
+    @abstractmethod
+    def get_leads(
+        self, opportunity_id: int, id_agte: int, continuation: Optional[str] = None, page_size: Optional[int] = None
+    ) -> Page[OpportunityLead]:
+        """Obtiene una página de los leads de una oportunidad, en su orden, a partir de un token de continuación"""
+        pass
+
+    @abstractmethod
+    def get_by_opportunity_ids_and_agte(self, opportunity_ids: List[int], id_agte: int) -> List[OpportunityLeads]:
+        """Obtiene en una sola consulta los OpportunityLeads del agente para varios opportunity_id"""
+        pass
+
     @abstractmethod
     def update(self, opportunity_lead: OpportunityLeads) -> None:
         """Actualiza un lead de oportunidad en el repositorio."""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def patch_status(
+            self, opportunity_lead: OpportunityLeads, status: int, claimed_by: Optional[str] = None
+    ) -> OpportunityLeads:
+        """
+        Cambia solo el Status del documento; con claimed_by anota además ClaimedBy y
+        ClaimedAt. Si el modelo trae etag, falla con ConflictException cuando otro
+        proceso lo modificó; devuelve el modelo actualizado.
+        """
+        pass
+
+
+class AsyncOpportunityLeadsRepositoryPort(ABC):
+
+    @abstractmethod
+    async def get_all(self) -> List[OpportunityLeads]:
+        pass
+
+    @abstractmethod
+    async def get_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityLeads]:
+        """Obtiene una página de OpportunityLeads a partir de un token de continuación"""
+        pass
+
+    @abstractmethod
+    def iter_all(self) -> AsyncIterator[OpportunityLeads]:
+        """Recorre todos los OpportunityLeads a medida que llegan del feed, sin cargarlos en memoria"""
+        pass
+
+    @abstractmethod
+    async def get_agent_ids(self) -> List[int]:
+        """Obtiene los IdAgte distintos con OpportunityLeads"""
+        pass
+
+    @abstractmethod
+    async def get_by_agte_id(self, agte_id: int) -> List[OpportunityLeads]:
+        pass
+
+    @abstractmethod
+    async def get_lead_counts_by_agte_id(self, agte_id: int) -> List[OpportunityLeadCount]:
+        """Obtiene OpportunityId, Priority y número de leads de las oportunidades activas del agente"""
+        pass
+
+    @abstractmethod
+    async def get_by_opportunity_id_and_agte(self, opportunity_id: int, id_agte: int) -> Optional[OpportunityLeads]:
+        """Obtiene un OpportunityLeads desde el repositorio por opportunity_id y idAgte"""
+        pass
+
+    @abstractmethod
+    async def get_leads(
+        self, opportunity_id: int, id_agte: int, continuation: Optional[str] = None, page_size: Optional[int] = None
+    ) -> Page[OpportunityLead]:
+        """Obtiene una página de los leads de una oportunidad, en su orden, a partir de un token de continuación"""
+        pass
+
+    @abstractmethod
+    async def get_by_opportunity_ids_and_agte(self, opportunity_ids: List[int], id_agte: int) -> List[OpportunityLeads]:
+        """Obtiene en una sola consulta los OpportunityLeads del agente para varios opportunity_id"""
+        pass
+
+    @abstractmethod
+    async def update(self, opportunity_lead: OpportunityLeads) -> None:
+        """Actualiza un lead de oportunidad en el repositorio."""
+        pass
+
+    @abstractmethod
+    async def patch_status(
+            self, opportunity_lead: OpportunityLeads, status: int, claimed_by: Optional[str] = None
+    ) -> OpportunityLeads:
+        """
+        Cambia solo el Status del documento; con claimed_by anota además ClaimedBy y
+        ClaimedAt. Si el modelo trae etag, falla con ConflictException cuando otro
+        proceso lo modificó; devuelve el modelo actualizado.
+        """
+        pass
@@ -0,0 +1,40 @@
+# application/ports/opportunity_summary_store_port.py
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional
+
+from domain.models.agent_opportunity_summary import AgentOpportunitySummary
+
+
+class OpportunitySummaryStorePort(ABC):
+
+    @abstractmethod
+    def get(self, id_agte: int) -> Optional[AgentOpportunitySummary]:
+        """Obtiene el resumen materializado de un agente con una lectura puntual"""
+        pass
+
+    @abstractmethod
+    def save(self, summary: AgentOpportunitySummary) -> AgentOpportunitySummary:
+        """Guarda el resumen; si trae etag falla con ConflictException cuando otro proceso lo modificó"""
+        pass
+
+    @abstractmethod
+    def get_agent_ids_with_opportunity(self, opportunity_id: int) -> List[int]:
+        """Agentes cuyo resumen incluye la oportunidad indicada"""
+        pass
+
+    @abstractmethod
+    def iter_all(self) -> Iterator[AgentOpportunitySummary]:
+        pass
+
+
+class AsyncOpportunitySummaryStorePort(ABC):
+
+    @abstractmethod
+    async def get(self, id_agte: int) -> Optional[AgentOpportunitySummary]:
+        """Obtiene el resumen materializado de un agente con una lectura puntual"""
+        pass
+
+    @abstractmethod
+    async def save(self, summary: AgentOpportunitySummary) -> AgentOpportunitySummary:
+        """Guarda el resumen; si trae etag falla con ConflictException cuando otro proceso lo modificó"""
+        pass
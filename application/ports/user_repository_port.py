@@ -8,3 +8,9 @@ class UserRepositoryPort(ABC):
         """Obtiene un usuario por su correo electrónico"""
         pass
 
+
+class AsyncUserRepositoryPort(ABC):
+    @abstractmethod
+    async def get_user_by_email(self, email: str) -> User:
+        """Obtiene un usuario por su correo electrónico"""
+        pass
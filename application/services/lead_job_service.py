@@ -0,0 +1,217 @@
+import logging
+import threading
+from concurrent.futures import Executor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from uuid import uuid4
+from core.exceptions import BusinessException, ConflictException, NotFoundException
+from application.ports.auth_port import AuthPort
+from application.ports.lead_job_repository_port import LeadJobRepositoryPort
+from application.ports.lead_repository_port import LeadRepositoryPort
+from application.ports.opportunity_leads_repository_port import OpportunityLeadsRepositoryPort
+from application.ports.user_repository_port import UserRepositoryPort
+from application.services.lead_service import (
+    CONVERTED_STATUS,
+    CONVERTING_STATUS,
+    build_lead,
+    ensure_claimable,
+    lead_id_for,
+    release_claim,
+)
+from domain.models.lead import Lead
+from domain.models.lead_bulk_result import LeadBulkFailure
+from domain.models.lead_conversion_job import LeadConversionJob, LeadJobStatus
+from domain.models.opportunity_leads import OpportunityLeads
+
+# Solo se conservan los últimos errores para acotar el tamaño del documento del job
+MAX_JOB_ERRORS = 100
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class LeadJobService:
+    """
+    Convierte los leads de una oportunidad en segundo plano, por bloques.
+    Cada bloque deja un checkpoint en el job, de modo que un job interrumpido
+    (reinicio, despliegue) se reanuda desde el último bloque confirmado. Al activarse
+    stop_event el job termina el bloque en curso y vuelve a pending. Cada bloque reclama
+    la oportunidad con el mismo protocolo que LeadService, de modo que un job y una
+    conversión síncrona no la convierten a la vez.
+    """
+
+    def __init__(
+            self,
+            job_repo: LeadJobRepositoryPort,
+            lead_repo: LeadRepositoryPort,
+            opportunity_leads_repo: OpportunityLeadsRepositoryPort,
+            user_repo: UserRepositoryPort,
+            auth: AuthPort,
+            executor: Executor,
+            chunk_size: int,
+            stop_event: Optional[threading.Event] = None,
+            claim_lease: float = 900.0
+    ):
+        self.job_repo = job_repo
+        self.lead_repo = lead_repo
+        self.opportunity_leads_repo = opportunity_leads_repo
+        self.user_repo = user_repo
+        self.auth = auth
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self.stop_event = stop_event or threading.Event()
+        self.claim_lease = claim_lease
+
+    def start_job(self, opportunity_id: int, token: str) -> LeadConversionJob:
+        current_user = self.auth.get_current_user(token)
+        user = self.user_repo.get_user_by_email(current_user["email"])
+
+        opportunity = self.opportunity_leads_repo.get_by_opportunity_id_and_agte(opportunity_id, user.id_agte)
+        if opportunity is None:
+            raise NotFoundException(f"No se encontró la oportunidad {opportunity_id}.")
+
+        job = self.job_repo.create(LeadConversionJob(
+            id=str(uuid4()),
+            OpportunityId=opportunity_id,
+            IdAgte=user.id_agte,
+            CreatedBy=user.id,
+            total=len(opportunity.leads),
+            created_at=_now(),
+        ))
+        logging.info(f"Job {job.id} creado para la oportunidad {opportunity_id} con {job.total} leads")
+        self.submit(job.id)
+        return job
+
+    def get_job(self, job_id: str, token: str) -> LeadConversionJob:
+        """Solo quien creó el job puede consultarlo; para los demás no existe."""
+        current_user = self.auth.get_current_user(token)
+        user = self.user_repo.get_user_by_email(current_user["email"])
+
+        job = self.job_repo.get(job_id)
+        if job is None or job.CreatedBy != user.id:
+            raise NotFoundException(f"No se encontró el job {job_id}.")
+        return job
+
+    def submit(self, job_id: str) -> None:
+        self.executor.submit(self.run_job, job_id)
+
+    def resume_unfinished(self) -> int:
+        """Reencola los jobs pendientes o interrumpidos; devuelve cuántos se reanudaron."""
+        jobs = self.job_repo.list_unfinished()
+        for job in jobs:
+            logging.info(f"Reanudando job {job.id} desde {job.processed}/{job.total}")
+            self.submit(job.id)
+        return len(jobs)
+
+    def _record_failures(self, job: LeadConversionJob, failures: List[LeadBulkFailure]) -> None:
+        job.failed += len(failures)
+        job.errors = (job.errors + failures)[-MAX_JOB_ERRORS:]
+
+    def _process_chunk(self, job: LeadConversionJob, opp_leads: list, start: int) -> None:
+        leads: Dict[str, Lead] = {}
+        failures = []
+        for index, opp_lead in enumerate(opp_leads, start=start):
+            lead_id = lead_id_for(job.OpportunityId, job.IdAgte, index)
+            try:
+                leads[lead_id] = build_lead(opp_lead, job.CreatedBy)
+            except Exception as e:
+                failures.append(LeadBulkFailure(lead_id=lead_id, documentNumber=opp_lead.nroDocum, error=str(e)))
+
+        # Los leads insertados antes de una interrupción no se vuelven a insertar
+        existing = self.lead_repo.get_existing_ids(list(leads))
+        pending = {lead_id: lead for lead_id, lead in leads.items() if lead_id not in existing}
+
+        result = self.lead_repo.create_leads_bulk(pending, verify_user=False)
+
+        job.processed = start + len(opp_leads)
+        job.created += len(existing) + len(result.created_ids)
+        self._record_failures(job, failures + result.failures)
+
+    def _patch_opportunity(self, opportunity: OpportunityLeads, status: int, claimed_by: Optional[str] = None) -> OpportunityLeads:
+        try:
+            return self.opportunity_leads_repo.patch_status(opportunity, status, claimed_by)
+        except ConflictException as e:
+            # No es un conflicto del job: el job termina como fallido con el detalle
+            raise BusinessException(e.detail, status_code=e.status_code) from e
+
+    def _claim(self, job: LeadConversionJob, opportunity: OpportunityLeads) -> OpportunityLeads:
+        """Reclama la oportunidad para el siguiente bloque; si ya es del job, renueva el reclamo."""
+        owner = f"job:{job.id}"
+        try:
+            ensure_claimable(opportunity, self.claim_lease, owner)
+        except ConflictException as e:
+            raise BusinessException(e.detail, status_code=e.status_code) from e
+        return self._patch_opportunity(opportunity, CONVERTING_STATUS, owner)
+
+    def _pause(self, job: LeadConversionJob) -> None:
+        """Deja el job en pending desde su último checkpoint para que se reanude al reiniciar."""
+        job.status = LeadJobStatus.pending
+        job.updated_at = _now()
+        self.job_repo.save(job)
+        logging.info(f"Job {job.id} detenido en {job.processed}/{job.total}; se reanudará al reiniciar")
+
+    def run_job(self, job_id: str) -> None:
+        if self.stop_event.is_set():
+            return
+        job = self.job_repo.get(job_id)
+        if job is None or job.status in (LeadJobStatus.completed, LeadJobStatus.failed):
+            return
+
+        try:
+            job.status = LeadJobStatus.running
+            job.started_at = job.started_at or _now()
+            job.updated_at = _now()
+            job = self.job_repo.save(job)
+
+            if not self.lead_repo.user_exists(job.CreatedBy):
+                raise NotFoundException("El usuario asignado no existe.")
+
+            opportunity = self.opportunity_leads_repo.get_by_opportunity_id_and_agte(job.OpportunityId, job.IdAgte)
+            if opportunity is None:
+                raise NotFoundException(f"No se encontró la oportunidad {job.OpportunityId}.")
+
+            job.total = len(opportunity.leads)
+            claimed = None
+            try:
+                for start in range(job.processed, job.total, self.chunk_size):
+                    if self.stop_event.is_set():
+                        if claimed is not None:
+                            release_claim(self.opportunity_leads_repo, claimed)
+                        self._pause(job)
+                        return
+                    # Renovar el reclamo en cada bloque evita que venza mientras el job avanza
+                    claimed = self._claim(job, claimed or opportunity)
+                    self._process_chunk(job, opportunity.leads[start:start + self.chunk_size], start)
+                    job.updated_at = _now()
+                    job = self.job_repo.save(job)
+                    logging.info(f"Job {job.id}: {job.processed}/{job.total} leads procesados")
+
+                claimed = claimed or self._claim(job, opportunity)
+                if job.failed:
+                    # Queda activa para reintentar, como en la conversión síncrona
+                    release_claim(self.opportunity_leads_repo, claimed)
+                else:
+                    self._patch_opportunity(claimed, CONVERTED_STATUS)
+            except Exception:
+                if claimed is not None:
+                    release_claim(self.opportunity_leads_repo, claimed)
+                raise
+
+            job.status = LeadJobStatus.completed
+            job.finished_at = job.updated_at = _now()
+            self.job_repo.save(job)
+            logging.info(f"Job {job.id} completado: creados {job.created}, fallidos {job.failed}")
+
+        except ConflictException:
+            # Otra instancia tomó el job; se deja que continúe ella
+            logging.warning(f"Job {job_id} modificado por otro proceso, se detiene esta ejecución")
+        except Exception as e:
+            logging.error(f"Job {job_id} falló: {str(e)}")
+            job.status = LeadJobStatus.failed
+            job.errors = (job.errors + [LeadBulkFailure(lead_id="", error=str(getattr(e, "detail", e)))])[-MAX_JOB_ERRORS:]
+            job.finished_at = job.updated_at = _now()
+            try:
+                self.job_repo.save(job)
+            except Exception as save_error:
+                logging.error(f"No se pudo registrar el fallo del job {job_id}: {str(save_error)}")
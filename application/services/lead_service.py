@@ -1,10 +1,121 @@
+import asyncio
 import logging
-from uuid import uuid4
-from application.ports.auth_port import AuthPort
-from application.ports.lead_repository_port import LeadRepositoryPort
-from application.ports.opportunity_leads_repository_port import OpportunityLeadsRepositoryPort
-from application.ports.user_repository_port import UserRepositoryPort
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set
+from uuid import NAMESPACE_URL, uuid5
+from core.exceptions import ConflictException, NotFoundException
+from application.ports.auth_port import AsyncAuthPort, AuthPort
+from application.ports.lead_repository_port import AsyncLeadRepositoryPort, LeadRepositoryPort
+from application.ports.opportunity_leads_repository_port import AsyncOpportunityLeadsRepositoryPort, OpportunityLeadsRepositoryPort
+from application.ports.user_repository_port import AsyncUserRepositoryPort, UserRepositoryPort
 from domain.models.lead import Lead
+from domain.models.lead_bulk_result import LeadBulkResult
+from domain.models.opportunity_conversion_result import OpportunityConversionResult, OpportunityConversionStatus
+from domain.models.opportunity_lead import OpportunityLead
+from domain.models.opportunity_leads import OpportunityLeads
+
+# Status de OpportunityLeads: la conversión la reclama con CONVERTING antes de insertar
+ACTIVE_STATUS = 1
+CONVERTING_STATUS = 2
+CONVERTED_STATUS = 0
+
+
+def lead_id_for(opportunity_id: int, id_agte: int, index: int) -> str:
+    """Id determinista del lead: un reintento o un job reanudado reconoce los leads ya insertados."""
+    return str(uuid5(NAMESPACE_URL, f"opportunity-leads/{opportunity_id}/{id_agte}/{index}"))
+
+
+def build_lead(opp_lead: OpportunityLead, created_by: str) -> Lead:
+    return Lead(
+        CreatedBy=created_by,
+        name=f"{opp_lead.nombres} {opp_lead.apellidos}",
+        email=opp_lead.emailCliente,
+        phone=opp_lead.celularCliente or opp_lead.telefonoCliente,
+        documentNumber=opp_lead.nroDocum,
+        company=opp_lead.empleadorCliente,
+        source="Market Dali",
+        campaign=None,
+        product=[],
+        stage="Nuevo",
+        priority="Media",
+        value=0,
+        assignedTo=created_by,
+        nextFollowUp=None,
+        notes=None,
+        tags=[],
+        DocumentType=opp_lead.tipoDocum,
+        SelectedPortfolios=[],
+        CampaignOwnerName=None,
+        Age=int(opp_lead.edad),
+        Gender=opp_lead.sexo,
+        PreferredContactChannel=None,
+        AdditionalInfo=opp_lead.extraDetails,
+    )
+
+
+def build_leads(opportunity: OpportunityLeads, created_by: str) -> Dict[str, Lead]:
+    return {
+        lead_id_for(opportunity.OpportunityId, opportunity.IdAgte, index): build_lead(opp_lead, created_by)
+        for index, opp_lead in enumerate(opportunity.leads)
+    }
+
+
+def ensure_claimable(opportunity: OpportunityLeads, lease: float, owner: Optional[str] = None) -> None:
+    """
+    Falla con 409 si otra conversión tiene reclamada la oportunidad. Un reclamo del mismo
+    owner, sin fecha o con más de lease segundos (proceso caído, liberación fallida) se
+    puede retomar; el patch condicionado al etag decide si dos lo intentan a la vez.
+    """
+    if opportunity.Status != CONVERTING_STATUS or (owner is not None and opportunity.ClaimedBy == owner):
+        return
+    claimed_at = opportunity.ClaimedAt
+    if claimed_at is not None and (datetime.now(timezone.utc) - claimed_at).total_seconds() < lease:
+        raise ConflictException(f"La oportunidad {opportunity.OpportunityId} ya se está convirtiendo en otro proceso.")
+    logging.warning(
+        f"Se retoma el reclamo vencido de la oportunidad {opportunity.OpportunityId} "
+        f"({opportunity.ClaimedBy}, {claimed_at})"
+    )
+
+
+def release_claim(opportunity_leads_repo: OpportunityLeadsRepositoryPort, claimed: OpportunityLeads) -> None:
+    """Devuelve la oportunidad a activa; si falla, el reclamo vence solo pasado el lease."""
+    try:
+        opportunity_leads_repo.patch_status(claimed, ACTIVE_STATUS)
+    except Exception as e:
+        logging.error(f"No se pudo liberar la oportunidad {claimed.OpportunityId}: {str(getattr(e, 'detail', e))}")
+
+
+def conversion_result(
+        opportunity: OpportunityLeads, leads: Dict[str, Lead], existing: Set[str], result: LeadBulkResult
+) -> OpportunityConversionResult:
+    logging.info(f"Leads created: {len(result.created_ids)}, already present: {len(existing)}, failed: {len(result.failures)}")
+    for failure in result.failures:
+        logging.error(f"Lead {failure.lead_id} ({failure.documentNumber}) not created: {failure.error}")
+    converted = existing | set(result.created_ids)
+    return OpportunityConversionResult(
+        OpportunityId=opportunity.OpportunityId,
+        status=OpportunityConversionStatus.partial if result.failures else OpportunityConversionStatus.converted,
+        leads=[lead for lead_id, lead in leads.items() if lead_id in converted],
+        failures=result.failures,
+    )
+
+
+def not_found_result(opportunity_id: int) -> OpportunityConversionResult:
+    return OpportunityConversionResult(
+        OpportunityId=opportunity_id,
+        status=OpportunityConversionStatus.not_found,
+        error=f"No se encontró la oportunidad {opportunity_id}.",
+    )
+
+
+def error_result(opportunity_id: int, error: Exception) -> OpportunityConversionResult:
+    logging.error(f"Error al convertir la oportunidad {opportunity_id}: {str(error)}")
+    return OpportunityConversionResult(
+        OpportunityId=opportunity_id,
+        status=OpportunityConversionStatus.error,
+        error=str(getattr(error, "detail", error)),
+    )
 
 
 class LeadService:
@@ -13,12 +124,49 @@ class LeadService:
             lead_repo: LeadRepositoryPort, 
             opportunity_leads_repo: OpportunityLeadsRepositoryPort, 
             user_repo: UserRepositoryPort, 
-            auth: AuthPort
+            auth: AuthPort,
+            max_concurrency: int = 1,
+            claim_lease: float = 900.0
     ):
         self.lead_repo = lead_repo
         self.opportunity_leads_repo = opportunity_leads_repo
         self.user_repo = user_repo
         self.auth = auth
+        self.max_concurrency = max_concurrency
+        self.claim_lease = claim_lease
+
+    def _release(self, claimed: OpportunityLeads) -> None:
+        release_claim(self.opportunity_leads_repo, claimed)
+
+    def _convert_opportunity(
+            self, opportunity: OpportunityLeads, created_by: str, verify_user: bool = True
+    ) -> OpportunityConversionResult:
+        """
+        Reclama la oportunidad con un patch condicionado al etag antes de insertar: si
+        otra petición la convierte a la vez, esta falla con 409 sin haber insertado nada.
+        El reclamo lleva dueño y hora, así que si este proceso cae o no logra liberarlo
+        otra conversión lo retoma pasado claim_lease. Los ids deterministas hacen que un
+        reintento tras un fallo parcial solo inserte los leads que faltan.
+        """
+        ensure_claimable(opportunity, self.claim_lease)
+        claimed = self.opportunity_leads_repo.patch_status(opportunity, CONVERTING_STATUS, created_by)
+        try:
+            leads = build_leads(opportunity, created_by)
+            existing = self.lead_repo.get_existing_ids(list(leads))
+            pending = {lead_id: lead for lead_id, lead in leads.items() if lead_id not in existing}
+
+            logging.info(f"Creating {len(pending)} leads in database for opportunity {opportunity.OpportunityId}")
+            result = self.lead_repo.create_leads_bulk(pending, verify_user=verify_user)
+
+            if result.failures:
+                # Queda activa para reintentar; los leads ya creados no se duplican
+                self._release(claimed)
+            else:
+                self.opportunity_leads_repo.patch_status(claimed, CONVERTED_STATUS)
+        except Exception:
+            self._release(claimed)
+            raise
+        return conversion_result(opportunity, leads, existing, result)
 
     def create_leads_from_opportunity(self, opportunity_id: int, token: str):
         current_user = self.auth.get_current_user(token)
@@ -28,50 +176,137 @@ class LeadService:
         opportunity = self.opportunity_leads_repo.get_by_opportunity_id_and_agte(
             opportunity_id, user.id_agte
         )
+        if opportunity is None:
+            raise NotFoundException(f"No se encontró la oportunidad {opportunity_id}.")
+
+        return self._convert_opportunity(opportunity, user.id).leads
+
+    def create_leads_from_opportunities(self, opportunity_ids: List[int], token: str) -> List[OpportunityConversionResult]:
+        """
+        Convierte varias oportunidades con una sola validación del token, una sola
+        resolución del usuario y una sola consulta a Cosmos; las oportunidades se
+        convierten en paralelo con a lo sumo max_concurrency a la vez.
+        """
+        current_user = self.auth.get_current_user(token)
+        user = self.user_repo.get_user_by_email(current_user["email"])
+        if not self.lead_repo.user_exists(user.id):
+            raise NotFoundException("El usuario asignado no existe.")
+
+        opportunity_ids = list(dict.fromkeys(opportunity_ids))
+        opportunities = {
+            opportunity.OpportunityId: opportunity
+            for opportunity in self.opportunity_leads_repo.get_by_opportunity_ids_and_agte(opportunity_ids, user.id_agte)
+        }
+        if not opportunities:
+            return [not_found_result(opportunity_id) for opportunity_id in opportunity_ids]
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(opportunities)))) as executor:
+            futures = {
+                opportunity_id: executor.submit(self._convert_opportunity, opportunity, user.id, False)
+                for opportunity_id, opportunity in opportunities.items()
+            }
+
+        results = []
+        for opportunity_id in opportunity_ids:
+            future = futures.get(opportunity_id)
+            if future is None:
+                results.append(not_found_result(opportunity_id))
+                continue
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(error_result(opportunity_id, e))
+        return results
+
+
+class AsyncLeadService:
+    def __init__(
+            self,
+            lead_repo: AsyncLeadRepositoryPort,
+            opportunity_leads_repo: AsyncOpportunityLeadsRepositoryPort,
+            user_repo: AsyncUserRepositoryPort,
+            auth: AsyncAuthPort,
+            max_concurrency: int = 1,
+            claim_lease: float = 900.0
+    ):
+        self.lead_repo = lead_repo
+        self.opportunity_leads_repo = opportunity_leads_repo
+        self.user_repo = user_repo
+        self.auth = auth
+        self.max_concurrency = max_concurrency
+        self.claim_lease = claim_lease
+
+    async def _release(self, claimed: OpportunityLeads) -> None:
+        try:
+            await self.opportunity_leads_repo.patch_status(claimed, ACTIVE_STATUS)
+        except Exception as e:
+            logging.error(f"No se pudo liberar la oportunidad {claimed.OpportunityId}: {str(getattr(e, 'detail', e))}")
+
+    async def _convert_opportunity(self, opportunity: OpportunityLeads, created_by: str) -> OpportunityConversionResult:
+        ensure_claimable(opportunity, self.claim_lease)
+        claimed = await self.opportunity_leads_repo.patch_status(opportunity, CONVERTING_STATUS, created_by)
+        try:
+            leads = build_leads(opportunity, created_by)
+            existing = await self.lead_repo.get_existing_ids(list(leads))
+            pending = {lead_id: lead for lead_id, lead in leads.items() if lead_id not in existing}
+
+            logging.info(f"Creating {len(pending)} leads in database for opportunity {opportunity.OpportunityId}")
+            result = await self.lead_repo.create_leads_bulk(pending, verify_user=False)
+
+            if result.failures:
+                await self._release(claimed)
+            else:
+                await self.opportunity_leads_repo.patch_status(claimed, CONVERTED_STATUS)
+        except Exception:
+            await self._release(claimed)
+            raise
+        return conversion_result(opportunity, leads, existing, result)
+
+    async def create_leads_from_opportunity(self, opportunity_id: int, token: str):
+        current_user = await self.auth.get_current_user(token)
+        email = current_user["email"]
+        user = await self.user_repo.get_user_by_email(email)
+
+        # La oportunidad (Cosmos) y la verificación del usuario asignado (SQL) son independientes
+        opportunity, user_exists = await asyncio.gather(
+            self.opportunity_leads_repo.get_by_opportunity_id_and_agte(opportunity_id, user.id_agte),
+            self.lead_repo.user_exists(user.id),
+        )
+        if not user_exists:
+            raise NotFoundException("El usuario asignado no existe.")
+        if opportunity is None:
+            raise NotFoundException(f"No se encontró la oportunidad {opportunity_id}.")
+
+        return (await self._convert_opportunity(opportunity, user.id)).leads
+
+    async def create_leads_from_opportunities(self, opportunity_ids: List[int], token: str) -> List[OpportunityConversionResult]:
+        """
+        Convierte varias oportunidades con una sola validación del token, una sola
+        resolución del usuario y una sola consulta a Cosmos; las oportunidades se
+        convierten concurrentemente con a lo sumo max_concurrency a la vez.
+        """
+        current_user = await self.auth.get_current_user(token)
+        user = await self.user_repo.get_user_by_email(current_user["email"])
+
+        opportunity_ids = list(dict.fromkeys(opportunity_ids))
+        found, user_exists = await asyncio.gather(
+            self.opportunity_leads_repo.get_by_opportunity_ids_and_agte(opportunity_ids, user.id_agte),
+            self.lead_repo.user_exists(user.id),
+        )
+        if not user_exists:
+            raise NotFoundException("El usuario asignado no existe.")
+        opportunities = {opportunity.OpportunityId: opportunity for opportunity in found}
+
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def convert(opportunity_id: int) -> OpportunityConversionResult:
+            opportunity = opportunities.get(opportunity_id)
+            if opportunity is None:
+                return not_found_result(opportunity_id)
+            async with semaphore:
+                try:
+                    return await self._convert_opportunity(opportunity, user.id)
+                except Exception as e:
+                    return error_result(opportunity_id, e)
 
-        created_by = user.id
-
-        leads_created = []
-
-        for opp_lead in opportunity.leads:
-            logging.info(f"Processing lead: {opp_lead}")
-            lead = Lead(
-                CreatedBy=created_by,
-                name=f"{opp_lead.nombres} {opp_lead.apellidos}",
-                email=opp_lead.emailCliente,
-                phone=opp_lead.celularCliente or opp_lead.telefonoCliente,
-                documentNumber=opp_lead.nroDocum,
-                company=opp_lead.empleadorCliente,
-                source="Market Dali",
-                campaign=None,
-                product=[],
-                stage="Nuevo",
-                priority="Media",
-                value=0,
-                assignedTo=created_by,
-                nextFollowUp=None,
-                notes=None,
-                tags=[],
-                DocumentType=opp_lead.tipoDocum,
-                SelectedPortfolios=[],
-                CampaignOwnerName=None,
-                Age=int(opp_lead.edad),
-                Gender=opp_lead.sexo,
-                PreferredContactChannel=None,
-                AdditionalInfo=opp_lead.extraDetails,
-            )
-
-            logging.info(f"Creating lead in database: {lead}")
-
-            lead_id = str(uuid4())
-
-            self.lead_repo.create_lead(lead, lead_id)
-
-            logging.info(f"Lead created with ID: {lead_id}")
-
-            leads_created.append(lead)
-
-        opportunity.Status = 0
-        self.opportunity_leads_repo.update(opportunity)
-
-        return leads_created
+        return list(await asyncio.gather(*(convert(opportunity_id) for opportunity_id in opportunity_ids)))
@@ -1,7 +1,8 @@
 # application/services/opportunity_detail_service.py
-from typing import Dict, List, Optional
-from application.ports.opportunity_detail_repository_port import OpportunityDetailRepositoryPort
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+from application.ports.opportunity_detail_repository_port import AsyncOpportunityDetailRepositoryPort, OpportunityDetailRepositoryPort
 from domain.models.opportunity_detail import OpportunityDetail
+from domain.models.page import Page
 
 
 class OpportunityDetailService:
@@ -10,7 +11,29 @@ class OpportunityDetailService:
 
     def list_details(self) -> List[OpportunityDetail]:
         return self.repository.get_all()
+
+    def list_details_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityDetail]:
+        return self.repository.get_page(page_size, continuation)
+
+    def iter_details(self) -> Iterator[OpportunityDetail]:
+        return self.repository.iter_all()
     
     def get_detail_by_opportunity_id(self, opportunity_id: str) -> Optional[OpportunityDetail]:
         return self.repository.get_by_opportunity_id(opportunity_id)
 
+
+class AsyncOpportunityDetailService:
+    def __init__(self, repository: AsyncOpportunityDetailRepositoryPort):
+        self.repository = repository
+
+    async def list_details(self) -> List[OpportunityDetail]:
+        return await self.repository.get_all()
+
+    async def list_details_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityDetail]:
+        return await self.repository.get_page(page_size, continuation)
+
+    def iter_details(self) -> AsyncIterator[OpportunityDetail]:
+        return self.repository.iter_all()
+
+    async def get_detail_by_opportunity_id(self, opportunity_id: str) -> Optional[OpportunityDetail]:
+        return await self.repository.get_by_opportunity_id(opportunity_id)
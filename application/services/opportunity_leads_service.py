@@ -1,7 +1,9 @@
 # application/services/opportunity_leads_service.py
-from typing import Dict, List
-from application.ports.opportunity_leads_repository_port import OpportunityLeadsRepositoryPort
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+from application.ports.opportunity_leads_repository_port import AsyncOpportunityLeadsRepositoryPort, OpportunityLeadsRepositoryPort
+from domain.models.opportunity_lead import OpportunityLead
 from domain.models.opportunity_leads import OpportunityLeads
+from domain.models.page import Page
 
 
 class OpportunityLeadsService:
@@ -10,6 +12,39 @@ class OpportunityLeadsService:
 
     def list_leads(self) -> List[OpportunityLeads]:
         return self.repository.get_all()
+
+    def list_leads_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityLeads]:
+        return self.repository.get_page(page_size, continuation)
+
+    def iter_leads(self) -> Iterator[OpportunityLeads]:
+        return self.repository.iter_all()
     
     def get_leads_by_agte_id(self, agte_id: str) -> List[OpportunityLeads]:
         return self.repository.get_by_agte_id(agte_id)
+
+    def get_opportunity_leads_page(
+        self, agte_id: int, opportunity_id: int, page_size: int, continuation: Optional[str] = None
+    ) -> Page[OpportunityLead]:
+        return self.repository.get_leads(opportunity_id, agte_id, continuation, page_size)
+
+
+class AsyncOpportunityLeadsService:
+    def __init__(self, repository: AsyncOpportunityLeadsRepositoryPort):
+        self.repository = repository
+
+    async def list_leads(self) -> List[OpportunityLeads]:
+        return await self.repository.get_all()
+
+    async def list_leads_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityLeads]:
+        return await self.repository.get_page(page_size, continuation)
+
+    def iter_leads(self) -> AsyncIterator[OpportunityLeads]:
+        return self.repository.iter_all()
+
+    async def get_leads_by_agte_id(self, agte_id: str) -> List[OpportunityLeads]:
+        return await self.repository.get_by_agte_id(agte_id)
+
+    async def get_opportunity_leads_page(
+        self, agte_id: int, opportunity_id: int, page_size: int, continuation: Optional[str] = None
+    ) -> Page[OpportunityLead]:
+        return await self.repository.get_leads(opportunity_id, agte_id, continuation, page_size)
@@ -1,10 +1,30 @@
 # application/services/opportunity_summary_service.py
 from typing import Dict, List, Optional
-from application.ports.opportunity_detail_repository_port import OpportunityDetailRepositoryPort
-from application.ports.opportunity_leads_repository_port import OpportunityLeadsRepositoryPort
+from application.ports.opportunity_detail_repository_port import AsyncOpportunityDetailRepositoryPort, OpportunityDetailRepositoryPort
+from application.ports.opportunity_leads_repository_port import AsyncOpportunityLeadsRepositoryPort, OpportunityLeadsRepositoryPort
 from domain.models.opportunity_detail import OpportunityDetail
+from domain.models.opportunity_lead_count import OpportunityLeadCount
 from domain.models.opportunity_summary import OpportunitySummary
 
+
+def build_summaries(lead_counts: List[OpportunityLeadCount], details: Dict[int, OpportunityDetail]) -> List[OpportunitySummary]:
+    summaries = []
+    for lead_count in lead_counts:
+        detail = details.get(lead_count.OpportunityId)
+        if detail:
+            summary = OpportunitySummary(
+                OpportunityId=detail.OpportunityId,
+                Priority=lead_count.Priority,
+                lead_count=lead_count.lead_count,
+                Title=detail.Title,
+                Subtitle=detail.Subtitle,
+                Description=detail.Description,
+                Categories=detail.Categories
+            )
+            summaries.append(summary)
+    return summaries
+
+
 class OpportunitySummaryService:
     def __init__(self, opportunity_detail_repository: OpportunityDetailRepositoryPort, opportunity_leads_repository: OpportunityLeadsRepositoryPort):
         self.opportunity_detail_repository = opportunity_detail_repository
@@ -17,20 +37,25 @@ class OpportunitySummaryService:
         return self.repository.get_by_opportunity_id(opportunity_id)
     
     def list_opportunity_summary_by_agte_id(self, agte_id: str) -> List[OpportunitySummary]:
-        opportunities_leads = self.opportunity_leads_repository.get_by_agte_id(agte_id)
-        summaries = []
-        for opportunity_lead in opportunities_leads:
-            opportunity_id = opportunity_lead.OpportunityId
-            detail = self.opportunity_detail_repository.get_by_opportunity_id(opportunity_id)
-            if detail:
-                summary = OpportunitySummary(
-                    OpportunityId=detail.OpportunityId,
-                    Priority=opportunity_lead.Priority,
-                    lead_count=len(opportunity_lead.leads),
-                    Title=detail.Title,
-                    Subtitle=detail.Subtitle,
-                    Description=detail.Description,
-                    Categories=detail.Categories
-                )
-                summaries.append(summary)
-        return summaries
\ No newline at end of file
+        lead_counts = self.opportunity_leads_repository.get_lead_counts_by_agte_id(agte_id)
+        opportunity_ids = [lead_count.OpportunityId for lead_count in lead_counts]
+        details = {
+            detail.OpportunityId: detail
+            for detail in self.opportunity_detail_repository.get_by_opportunity_ids(opportunity_ids)
+        }
+        return build_summaries(lead_counts, details)
+
+
+class AsyncOpportunitySummaryService:
+    def __init__(self, opportunity_detail_repository: AsyncOpportunityDetailRepositoryPort, opportunity_leads_repository: AsyncOpportunityLeadsRepositoryPort):
+        self.opportunity_detail_repository = opportunity_detail_repository
+        self.opportunity_leads_repository = opportunity_leads_repository
+
+    async def list_opportunity_summary_by_agte_id(self, agte_id: str) -> List[OpportunitySummary]:
+        lead_counts = await self.opportunity_leads_repository.get_lead_counts_by_agte_id(agte_id)
+        opportunity_ids = [lead_count.OpportunityId for lead_count in lead_counts]
+        details = {
+            detail.OpportunityId: detail
+            for detail in await self.opportunity_detail_repository.get_by_opportunity_ids(opportunity_ids)
+        }
+        return build_summaries(lead_counts, details)
@@ -0,0 +1,233 @@
+# application/services/opportunity_summary_store_service.py
+import logging
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+from core.exceptions import ConflictException
+from application.ports.opportunity_detail_repository_port import AsyncOpportunityDetailRepositoryPort, OpportunityDetailRepositoryPort
+from application.ports.opportunity_summary_store_port import AsyncOpportunitySummaryStorePort, OpportunitySummaryStorePort
+from application.services.opportunity_summary_service import AsyncOpportunitySummaryService, OpportunitySummaryService, build_summaries
+from domain.models.agent_opportunity_summary import AgentOpportunitySummary
+from domain.models.opportunity_detail import OpportunityDetail
+from domain.models.opportunity_lead_count import OpportunityLeadCount
+from domain.models.opportunity_leads import OpportunityLeads
+from domain.models.opportunity_summary import OpportunitySummary
+
+# Intentos de actualización incremental antes de recalcular el resumen completo del agente
+MAX_SAVE_ATTEMPTS = 3
+
+ACTIVE_STATUS = 1
+
+SummaryMutation = Callable[[List[OpportunitySummary]], List[OpportunitySummary]]
+
+
+def materialize(
+    id_agte: int,
+    summaries: List[OpportunitySummary],
+    etag: Optional[str] = None,
+    rebuilt_at: Optional[datetime] = None,
+) -> AgentOpportunitySummary:
+    """
+    Arma el documento materializado; las entradas se ordenan por OpportunityId para que sea estable.
+    Sin rebuilt_at se considera un recálculo completo.
+    """
+    now = datetime.now(timezone.utc)
+    return AgentOpportunitySummary(
+        IdAgte=id_agte,
+        summaries=sorted(summaries, key=lambda summary: summary.OpportunityId),
+        updated_at=now,
+        rebuilt_at=rebuilt_at or now,
+        etag=etag,
+    )
+
+
+def is_expired(summary: AgentOpportunitySummary, max_age: float) -> bool:
+    """
+    El resumen se recalcula completo cuando su último recálculo supera max_age: así se
+    recogen los cambios que no pasan por el mantenedor (OpportunityLeads escritos por
+    otros procesos, Details cambiados con el catálogo desactivado o desde la pila async).
+    """
+    if summary.rebuilt_at is None:
+        return True
+    return (datetime.now(timezone.utc) - summary.rebuilt_at).total_seconds() > max_age
+
+
+def with_opportunity(summaries: List[OpportunitySummary], opportunity: OpportunityLeads, detail: Optional[OpportunityDetail]) -> List[OpportunitySummary]:
+    """Reemplaza la entrada de la oportunidad; solo queda si está activa y tiene Detail."""
+    entries = [summary for summary in summaries if summary.OpportunityId != opportunity.OpportunityId]
+    if opportunity.Status == ACTIVE_STATUS and detail is not None:
+        lead_count = OpportunityLeadCount(
+            OpportunityId=opportunity.OpportunityId,
+            Priority=opportunity.Priority,
+            lead_count=len(opportunity.leads),
+        )
+        entries.extend(build_summaries([lead_count], {detail.OpportunityId: detail}))
+    return entries
+
+
+def with_detail(summaries: List[OpportunitySummary], detail: OpportunityDetail) -> List[OpportunitySummary]:
+    """Actualiza los campos que vienen del Detail en la entrada de la oportunidad."""
+    return [
+        summary.model_copy(update={
+            "Title": detail.Title,
+            "Subtitle": detail.Subtitle,
+            "Description": detail.Description,
+            "Categories": detail.Categories,
+        }) if summary.OpportunityId == detail.OpportunityId else summary
+        for summary in summaries
+    ]
+
+
+def diff_summaries(stored: List[OpportunitySummary], expected: List[OpportunitySummary]) -> List[int]:
+    """OpportunityIds cuya entrada materializada falta, sobra o no coincide con la calculada."""
+    stored_by_id = {summary.OpportunityId: summary for summary in stored}
+    expected_by_id = {summary.OpportunityId: summary for summary in expected}
+    return sorted(
+        opportunity_id
+        for opportunity_id in stored_by_id.keys() | expected_by_id.keys()
+        if stored_by_id.get(opportunity_id) != expected_by_id.get(opportunity_id)
+    )
+
+
+class OpportunitySummaryMaintainer:
+    """
+    Mantiene el resumen materializado por agente: aplica de forma incremental los
+    cambios de OpportunityLeads y de OpportunityDetail, con concurrencia optimista
+    por etag, y recalcula el resumen completo cuando no puede aplicarlos.
+    """
+
+    def __init__(
+        self,
+        store: OpportunitySummaryStorePort,
+        summary_service: OpportunitySummaryService,
+        opportunity_detail_repository: OpportunityDetailRepositoryPort,
+    ):
+        self.store = store
+        self.summary_service = summary_service
+        self.opportunity_detail_repository = opportunity_detail_repository
+
+    def rebuild_agent(self, id_agte: int) -> AgentOpportunitySummary:
+        """Recalcula el resumen del agente desde OpportunityLeads y OpportunityDetail y lo sobrescribe."""
+        summaries = self.summary_service.list_opportunity_summary_by_agte_id(id_agte)
+        return self.store.save(materialize(id_agte, summaries))
+
+    def _apply(self, id_agte: int, mutation: SummaryMutation) -> AgentOpportunitySummary:
+        for _ in range(MAX_SAVE_ATTEMPTS):
+            current = self.store.get(id_agte)
+            if current is None:
+                return self.rebuild_agent(id_agte)
+            try:
+                return self.store.save(materialize(id_agte, mutation(current.summaries), current.etag, current.rebuilt_at))
+            except ConflictException:
+                continue
+        logging.warning(f"Conflictos repetidos al actualizar el resumen del agente {id_agte}, se recalcula completo.")
+        return self.rebuild_agent(id_agte)
+
+    def apply_opportunity_change(self, opportunity: OpportunityLeads) -> None:
+        try:
+            detail = None
+            if opportunity.Status == ACTIVE_STATUS:
+                detail = self.opportunity_detail_repository.get_by_opportunity_id(opportunity.OpportunityId)
+            self._apply(opportunity.IdAgte, lambda summaries: with_opportunity(summaries, opportunity, detail))
+        except Exception as e:
+            logging.error(
+                f"No se pudo actualizar el resumen del agente {opportunity.IdAgte} "
+                f"para la oportunidad {opportunity.OpportunityId}: {str(e)}"
+            )
+
+    def apply_detail_change(self, detail: OpportunityDetail) -> None:
+        try:
+            agent_ids = self.store.get_agent_ids_with_opportunity(detail.OpportunityId)
+        except Exception as e:
+            logging.error(f"No se pudieron obtener los agentes de la oportunidad {detail.OpportunityId}: {str(e)}")
+            return
+        for id_agte in agent_ids:
+            try:
+                self._apply(id_agte, lambda summaries: with_detail(summaries, detail))
+            except Exception as e:
+                logging.error(
+                    f"No se pudo actualizar el resumen del agente {id_agte} "
+                    f"con el Detail de la oportunidad {detail.OpportunityId}: {str(e)}"
+                )
+
+    def apply_detail_changes(self, details: List[OpportunityDetail]) -> None:
+        for detail in details:
+            self.apply_detail_change(detail)
+
+    def check(self, id_agte: int) -> List[int]:
+        """Compara el resumen materializado con el calculado; devuelve los OpportunityIds que difieren."""
+        stored = self.store.get(id_agte)
+        expected = self.summary_service.list_opportunity_summary_by_agte_id(id_agte)
+        if stored is None:
+            return sorted(summary.OpportunityId for summary in expected)
+        return diff_summaries(stored.summaries, expected)
+
+
+class AsyncOpportunitySummaryMaintainer:
+    def __init__(
+        self,
+        store: AsyncOpportunitySummaryStorePort,
+        summary_service: AsyncOpportunitySummaryService,
+        opportunity_detail_repository: AsyncOpportunityDetailRepositoryPort,
+    ):
+        self.store = store
+        self.summary_service = summary_service
+        self.opportunity_detail_repository = opportunity_detail_repository
+
+    async def rebuild_agent(self, id_agte: int) -> AgentOpportunitySummary:
+        summaries = await self.summary_service.list_opportunity_summary_by_agte_id(id_agte)
+        return await self.store.save(materialize(id_agte, summaries))
+
+    async def _apply(self, id_agte: int, mutation: SummaryMutation) -> AgentOpportunitySummary:
+        for _ in range(MAX_SAVE_ATTEMPTS):
+            current = await self.store.get(id_agte)
+            if current is None:
+                return await self.rebuild_agent(id_agte)
+            try:
+                return await self.store.save(materialize(id_agte, mutation(current.summaries), current.etag, current.rebuilt_at))
+            except ConflictException:
+                continue
+        logging.warning(f"Conflictos repetidos al actualizar el resumen del agente {id_agte}, se recalcula completo.")
+        return await self.rebuild_agent(id_agte)
+
+    async def apply_opportunity_change(self, opportunity: OpportunityLeads) -> None:
+        try:
+            detail = None
+            if opportunity.Status == ACTIVE_STATUS:
+                detail = await self.opportunity_detail_repository.get_by_opportunity_id(opportunity.OpportunityId)
+            await self._apply(opportunity.IdAgte, lambda summaries: with_opportunity(summaries, opportunity, detail))
+        except Exception as e:
+            logging.error(
+                f"No se pudo actualizar el resumen del agente {opportunity.IdAgte} "
+                f"para la oportunidad {opportunity.OpportunityId}: {str(e)}"
+            )
+
+
+class MaterializedOpportunitySummaryService:
+    """
+    Resumen de oportunidades por agente servido con una lectura puntual del resumen materializado.
+    Se recalcula en el primer acceso del agente y cuando vence max_age.
+    """
+
+    def __init__(self, store: OpportunitySummaryStorePort, maintainer: OpportunitySummaryMaintainer, max_age: float):
+        self.store = store
+        self.maintainer = maintainer
+        self.max_age = max_age
+
+    def list_opportunity_summary_by_agte_id(self, agte_id: int) -> List[OpportunitySummary]:
+        summary = self.store.get(agte_id)
+        if summary is None or is_expired(summary, self.max_age):
+            summary = self.maintainer.rebuild_agent(agte_id)
+        return summary.summaries
+
+
+class AsyncMaterializedOpportunitySummaryService:
+    def __init__(self, store: AsyncOpportunitySummaryStorePort, maintainer: AsyncOpportunitySummaryMaintainer, max_age: float):
+        self.store = store
+        self.maintainer = maintainer
+        self.max_age = max_age
+
+    async def list_opportunity_summary_by_agte_id(self, agte_id: int) -> List[OpportunitySummary]:
+        summary = await self.store.get(agte_id)
+        if summary is None or is_expired(summary, self.max_age):
+            summary = await self.maintainer.rebuild_agent(agte_id)
+        return summary.summaries
@@ -0,0 +1,71 @@
+# benchmarks/datasets.py
+import random
+from typing import List
+
+
+def make_lead(rng: random.Random, index: int) -> dict:
+    return {
+        "tipoDocum": rng.choice(["CC", "CE", "NIT"]),
+        "nroDocum": 10_000_000 + index,
+        "nombres": f"Nombre{index}",
+        "apellidos": f"Apellido{index}",
+        "edad": float(rng.randint(18, 80)),
+        "sexo": rng.choice(["M", "F"]),
+        "telefonoCliente": f"60{rng.randint(1000000, 9999999)}",
+        "celularCliente": f"3{rng.randint(100000000, 999999999)}",
+        "emailCliente": f"cliente{index}@example.com",
+        "empleadorCliente": f"Empresa {rng.randint(1, 500)}",
+        "extraDetails": {
+            "segmento": rng.choice(["A", "B", "C"]),
+            "saldo": round(rng.uniform(0, 1_000_000), 2),
+            "productos": rng.sample(["AFP", "Cesantias", "Voluntaria", "Seguros"], 2),
+        },
+    }
+
+
+def make_opportunity_leads_docs(
+    opportunities: int,
+    leads_per_opportunity: int,
+    agents: int = 1,
+    seed: int = 42,
+) -> List[dict]:
+    """Documentos OpportunityLeads sintéticos con el mismo formato que Cosmos."""
+    rng = random.Random(seed)
+    docs = []
+    for opportunity_id in range(1, opportunities + 1):
+        for id_agte in range(1, agents + 1):
+            docs.append({
+                "id": f"{opportunity_id}-{id_agte}",
+                "OpportunityId": opportunity_id,
+                "Beggining": "2025-01-01",
+                "End": "2025-12-31",
+                "IdAgte": id_agte,
+                "IdSociedad": 1,
+                "WSaler": f"agente{id_agte}@example.com",
+                "Status": 1,
+                "Priority": rng.randint(1, 5),
+                "leads": [
+                    {"lead": make_lead(rng, opportunity_id * 100_000 + i)}
+                    for i in range(leads_per_opportunity)
+                ],
+                "_etag": f'"{rng.getrandbits(64):016x}"',
+            })
+    return docs
+
+
+def make_opportunity_detail_docs(opportunities: int, seed: int = 42) -> List[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": str(opportunity_id),
+            "OpportunityId": opportunity_id,
+            "Title": f"Oportunidad {opportunity_id}",
+            "Subtitle": f"Subtítulo {opportunity_id}",
+            "Description": "Descripción " * rng.randint(5, 20),
+            "EmailTemplate": "<p>Hola {{nombre}}</p>",
+            "DaliPrompt": "Genera un mensaje para el cliente.",
+            "Categories": rng.sample(["Ahorro", "Pensión", "Inversión", "Seguros"], 2),
+            "_etag": f'"{rng.getrandbits(64):016x}"',
+        }
+        for opportunity_id in range(1, opportunities + 1)
+    ]
@@ -0,0 +1,25 @@
+# benchmarks/env.py
+import os
+
+# Valores de relleno para que core.settings cargue sin un .env real
+BENCHMARK_ENV = {
+    "COSMOS_URI": "https://localhost:8081/",
+    "COSMOS_KEY": "benchmark",
+    "COSMOS_DATABASE": "benchmark",
+    "COSMOS_OPPORTUNITY_LEADS_CONTAINER": "OpportunityLeads",
+    "COSMOS_OPPORTUNITY_LEADS_PARTITION_KEY": "/IdAgte",
+    "COSMOS_OPPORTUNITY_DETAIL_CONTAINER": "OpportunityDetail",
+    "COSMOS_OPPORTUNITY_DETAIL_PARTITION_KEY": "/OpportunityId",
+    "SQL_DRIVER": "sqlite",
+    "SQL_SERVER": "localhost",
+    "SQL_DATABASE": "benchmark",
+    "SQL_USERNAME": "benchmark",
+    "SQL_PASSWORD": "benchmark",
+    "AZURE_TENANT_ID": "benchmark-tenant",
+    "AZURE_CLIENT_ID": "benchmark-client",
+}
+
+
+def configure_env() -> None:
+    for key, value in BENCHMARK_ENV.items():
+        os.environ.setdefault(key, value)
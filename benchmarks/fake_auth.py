@@ -0,0 +1,53 @@
+# benchmarks/fake_auth.py
+"""
+Emisor local de tokens para benchmarks: firma JWT RS256 con una llave generada
+en memoria y publica un JWKS estático, de modo que AzureAuthAdapter valida los
+tokens con su flujo real (firma, audiencia, expiración y caches).
+"""
+import json
+import time
+from typing import List
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt import PyJWK, PyJWKSet
+
+from core.settings import settings
+from infrastructure.adapters.azure_auth_adapter import AzureAuthAdapter
+
+KEY_ID = "benchmark-key"
+
+
+class StaticJWKClient:
+    """Sustituto de PyJWKClient que sirve un JWKS fijo sin red."""
+
+    def __init__(self, jwks: dict):
+        self._keys = PyJWKSet.from_dict(jwks).keys
+
+    def get_signing_keys(self, refresh: bool = False) -> List[PyJWK]:
+        return self._keys
+
+
+class LocalTokenIssuer:
+    def __init__(self):
+        self._private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        public_jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(self._private_key.public_key()))
+        public_jwk.update({"kid": KEY_ID, "use": "sig", "alg": "RS256"})
+        self.jwks = {"keys": [public_jwk]}
+
+    def issue(self, email: str, lifetime: float = 3600) -> str:
+        now = int(time.time())
+        claims = {
+            "aud": settings.AZURE_CLIENT_ID,
+            "iss": f"https://login.microsoftonline.com/{settings.AZURE_TENANT_ID}/v2.0",
+            "sub": email,
+            "preferred_username": email,
+            "iat": now,
+            "exp": now + int(lifetime),
+        }
+        return jwt.encode(claims, self._private_key, algorithm="RS256", headers={"kid": KEY_ID})
+
+    def install(self, adapter: AzureAuthAdapter) -> AzureAuthAdapter:
+        """Hace que el adaptador real resuelva las llaves de firma desde el JWKS local."""
+        adapter.signing_keys._client = StaticJWKClient(self.jwks)
+        return adapter
@@ -0,0 +1,303 @@
+# benchmarks/fake_cosmos.py
+"""
+Contenedor de Cosmos DB en memoria para benchmarks. Interpreta el subconjunto
+de SQL que usan los repositorios (igualdades, ARRAY_CONTAINS, IN, la proyección con
+ARRAY_LENGTH y SELECT VALUE sobre un JOIN), los replace y patch con "set" y los batch
+transaccionales condicionados por _etag y el change feed por páginas con token de
+continuación, e inyecta una latencia fija por petición. Los
+documentos que devuelve una consulta se decodifican desde JSON en cada lectura,
+igual que hace el SDK con la respuesta HTTP.
+"""
+import json
+import re
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError, CosmosBatchOperationError, CosmosResourceNotFoundError
+
+_EQ_PARAM = re.compile(r"c\.(\w+)\s*=\s*@(\w+)")
+_EQ_LITERAL = re.compile(r"c\.(\w+)\s*=\s*(\d+)")
+_ARRAY_CONTAINS = re.compile(r"ARRAY_CONTAINS\(@(\w+),\s*c\.(\w+)\)")
+_IN = re.compile(r"c\.(\w+)\s+IN\s*\(([^)]*)\)")
+_ARRAY_LENGTH = re.compile(r"ARRAY_LENGTH\(c\.(\w+)\)\s+AS\s+(\w+)", re.IGNORECASE)
+_JOIN_VALUE = re.compile(r"SELECT VALUE (.+) FROM c JOIN (\w+) IN c\.(\w+)")
+_IS_DEFINED = re.compile(r"\(IS_DEFINED\((\w+)\.(\w+)\) \? \1\.\2 : \1\)")
+
+
+def _join_value(query: str):
+    """Para SELECT VALUE <alias.campo | (IS_DEFINED(alias.campo) ? alias.campo : alias)> FROM c JOIN alias IN c.arreglo."""
+    match = _JOIN_VALUE.match(" ".join(query.split()))
+    if match is None:
+        return None
+    expression, alias, array = match.groups()
+    defined = _IS_DEFINED.fullmatch(expression)
+    if defined is not None:
+        field = defined.group(2)
+        value = lambda element: element[field] if isinstance(element, dict) and field in element else element
+    else:
+        field = expression[len(alias) + 1:]
+        value = lambda element: element.get(field)
+    return lambda doc: [value(element) for element in doc.get(array) or []]
+
+
+def _parse_query(query: str, parameters: Optional[List[dict]]):
+    """Devuelve (predicado, proyección) para una consulta de los repositorios."""
+    values = {p["name"].lstrip("@"): p["value"] for p in parameters or []}
+    query = " ".join(query.split())
+    select, _, where = query.partition(" WHERE ")
+    select = select[len("SELECT "):].split(" FROM ")[0]
+
+    checks = []
+    for field, name in _EQ_PARAM.findall(where):
+        checks.append(lambda doc, f=field, v=values[name]: doc.get(f) == v)
+    for field, literal in _EQ_LITERAL.findall(where):
+        checks.append(lambda doc, f=field, v=int(literal): doc.get(f) == v)
+    for name, field in _ARRAY_CONTAINS.findall(where):
+        checks.append(lambda doc, f=field, v=set(values[name]): doc.get(f) in v)
+    for field, names in _IN.findall(where):
+        allowed = {values[n.strip().lstrip("@")] for n in names.split(",")}
+        checks.append(lambda doc, f=field, v=allowed: doc.get(f) in v)
+
+    def predicate(doc: dict) -> bool:
+        return all(check(doc) for check in checks)
+
+    if select.strip() == "*":
+        return predicate, None
+
+    fields = []
+    for item in select.split(","):
+        item = item.strip()
+        match = _ARRAY_LENGTH.match(item)
+        if match:
+            fields.append((match.group(2), lambda doc, f=match.group(1): len(doc.get(f) or [])))
+        else:
+            name = item[len("c."):]
+            fields.append((name, lambda doc, f=name: doc.get(f)))
+
+    def projection(doc: dict) -> dict:
+        return {name: getter(doc) for name, getter in fields}
+
+    return predicate, projection
+
+
+class FakePager:
+    """Imita el PageIterator que devuelve by_page: itera páginas y expone continuation_token."""
+
+    def __init__(self, pages):
+        self._pages = pages
+        self.continuation_token: Optional[str] = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        page, self.continuation_token = next(self._pages)
+        return iter(page)
+
+
+class FakeItemPaged:
+    """Imita ItemPaged del SDK: iterable de items con paginación por by_page."""
+
+    def __init__(self, items: List[dict], page_size: Optional[int], delay):
+        self._items = items
+        self._page_size = page_size or 100
+        self._delay = delay
+
+    def __iter__(self):
+        for start in range(0, len(self._items), self._page_size):
+            self._delay()
+            yield from self._items[start:start + self._page_size]
+
+    def _pages(self, offset: int):
+        while offset < len(self._items):
+            self._delay()
+            end = offset + self._page_size
+            yield self._items[offset:end], str(end) if end < len(self._items) else None
+            offset = end
+
+    def by_page(self, continuation: Optional[str] = None) -> FakePager:
+        return FakePager(self._pages(int(continuation) if continuation else 0))
+
+
+class FakeChangeFeed:
+    """Imita el ItemPaged del change feed: el token de continuación es la última versión leída."""
+
+    def __init__(self, container: "FakeCosmosContainer", start: int):
+        self._container = container
+        self._start = start
+
+    def __iter__(self):
+        for page in self.by_page():
+            yield from page
+
+    def _pages(self, start: int):
+        # Como el SDK, siempre hace al menos una petición y entrega el token aunque no haya cambios
+        self._container._delay()
+        with self._container._lock:
+            changed = sorted((lsn, body) for lsn, body in self._container._changes.values() if lsn > start)
+            token = str(self._container._lsn)
+        yield [json.loads(body) for _, body in changed], token
+
+    def by_page(self, continuation: Optional[str] = None) -> FakePager:
+        return FakePager(self._pages(int(continuation) if continuation else self._start))
+
+
+class FakeCosmosContainer:
+    def __init__(self, id_field: str = "id", latency: float = 0.0):
+        self.id_field = id_field
+        self.latency = latency
+        # Nombre del contenedor, como ContainerProxy.id; lo asigna FakeCosmosAdapter
+        self.id: Optional[str] = None
+        # id -> (documento para filtrar, cuerpo serializado que se entrega)
+        self._docs: Dict[str, Tuple[dict, bytes]] = {}
+        self._lock = threading.Lock()
+        # id -> (versión del último cambio, cuerpo), para el change feed
+        self._changes: Dict[str, Tuple[int, bytes]] = {}
+        self._lsn = 0
+        self.requests = 0
+        self.client_connection = type("ClientConnection", (), {"last_response_headers": {}})()
+
+    def _delay(self) -> None:
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def load(self, docs: Iterable[dict]) -> None:
+        with self._lock:
+            for doc in docs:
+                doc = dict(doc, _etag=f'"{uuid.uuid4()}"')
+                body = json.dumps(doc).encode("utf-8")
+                self._docs[str(doc[self.id_field])] = (json.loads(body), body)
+                self._lsn += 1
+                self._changes[str(doc[self.id_field])] = (self._lsn, body)
+
+    def query_items(self, query: str, parameters: Optional[List[dict]] = None, max_item_count: Optional[int] = None, **kwargs):
+        predicate, projection = _parse_query(query, parameters)
+        join = _join_value(query)
+        with self._lock:
+            matches = [(doc, body) for doc, body in self._docs.values() if predicate(doc)]
+        if join is not None:
+            items = [value for _, body in matches for value in join(json.loads(body))]
+        elif projection is not None:
+            items = [projection(doc) for doc, _ in matches]
+        else:
+            items = [json.loads(body) for _, body in matches]
+        return FakeItemPaged(items, max_item_count, self._delay)
+
+    def query_items_change_feed(self, start_time=None, continuation: Optional[str] = None, **kwargs) -> FakeChangeFeed:
+        if continuation is not None:
+            return FakeChangeFeed(self, int(continuation))
+        return FakeChangeFeed(self, 0 if start_time == "Beginning" else self._lsn)
+
+    def read_item(self, item: str, partition_key=None, **kwargs) -> dict:
+        self._delay()
+        with self._lock:
+            entry = self._docs.get(str(item))
+        if entry is None:
+            raise CosmosResourceNotFoundError(message=f"No existe el documento {item}.")
+        return json.loads(entry[1])
+
+    def upsert_item(self, body: dict, **kwargs) -> dict:
+        self._delay()
+        self.load([body])
+        # Como el servicio, la respuesta trae el documento guardado con su _etag
+        with self._lock:
+            return json.loads(self._docs[str(body[self.id_field])][1])
+
+    create_item = upsert_item
+
+    def replace_item(self, item: str, body: dict, etag: Optional[str] = None, match_condition=None, **kwargs) -> dict:
+        with self._lock:
+            entry = self._docs.get(str(item))
+        if entry is None:
+            raise CosmosResourceNotFoundError(message=f"No existe el documento {item}.")
+        if etag is not None and entry[0].get("_etag") != etag:
+            raise CosmosAccessConditionFailedError(message=f"El documento {item} cambió.")
+        return self.upsert_item(body)
+
+    def patch_item(self, item: str, partition_key, patch_operations: List[dict], etag: Optional[str] = None,
+                   match_condition=None, no_response: Optional[bool] = None, response_hook=None, **kwargs) -> dict:
+        self._delay()
+        with self._lock:
+            entry = self._docs.get(str(item))
+            if entry is None:
+                raise CosmosResourceNotFoundError(message=f"No existe el documento {item}.")
+            doc = json.loads(entry[1])
+            if etag is not None and doc.get("_etag") != etag:
+                raise CosmosAccessConditionFailedError(message=f"El documento {item} cambió.")
+            for operation in patch_operations:
+                doc[operation["path"].strip("/")] = operation["value"]
+        self.load([doc])
+        updated = self.read_item(item)
+        if response_hook is not None:
+            response_hook({"etag": updated["_etag"]}, None)
+        return {} if no_response else updated
+
+    def delete_item(self, item: str, partition_key=None, **kwargs) -> None:
+        self._delay()
+        with self._lock:
+            if self._docs.pop(str(item), None) is None:
+                raise CosmosResourceNotFoundError(message=f"No existe el documento {item}.")
+            self._changes.pop(str(item), None)
+
+    def execute_item_batch(self, batch_operations: List[tuple], partition_key=None, **kwargs) -> List[dict]:
+        """Aplica las operaciones todas o ninguna; un fallo marca el resto con 424 como el servicio."""
+        self._delay()
+        with self._lock:
+            staged = {key: json.loads(body) for key, (_, body) in self._docs.items()}
+            results = []
+            for index, operation in enumerate(batch_operations):
+                kind, args = operation[0], operation[1]
+                options = operation[2] if len(operation) > 2 else {}
+                key = str(args[0] if kind in ("delete", "read", "replace") else args[0][self.id_field])
+                current = staged.get(key)
+                status = 200
+                if kind == "create" and current is not None:
+                    status = 409
+                elif kind in ("replace", "delete", "read") and current is None:
+                    status = 404
+                elif options.get("if_match_etag") is not None and (current or {}).get("_etag") != options["if_match_etag"]:
+                    status = 412
+                if status >= 400:
+                    results.append({"statusCode": status})
+                    results.extend({"statusCode": 424} for _ in batch_operations[index + 1:])
+                    raise CosmosBatchOperationError(
+                        error_index=index, headers={}, status_code=status,
+                        message=f"Falló la operación {index} del batch.", operation_responses=results,
+                    )
+                if kind == "delete":
+                    del staged[key]
+                    results.append({"statusCode": 204})
+                elif kind == "read":
+                    results.append({"statusCode": 200, "eTag": current["_etag"], "resourceBody": current})
+                else:
+                    doc = dict(args[-1], _etag=f'"{uuid.uuid4()}"')
+                    staged[key] = doc
+                    results.append({"statusCode": 201 if kind == "create" else 200, "eTag": doc["_etag"], "resourceBody": doc})
+            for key in self._docs.keys() - staged.keys():
+                del self._docs[key]
+                self._changes.pop(key, None)
+            for key, doc in staged.items():
+                body = json.dumps(doc).encode("utf-8")
+                if self._docs.get(key, (None, None))[1] != body:
+                    self._docs[key] = (json.loads(body), body)
+                    self._lsn += 1
+                    self._changes[key] = (self._lsn, body)
+        return results
+
+
+class FakeCosmosAdapter:
+    """Sustituto de CosmosAdapter que entrega contenedores en memoria por nombre."""
+
+    def __init__(self, containers: Dict[str, FakeCosmosContainer]):
+        self._containers = containers
+        for name, container in containers.items():
+            container.id = name
+
+    def get_container(self, container_name: str, partition_key: Optional[str] = None) -> FakeCosmosContainer:
+        return self._containers[container_name]
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,113 @@
+# benchmarks/fake_sql.py
+"""
+Sustituto de SQL Server sobre SQLite para benchmarks. El esquema dalilm se
+monta con ATTACH, GETUTCDATE se registra como función y las conexiones se
+entregan a través del SqlConnectionPool real de la aplicación.
+"""
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Tuple
+
+from infrastructure.adapters.sql_server_adapter import SqlConnectionPool
+
+_LEAD_COLUMNS_DDL = """
+    CreatedBy TEXT, Id TEXT PRIMARY KEY, Name TEXT, Email TEXT, Phone TEXT, DocumentNumber INTEGER,
+    Company TEXT, Source TEXT, Campaign TEXT, Product TEXT, Stage TEXT, Priority TEXT, Value REAL,
+    AssignedTo TEXT, CreatedAt TEXT, UpdatedAt TEXT, NextFollowUp TEXT, Notes TEXT, Tags TEXT,
+    DocumentType TEXT, SelectedPortfolios TEXT, CampaignOwnerName TEXT, Age INTEGER, Gender TEXT,
+    PreferredContactChannel TEXT, AdditionalInfo TEXT
+"""
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS dalilm.Users (Id TEXT PRIMARY KEY, Email TEXT UNIQUE, idAgte INTEGER)",
+    f"CREATE TABLE IF NOT EXISTS dalilm.Leads ({_LEAD_COLUMNS_DDL})",
+    f"CREATE TABLE IF NOT EXISTS dalilm.LeadsRaw ({_LEAD_COLUMNS_DDL.replace(' PRIMARY KEY', '')})",
+)
+
+
+class SqliteCursor:
+    """Cursor con la interfaz de pyodbc que usan los repositorios (incluido fast_executemany)."""
+
+    def __init__(self, cursor: sqlite3.Cursor, latency: float):
+        self._cursor = cursor
+        self._latency = latency
+        self.fast_executemany = False
+
+    def _delay(self) -> None:
+        if self._latency:
+            time.sleep(self._latency)
+
+    def execute(self, query: str, params: tuple = ()):
+        self._delay()
+        self._cursor.execute(query, params)
+        return self
+
+    def executemany(self, query: str, rows):
+        self._delay()
+        self._cursor.executemany(query, rows)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self) -> None:
+        self._cursor.close()
+
+
+class SqliteConnection:
+    def __init__(self, connection: sqlite3.Connection, latency: float):
+        self._connection = connection
+        self._latency = latency
+
+    def cursor(self) -> SqliteCursor:
+        return SqliteCursor(self._connection.cursor(), self._latency)
+
+    def commit(self) -> None:
+        self._connection.commit()
+
+    def rollback(self) -> None:
+        self._connection.rollback()
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class SqliteDatabase:
+    """Base SQLite en un directorio temporal, con el esquema dalilm y usuarios de prueba."""
+
+    def __init__(self, directory: Optional[str] = None, latency: float = 0.0):
+        self.directory = directory or tempfile.mkdtemp(prefix="market-dali-bench-")
+        self.main_path = os.path.join(self.directory, "main.db")
+        self.dalilm_path = os.path.join(self.directory, "dalilm.db")
+        self.latency = latency
+        with self._open() as connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+
+    def _open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.main_path, timeout=30, check_same_thread=False)
+        connection.execute(f"ATTACH DATABASE '{self.dalilm_path}' AS dalilm")
+        connection.execute("PRAGMA dalilm.journal_mode=WAL")
+        connection.create_function("GETUTCDATE", 0, lambda: datetime.now(timezone.utc).isoformat())
+        return connection
+
+    def connect(self) -> SqliteConnection:
+        return SqliteConnection(self._open(), self.latency)
+
+    def create_pool(self, max_size: int = 10) -> SqlConnectionPool:
+        return SqlConnectionPool(self.connect, min_size=1, max_size=max_size)
+
+    def add_users(self, users: Iterable[Tuple[str, str, int]]) -> None:
+        """Inserta usuarios (Id, Email, idAgte)."""
+        with self._open() as connection:
+            connection.executemany("INSERT OR REPLACE INTO dalilm.Users (Id, Email, idAgte) VALUES (?, ?, ?)", list(users))
+
+    def count(self, table: str) -> int:
+        with self._open() as connection:
+            return connection.execute(f"SELECT COUNT(*) FROM dalilm.{table}").fetchone()[0]
@@ -0,0 +1,255 @@
+# benchmarks/run_load.py
+"""
+Prueba de carga offline: levanta la aplicación real (routers y servicios) con
+sustitutos locales de Cosmos DB, SQL Server (SQLite) y Azure AD, lanza
+peticiones concurrentes por escenario y reporta throughput y p50/p95/p99.
+Si se pasan umbrales y alguno no se cumple, termina con código 1.
+
+    python -m benchmarks.run_load --opportunities 200 --leads 50 --requests 300 --concurrency 16
+    python -m benchmarks.run_load --thresholds benchmarks/thresholds.json --output resultados.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.env import configure_env
+
+configure_env()
+# La prueba cubre la pila síncrona, que es la que se despliega por defecto
+os.environ["ASYNC_STACK_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+
+from core.settings import settings  # noqa: E402
+from benchmarks.datasets import make_opportunity_detail_docs, make_opportunity_leads_docs  # noqa: E402
+from benchmarks.fake_auth import LocalTokenIssuer  # noqa: E402
+from benchmarks.fake_cosmos import FakeCosmosAdapter, FakeCosmosContainer  # noqa: E402
+from benchmarks.fake_sql import SqliteDatabase  # noqa: E402
+from infrastructure.adapters.azure_auth_adapter import get_azure_auth_adapter  # noqa: E402
+from infrastructure.adapters.cosmos_adapter import get_cosmos_session  # noqa: E402
+from infrastructure.adapters.sql_server_adapter import SqlServerAdapter, get_sql_server_session  # noqa: E402
+from infrastructure.repositories.opportunity_detail_catalog import (  # noqa: E402
+    close_opportunity_detail_catalog,
+    init_opportunity_detail_catalog,
+)
+from presentation.main import app  # noqa: E402
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    build: Callable[[random.Random], dict]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    @staticmethod
+    def _percentile(values: List[float], percent: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def summary(self) -> dict:
+        total = len(self.latencies_ms)
+        return {
+            "requests": total,
+            "errors": self.errors,
+            "error_rate": round(self.errors / total, 4) if total else 0.0,
+            "rps": round(total / self.elapsed, 2) if self.elapsed else 0.0,
+            "p50_ms": round(self._percentile(self.latencies_ms, 50), 3),
+            "p95_ms": round(self._percentile(self.latencies_ms, 95), 3),
+            "p99_ms": round(self._percentile(self.latencies_ms, 99), 3),
+        }
+
+
+def build_scenarios(args, tokens: Dict[int, str]) -> List[Scenario]:
+    def agent(rng: random.Random) -> int:
+        return rng.randint(1, args.agents)
+
+    def opportunity(rng: random.Random) -> int:
+        return rng.randint(1, args.opportunities)
+
+    def auth(id_agte: int) -> dict:
+        return {"Authorization": f"Bearer {tokens[id_agte]}"}
+
+    # Dos conversiones simultáneas de la misma oportunidad terminan en 409 por el reclamo;
+    # cada petición recorre en orden los pares (agente, oportunidad) para no repetirlos
+    # mientras haya más pares que peticiones en vuelo
+    one_calls = itertools.count()
+    many_calls = itertools.count()
+
+    def convert_one(rng: random.Random) -> dict:
+        call = next(one_calls)
+        id_agte = call % args.agents + 1
+        opportunity_id = call // args.agents % args.opportunities + 1
+        return {"url": "/leads/from-opportunity", "params": {"opportunity_id": opportunity_id}, "headers": auth(id_agte)}
+
+    def convert_many(rng: random.Random) -> dict:
+        call = next(many_calls)
+        id_agte = call % args.agents + 1
+        batch = min(args.batch, args.opportunities)
+        start = call // args.agents * batch
+        ids = [(start + offset) % args.opportunities + 1 for offset in range(batch)]
+        return {"url": "/leads/from-opportunities", "json": ids, "headers": auth(id_agte)}
+
+    # Las conversiones van al final porque marcan oportunidades como convertidas (Status = 0)
+    return [
+        Scenario("GET /opportunity-leads/{agte_id}", "GET", lambda rng: {"url": f"/opportunity-leads/{agent(rng)}"}),
+        Scenario("GET /opportunity-detail/{opportunity_id}", "GET", lambda rng: {"url": f"/opportunity-detail/{opportunity(rng)}"}),
+        Scenario("GET /opportunity-summary/{agte_id}", "GET", lambda rng: {"url": f"/opportunity-summary/{agent(rng)}"}),
+        Scenario("POST /leads/from-opportunity", "POST", convert_one),
+        Scenario("POST /leads/from-opportunities", "POST", convert_many),
+    ]
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int, seed: int) -> ScenarioResult:
+    rng = random.Random(seed)
+    calls = [scenario.build(rng) for _ in range(requests)]
+    result = ScenarioResult(scenario.name)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(kwargs: dict) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, **kwargs)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            result.latencies_ms.append((time.perf_counter() - start) * 1000)
+            result.errors += int(failed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(kwargs) for kwargs in calls))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def check_thresholds(results: Dict[str, dict], thresholds: Dict[str, dict]) -> List[str]:
+    """Devuelve las violaciones de umbral; las métricas *_ms y error_rate son máximos, min_rps es mínimo."""
+    violations = []
+    for name, limits in thresholds.items():
+        summary = results.get(name)
+        if summary is None:
+            continue
+        for metric, limit in limits.items():
+            if metric == "min_rps":
+                if summary["rps"] < limit:
+                    violations.append(f"{name}: rps {summary['rps']} < {limit}")
+            elif metric == "max_error_rate":
+                if summary["error_rate"] > limit:
+                    violations.append(f"{name}: error_rate {summary['error_rate']} > {limit}")
+            elif summary.get(metric, 0.0) > limit:
+                violations.append(f"{name}: {metric} {summary[metric]} > {limit}")
+    return violations
+
+
+def setup(args) -> Dict[int, str]:
+    """Conecta la aplicación a los sustitutos locales; devuelve un token por agente."""
+    latency = args.cosmos_latency_ms / 1000
+    leads_container = FakeCosmosContainer(latency=latency)
+    leads_container.load(make_opportunity_leads_docs(args.opportunities, args.leads, agents=args.agents, seed=args.seed))
+    detail_container = FakeCosmosContainer(latency=latency)
+    detail_container.load(make_opportunity_detail_docs(args.opportunities, seed=args.seed))
+    cosmos = FakeCosmosAdapter({
+        settings.COSMOS_OPPORTUNITY_LEADS_CONTAINER: leads_container,
+        settings.COSMOS_OPPORTUNITY_DETAIL_CONTAINER: detail_container,
+    })
+
+    database = SqliteDatabase(latency=args.sql_latency_ms / 1000)
+    database.add_users((f"user-{id_agte}", f"agente{id_agte}@example.com", id_agte) for id_agte in range(1, args.agents + 1))
+    pool = database.create_pool(max_size=settings.SQL_POOL_MAX_SIZE)
+
+    app.dependency_overrides[get_cosmos_session] = lambda: cosmos
+    app.dependency_overrides[get_sql_server_session] = lambda: SqlServerAdapter(pool)
+
+    if args.detail_catalog:
+        init_opportunity_detail_catalog(cosmos)
+
+    # Los logs por lead y de consultas lentas distorsionan la medición
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("cosmos.slow_query").setLevel(logging.ERROR)
+
+    issuer = LocalTokenIssuer()
+    issuer.install(get_azure_auth_adapter())
+    return {id_agte: issuer.issue(f"agente{id_agte}@example.com") for id_agte in range(1, args.agents + 1)}
+
+
+async def run(args) -> Dict[str, dict]:
+    tokens = setup(args)
+    scenarios = [s for s in build_scenarios(args, tokens) if not args.only or any(o in s.name for o in args.only)]
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        for index, scenario in enumerate(scenarios):
+            # Calentamiento: no se mide
+            await run_scenario(client, scenario, min(args.warmup, args.requests), args.concurrency, args.seed + index)
+            result = await run_scenario(client, scenario, args.requests, args.concurrency, args.seed + index)
+            results[scenario.name] = result.summary()
+    close_opportunity_detail_catalog()
+    return results
+
+
+def print_report(results: Dict[str, dict]) -> None:
+    header = f"{'escenario':45} {'req':>6} {'err':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, s in results.items():
+        print(f"{name:45} {s['requests']:6d} {s['errors']:5d} {s['rps']:9.1f} {s['p50_ms']:9.2f} {s['p95_ms']:9.2f} {s['p99_ms']:9.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--opportunities", type=int, default=100)
+    parser.add_argument("--leads", type=int, default=50, help="leads por oportunidad")
+    parser.add_argument("--agents", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=5, help="oportunidades por llamada a /leads/from-opportunities")
+    parser.add_argument("--requests", type=int, default=200, help="peticiones medidas por escenario")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--cosmos-latency-ms", type=float, default=5.0)
+    parser.add_argument("--sql-latency-ms", type=float, default=1.0)
+    parser.add_argument("--detail-catalog", action="store_true", help="activa el catálogo en memoria de OpportunityDetail")
+    parser.add_argument("--only", nargs="*", help="ejecuta solo los escenarios cuyo nombre contenga alguno de estos textos")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--thresholds", help="JSON con umbrales por escenario (p50_ms, p95_ms, p99_ms, min_rps, max_error_rate)")
+    parser.add_argument("--output", help="ruta donde guardar los resultados en JSON")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    if args.thresholds:
+        with open(args.thresholds, encoding="utf-8") as f:
+            violations = check_thresholds(results, json.load(f))
+        if violations:
+            print("\nUmbrales incumplidos:")
+            for violation in violations:
+                print(f"  - {violation}")
+            return 1
+        print("\nTodos los umbrales se cumplen.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
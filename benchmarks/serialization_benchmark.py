@@ -0,0 +1,83 @@
+# benchmarks/serialization_benchmark.py
+"""
+Micro-benchmark de la ruta de lectura de OpportunityLeads: validación por lead
++ revalidación/serialización de FastAPI, frente a validación única en lote con
+TypeAdapter y serialización directa a bytes.
+
+    python -m benchmarks.serialization_benchmark --opportunities 50 --leads 1000
+"""
+import argparse
+import json
+import time
+
+from benchmarks.env import configure_env
+
+configure_env()
+
+from domain.models.opportunity_lead import OpportunityLead  # noqa: E402
+from domain.models.opportunity_leads import OPPORTUNITY_LEADS_LIST, OpportunityLeads  # noqa: E402
+from infrastructure.repositories.opportunity_leads_repository import OpportunityLeadsRepository  # noqa: E402
+from benchmarks.datasets import make_opportunity_leads_docs  # noqa: E402
+
+
+def legacy_path(docs) -> bytes:
+    """Mapeo anterior (un modelo por lead) + lo que hacía FastAPI con response_model."""
+    models = [
+        OpportunityLeads(
+            id=doc.get("id"),
+            OpportunityId=doc["OpportunityId"],
+            Beggining=doc["Beggining"],
+            End=doc["End"],
+            IdAgte=doc["IdAgte"],
+            IdSociedad=doc["IdSociedad"],
+            WSaler=doc["WSaler"],
+            Status=doc["Status"],
+            Priority=doc["Priority"],
+            leads=[OpportunityLead(**l["lead"]) for l in doc.get("leads", [])],
+        )
+        for doc in docs
+    ]
+    # FastAPI: serializa a objetos JSON-compatibles, los revalida contra el response_model y usa json.dumps
+    content = OPPORTUNITY_LEADS_LIST.dump_python(models, mode="json")
+    validated = OPPORTUNITY_LEADS_LIST.validate_python(content)
+    return json.dumps(OPPORTUNITY_LEADS_LIST.dump_python(validated, mode="json")).encode("utf-8")
+
+
+# Solo se usa el mapeo del repositorio, sin contenedor de Cosmos
+_repository = OpportunityLeadsRepository.__new__(OpportunityLeadsRepository)
+
+
+def fast_path(docs) -> bytes:
+    models = _repository._map_many(docs)
+    return OPPORTUNITY_LEADS_LIST.dump_json(models)
+
+
+def measure(func, docs, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(docs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--opportunities", type=int, default=50)
+    parser.add_argument("--leads", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    docs = make_opportunity_leads_docs(args.opportunities, args.leads)
+    legacy = measure(legacy_path, docs, args.repeat)
+    fast = measure(fast_path, docs, args.repeat)
+
+    total_leads = args.opportunities * args.leads
+    print(f"Documentos: {len(docs)}  leads: {total_leads}  (mejor de {args.repeat})")
+    print(f"  ruta anterior : {legacy * 1000:9.1f} ms")
+    print(f"  ruta rápida   : {fast * 1000:9.1f} ms")
+    print(f"  aceleración   : {legacy / fast:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,3 +17,7 @@ class NotFoundException(HTTPException):
 class InvalidInputException(HTTPException):
     def __init__(self, detail: str, status_code: int = status.HTTP_422_UNPROCESSABLE_ENTITY):
         super().__init__(status_code=status_code, detail=detail)
+
+class ConflictException(HTTPException):
+    def __init__(self, detail: str, status_code: int = status.HTTP_409_CONFLICT):
+        super().__init__(status_code=status_code, detail=detail)
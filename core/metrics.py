@@ -0,0 +1,54 @@
+# core/metrics.py
+import time
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Buckets en segundos, de 5 ms a 10 s: cubren desde hits de cache hasta consultas cross-partition
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de las peticiones HTTP por ruta.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Peticiones HTTP en curso.",
+)
+HTTP_REQUEST_ERRORS = Counter(
+    "http_request_errors_total",
+    "Peticiones HTTP que terminaron con error (5xx o excepción no controlada).",
+    ["method", "route"],
+)
+DEPENDENCY_DURATION = Histogram(
+    "dependency_call_duration_seconds",
+    "Latencia de las llamadas a dependencias externas (Cosmos DB, SQL Server, Azure AD).",
+    ["dependency", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+DEPENDENCY_ERRORS = Counter(
+    "dependency_call_errors_total",
+    "Llamadas a dependencias externas que fallaron.",
+    ["dependency", "operation"],
+)
+
+SINGLE_FLIGHT_CALLS = Counter(
+    "single_flight_calls_total",
+    "Llamadas a métodos con single-flight: leader ejecuta en el backend, follower reutiliza una en curso.",
+    ["operation", "role"],
+)
+
+
+@contextmanager
+def observe_dependency(dependency: str, operation: str):
+    """Mide la duración de una llamada a una dependencia y cuenta sus errores."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        DEPENDENCY_ERRORS.labels(dependency, operation).inc()
+        raise
+    finally:
+        DEPENDENCY_DURATION.labels(dependency, operation).observe(time.perf_counter() - start)
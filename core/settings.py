@@ -1,4 +1,5 @@
 # core/settings.py
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,15 +9,67 @@ class Settings(BaseSettings):
     COSMOS_DATABASE: str
     COSMOS_OPPORTUNITY_LEADS_CONTAINER: str
     COSMOS_OPPORTUNITY_LEADS_PARTITION_KEY: str
+    COSMOS_OPPORTUNITY_LEAD_DOCUMENTS_CONTAINER: str = "OpportunityLeadDocuments"
     COSMOS_OPPORTUNITY_DETAIL_CONTAINER: str
     COSMOS_OPPORTUNITY_DETAIL_PARTITION_KEY: str
+    COSMOS_LEAD_JOBS_CONTAINER: str = "LeadConversionJobs"
+    COSMOS_LEAD_JOBS_PARTITION_KEY: str = "/id"
+    COSMOS_OPPORTUNITY_SUMMARY_CONTAINER: str = "OpportunitySummaries"
+    COSMOS_OPPORTUNITY_SUMMARY_PARTITION_KEY: str = "/IdAgte"
+    COSMOS_INDEXING_POLICIES_ENABLED: bool = True
+    COSMOS_PROVISION_ON_STARTUP: bool = False
+    COSMOS_SLOW_QUERY_RU_THRESHOLD: float = 50.0
+    COSMOS_SLOW_QUERY_MS_THRESHOLD: float = 500.0
+    COSMOS_QUERY_METRICS_SAMPLE_RATE: float = 0.0
+    OPPORTUNITY_SUMMARY_STORE_ENABLED: bool = False
+    # Antigüedad máxima del resumen materializado antes de recalcularlo completo al leerlo
+    OPPORTUNITY_SUMMARY_MAX_AGE_SECONDS: float = 300.0
+    # "embedded": un documento con todos los leads; "per_lead": cabecera y un documento por lead
+    OPPORTUNITY_LEADS_LAYOUT: str = "embedded"
+    OPPORTUNITY_LEADS_PAGE_SIZE: int = 100
+    # Solo pila sync: con ASYNC_STACK_ENABLED los routers async leen siempre de Cosmos
+    OPPORTUNITY_LEADS_INDEX_ENABLED: bool = False
+    OPPORTUNITY_LEADS_INDEX_REFRESH_SECONDS: float = 2.0
+    OPPORTUNITY_LEADS_INDEX_MAX_STALENESS_SECONDS: float = 15.0
+    OPPORTUNITY_LEADS_INDEX_RELOAD_SECONDS: float = 3600.0
+    OPPORTUNITY_LEADS_INDEX_SNAPSHOT_PATH: Optional[str] = None
+    OPPORTUNITY_LEADS_INDEX_SNAPSHOT_SECONDS: float = 60.0
+    # Solo pila sync: con ASYNC_STACK_ENABLED los routers async leen siempre de Cosmos
+    OPPORTUNITY_DETAIL_CACHE_ENABLED: bool = True
+    OPPORTUNITY_DETAIL_CACHE_TTL_SECONDS: float = 300.0
+    OPPORTUNITY_DETAIL_CACHE_REFRESH_SECONDS: float = 30.0
     SQL_DRIVER: str
     SQL_SERVER: str
     SQL_DATABASE: str
     SQL_USERNAME: str
     SQL_PASSWORD: str
+    SQL_POOL_MIN_SIZE: int = 1
+    SQL_POOL_MAX_SIZE: int = 10
+    SQL_POOL_TIMEOUT_SECONDS: float = 30.0
+    SQL_POOL_IDLE_TIMEOUT_SECONDS: float = 300.0
+    SQL_POOL_VALIDATION_INTERVAL_SECONDS: float = 30.0
+    # Routers async con clientes aio; no usan el catálogo de Details ni el índice de OpportunityLeads
+    ASYNC_STACK_ENABLED: bool = False
+    SINGLE_FLIGHT_ENABLED: bool = True
+    WARMUP_IN_BACKGROUND: bool = True
+    WARMUP_QUERIES_ENABLED: bool = True
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 300.0
+    USER_CACHE_NEGATIVE_TTL_SECONDS: float = 30.0
     AZURE_TENANT_ID: str
     AZURE_CLIENT_ID: str
+    AZURE_JWKS_CACHE_SECONDS: float = 3600.0
+    AZURE_JWKS_MIN_REFRESH_SECONDS: float = 60.0
+    AZURE_TOKEN_CACHE_SIZE: int = 1024
+    LEAD_JOBS_MAX_WORKERS: int = 4
+    LEAD_JOBS_CHUNK_SIZE: int = 200
+    LEAD_BULK_MAX_CONCURRENCY: int = 4
+    # Pasado este tiempo sin renovarse, otra conversión puede retomar una oportunidad en Status = 2
+    LEAD_CONVERSION_CLAIM_LEASE_SECONDS: float = 900.0
+    CACHE_CONTROL_OPPORTUNITY_DETAIL_LIST: str = "private, no-cache"
+    CACHE_CONTROL_OPPORTUNITY_DETAIL: str = "private, no-cache"
+    CACHE_CONTROL_OPPORTUNITY_SUMMARY: str = "private, no-cache"
     model_config = SettingsConfigDict(env_file=".env")
 
 
@@ -0,0 +1,154 @@
+# core/single_flight.py
+import asyncio
+import copy
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from core.metrics import SINGLE_FLIGHT_CALLS
+from core.settings import settings
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+        self.shared: Any = None
+
+
+class SingleFlight:
+    """
+    Agrupa llamadas concurrentes con la misma clave en una sola ejecución: la primera
+    (líder) llama al backend y las demás (seguidoras) esperan y reciben su resultado
+    o su excepción. Las seguidoras reciben copias para que nadie modifique el objeto
+    de otro llamador.
+    """
+
+    def __init__(self, name: str, copy_result: Callable[[Any], Any] = copy.deepcopy):
+        self.name = name
+        self.copy_result = copy_result
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable):
+        """Devuelve (llamada, es_líder) registrando la llamada en los contadores."""
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                call.followers += 1
+                self.coalesced += 1
+                leader = False
+        SINGLE_FLIGHT_CALLS.labels(self.name, "leader" if leader else "follower").inc()
+        return call, leader
+
+    def _finish(self, key: Hashable, call: _Call) -> None:
+        with self._lock:
+            # Desde aquí no se suman seguidoras: la copia compartida queda completa
+            del self._calls[key]
+        if call.followers and call.error is None:
+            # Copia tomada antes de devolver el resultado al líder, que puede modificarlo
+            call.shared = self.copy_result(call.result)
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs):
+        call, leader = self._join(key)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return self.copy_result(call.shared)
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            self._finish(key, call)
+            call.done.set()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "executions": self.calls - self.coalesced,
+            "coalesced": self.coalesced,
+            "coalescing_ratio": round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+        }
+
+
+class AsyncSingleFlight(SingleFlight):
+    """
+    Versión asíncrona: la llamada al backend corre en una tarea propia, así que si el
+    líder se cancela las seguidoras siguen esperando el mismo resultado.
+    """
+
+    def __init__(self, name: str, copy_result: Callable[[Any], Any] = copy.deepcopy):
+        super().__init__(name, copy_result)
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    async def _execute(self, key: Hashable, call: _Call, func: Callable, args, kwargs):
+        try:
+            call.result = await func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            self._tasks.pop(key, None)
+            self._finish(key, call)
+
+    async def do(self, key: Hashable, func: Callable, *args, **kwargs):
+        call, leader = self._join(key)
+        if leader:
+            task = asyncio.ensure_future(self._execute(key, call, func, args, kwargs))
+            self._tasks[key] = task
+            return await asyncio.shield(task)
+
+        # Si la llamada compartida falla, la misma excepción se propaga aquí
+        await asyncio.shield(self._tasks[key])
+        return self.copy_result(call.shared)
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def single_flight(func):
+    """
+    Decorador para métodos de lectura de repositorios (síncronos o asíncronos).
+    La clave son los argumentos de la llamada sin self: instancias distintas del
+    repositorio consultan el mismo backend y comparten la ejecución.
+    """
+    name = func.__qualname__
+
+    if inspect.iscoroutinefunction(func):
+        group = _groups[name] = AsyncSingleFlight(name)
+
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            if not settings.SINGLE_FLIGHT_ENABLED:
+                return await func(self, *args, **kwargs)
+            return await group.do((args, tuple(sorted(kwargs.items()))), func, self, *args, **kwargs)
+        return async_wrapper
+
+    group = _groups[name] = SingleFlight(name)
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not settings.SINGLE_FLIGHT_ENABLED:
+            return func(self, *args, **kwargs)
+        return group.do((args, tuple(sorted(kwargs.items()))), func, self, *args, **kwargs)
+    return wrapper
+
+
+def single_flight_stats() -> Dict[str, dict]:
+    """Llamadas, ejecuciones reales y tasa de coalescencia por método desde el arranque."""
+    return {name: group.stats() for name, group in sorted(_groups.items())}
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from domain.models.opportunity_summary import OpportunitySummary
+
+
+class AgentOpportunitySummary(BaseModel):
+    """Resumen materializado de las oportunidades activas de un agente."""
+    IdAgte: int
+    summaries: List[OpportunitySummary] = []
+    updated_at: datetime
+    # Último recálculo completo; las actualizaciones incrementales no lo cambian
+    rebuilt_at: Optional[datetime] = None
+    etag: Optional[str] = Field(default=None, exclude=True)
@@ -0,0 +1,13 @@
+from typing import List
+from pydantic import BaseModel
+
+
+class LeadBulkFailure(BaseModel):
+    lead_id: str
+    documentNumber: int | None = None
+    error: str
+
+
+class LeadBulkResult(BaseModel):
+    created_ids: List[str] = []
+    failures: List[LeadBulkFailure] = []
@@ -0,0 +1,40 @@
+from datetime import datetime
+from enum import StrEnum
+from typing import List, Optional
+from pydantic import BaseModel, Field, computed_field
+
+from domain.models.lead_bulk_result import LeadBulkFailure
+
+
+class LeadJobStatus(StrEnum):
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class LeadConversionJob(BaseModel):
+    id: str
+    OpportunityId: int
+    IdAgte: int
+    CreatedBy: str
+    status: LeadJobStatus = LeadJobStatus.pending
+    total: int = 0
+    processed: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: List[LeadBulkFailure] = []
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    etag: Optional[str] = Field(default=None, exclude=True)
+
+    @computed_field
+    @property
+    def throughput(self) -> Optional[float]:
+        """Leads procesados por segundo desde que inició el job."""
+        if not self.started_at or not self.updated_at or not self.processed:
+            return None
+        elapsed = (self.updated_at - self.started_at).total_seconds()
+        return round(self.processed / elapsed, 2) if elapsed > 0 else None
@@ -0,0 +1,21 @@
+from enum import StrEnum
+from typing import List, Optional
+from pydantic import BaseModel
+
+from domain.models.lead import Lead
+from domain.models.lead_bulk_result import LeadBulkFailure
+
+
+class OpportunityConversionStatus(StrEnum):
+    converted = "converted"
+    partial = "partial"
+    not_found = "not_found"
+    error = "error"
+
+
+class OpportunityConversionResult(BaseModel):
+    OpportunityId: int
+    status: OpportunityConversionStatus
+    leads: List[Lead] = []
+    failures: List[LeadBulkFailure] = []
+    error: Optional[str] = None
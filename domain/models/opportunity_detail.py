@@ -1,5 +1,5 @@
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
 
 class OpportunityDetail(BaseModel):
     OpportunityId: int
@@ -8,4 +8,9 @@ class OpportunityDetail(BaseModel):
     Description: str
     EmailTemplate: str
     DaliPrompt: str
-    Categories: List[str]
\ No newline at end of file
+    Categories: List[str]
+    etag: Optional[str] = Field(default=None, exclude=True)
+
+
+OPPORTUNITY_DETAIL = TypeAdapter(OpportunityDetail)
+OPPORTUNITY_DETAIL_LIST = TypeAdapter(List[OpportunityDetail])
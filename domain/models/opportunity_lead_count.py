@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class OpportunityLeadCount(BaseModel):
+    OpportunityId: int
+    Priority: int
+    lead_count: int
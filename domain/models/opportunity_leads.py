@@ -1,5 +1,6 @@
+from datetime import datetime
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
 
 from domain.models.opportunity_lead import OpportunityLead
 
@@ -14,4 +15,11 @@ class OpportunityLeads(BaseModel):
     WSaler: str
     Status: int
     Priority: int
-    leads: List[OpportunityLead]
\ No newline at end of file
+    leads: List[OpportunityLead]
+    # Quién reclamó la conversión (Status = 2) y cuándo; un reclamo vencido se puede retomar
+    ClaimedBy: Optional[str] = None
+    ClaimedAt: Optional[datetime] = None
+    etag: Optional[str] = Field(default=None, exclude=True)
+
+
+OPPORTUNITY_LEADS_LIST = TypeAdapter(List[OpportunityLeads])
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from domain.models.opportunity_lead import OpportunityLead
 
@@ -11,4 +11,7 @@ class OpportunitySummary(BaseModel):
     Title: str
     Subtitle: str
     Description: str
-    Categories: List[str]
\ No newline at end of file
+    Categories: List[str]
+
+
+OPPORTUNITY_SUMMARY_LIST = TypeAdapter(List[OpportunitySummary])
@@ -0,0 +1,113 @@
+# infrastructure/adapters/async_cosmos_adapter.py
+import logging
+from typing import Dict, Optional
+from azure.cosmos import PartitionKey
+from azure.cosmos.aio import CosmosClient
+from core.settings import settings
+from core.exceptions import ConnectionErrorException
+from infrastructure.adapters.cosmos_adapter import configured_containers, cosmos_request_hook, cosmos_response_hook
+from infrastructure.adapters.cosmos_indexing import indexing_policies, policy_matches
+
+
+def async_query_scope(partition_key_path: str, **known_values) -> dict:
+    """
+    Igual que query_scope, para el SDK asíncrono: sin partition key conocida
+    no se pasa ningún argumento, porque azure.cosmos.aio hace fan-out por defecto.
+    """
+    field = partition_key_path.strip("/")
+    value = known_values.get(field)
+    if value is not None:
+        return {"partition_key": value}
+    return {}
+
+
+class AsyncCosmosAdapter:
+    """
+    Cliente asíncrono de Cosmos DB (azure.cosmos.aio) de larga duración.
+    Cachea los proxies de contenedor por nombre.
+    """
+
+    def __init__(self):
+        try:
+            self.client = CosmosClient(
+                settings.COSMOS_URI,
+                credential=settings.COSMOS_KEY,
+                raw_request_hook=cosmos_request_hook,
+                raw_response_hook=cosmos_response_hook,
+            )
+            self.database = self.client.get_database_client(settings.COSMOS_DATABASE)
+        except Exception as e:
+            logging.error(f"Error al conectar con Cosmos DB: {str(e)}")
+            raise ConnectionErrorException("No se pudo establecer conexión con Cosmos DB.")
+        self._containers = {}
+
+    async def provision(self, containers: Optional[Dict[str, str]] = None) -> None:
+        """Crea la base de datos y los contenedores si no existen (paso explícito de arranque)."""
+        containers = containers or configured_containers()
+        policies = indexing_policies() if settings.COSMOS_INDEXING_POLICIES_ENABLED else {}
+        try:
+            self.database = await self.client.create_database_if_not_exists(id=settings.COSMOS_DATABASE)
+            for container_name, partition_key in containers.items():
+                policy = policies.get(container_name)
+                container = await self.database.create_container_if_not_exists(
+                    id=container_name,
+                    partition_key=PartitionKey(path=partition_key),
+                    indexing_policy=policy,
+                    offer_throughput=400
+                )
+                self._containers[container_name] = container
+                if policy is not None and not policy_matches((await container.read()).get("indexingPolicy"), policy):
+                    logging.warning(
+                        f"La política de indexación de {container_name} difiere de la declarada; "
+                        f"aplíquela con: python -m scripts.cosmos_indexing apply --container {container_name}"
+                    )
+                logging.info(f"Contenedor {container_name} aprovisionado.")
+        except Exception as e:
+            logging.error(f"Error al aprovisionar Cosmos DB: {str(e)}")
+            raise ConnectionErrorException("No se pudo aprovisionar Cosmos DB.")
+
+    def get_container(self, container_name: str, partition_key: Optional[str] = None):
+        """Devuelve el proxy cacheado del contenedor, sin llamadas al plano de control."""
+        container = self._containers.get(container_name)
+        if container is None:
+            try:
+                container = self.database.get_container_client(container_name)
+            except Exception as e:
+                logging.error(f"Error al obtener contenedor {container_name}: {str(e)}")
+                raise ConnectionErrorException(f"No se pudo obtener el contenedor {container_name}.")
+            self._containers[container_name] = container
+        return container
+
+    async def close(self):
+        try:
+            await self.client.close()
+        except Exception as e:
+            logging.warning(f"Error al cerrar el cliente asíncrono de Cosmos DB: {str(e)}")
+        self._containers = {}
+
+
+_adapter: Optional[AsyncCosmosAdapter] = None
+
+
+async def init_async_cosmos_adapter(provision: bool = False) -> AsyncCosmosAdapter:
+    """Crea el cliente asíncrono de Cosmos del proceso; se invoca desde el lifespan de FastAPI."""
+    global _adapter
+    if _adapter is None:
+        _adapter = AsyncCosmosAdapter()
+    if provision:
+        await _adapter.provision()
+    return _adapter
+
+
+async def close_async_cosmos_adapter() -> None:
+    global _adapter
+    if _adapter is not None:
+        await _adapter.close()
+        _adapter = None
+
+
+def get_async_cosmos_session() -> AsyncCosmosAdapter:
+    global _adapter
+    if _adapter is None:
+        _adapter = AsyncCosmosAdapter()
+    return _adapter
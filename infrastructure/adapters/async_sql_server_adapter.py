@@ -0,0 +1,56 @@
+# infrastructure/adapters/async_sql_server_adapter.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from infrastructure.adapters.sql_server_adapter import SqlConnectionPool, SqlServerAdapter, get_sql_pool
+
+
+class AsyncSqlServerAdapter:
+    """
+    Adaptador asíncrono de SQL Server. pyodbc es bloqueante, así que las llamadas
+    se ejecutan en un executor propio del tamaño del pool de conexiones, sin
+    ocupar el threadpool de FastAPI ni bloquear el event loop.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor, pool: Optional[SqlConnectionPool] = None):
+        self.executor = executor
+        self.sync = SqlServerAdapter(pool)
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Ejecuta una función bloqueante de acceso a SQL en el executor del adaptador."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    async def execute_query(self, query: str, params: tuple = None, fetchone=False, fetchall=False):
+        return await self.run(self.sync.execute_query, query, params, fetchone=fetchone, fetchall=fetchall)
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_sql_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_sql_pool().max_size,
+                    thread_name_prefix="sql-server",
+                )
+    return _executor
+
+
+def close_sql_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+def get_async_sql_server_session():
+    return AsyncSqlServerAdapter(get_sql_executor())
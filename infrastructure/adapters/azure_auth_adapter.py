@@ -1,25 +1,128 @@
 # infrastructure/adapters/azure_auth_adapter.py
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from typing import Optional
+
 import jwt
 from jwt import PyJWKClient
+from jwt.exceptions import PyJWKClientError
 from fastapi import Depends, HTTPException
+from core.cache import TTLCache
+from core.metrics import observe_dependency
 from core.settings import settings
-from application.ports.auth_port import AuthPort
+from application.ports.auth_port import AsyncAuthPort, AuthPort
+
+
+class SigningKeyCache:
+    """
+    Cache en proceso de las llaves de firma del tenant (JWKS).
+    Refresca al encontrar un kid desconocido o al vencer, con una tasa de refresco acotada.
+    """
+
+    def __init__(self, jwks_uri: str, max_age: float, min_refresh_interval: float):
+        self._client = PyJWKClient(jwks_uri, cache_keys=False, cache_jwk_set=False)
+        self.max_age = max_age
+        self.min_refresh_interval = min_refresh_interval
+        self._keys = {}
+        self._fetched_at = float("-inf")
+        self._last_refresh_attempt = float("-inf")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def _refresh(self) -> None:
+        self._last_refresh_attempt = time.monotonic()
+        try:
+            with observe_dependency("azure_ad", "jwks_refresh"):
+                signing_keys = self._client.get_signing_keys(refresh=True)
+        except Exception as e:
+            if not self._keys:
+                raise
+            logging.warning(f"No se pudo refrescar el JWKS, se conservan las llaves cacheadas: {str(e)}")
+            return
+        self._keys = {key.key_id: key.key for key in signing_keys}
+        self._fetched_at = time.monotonic()
+        self.refreshes += 1
+
+    def warm(self) -> int:
+        """Descarga las llaves de firma por adelantado; devuelve cuántas quedaron en cache."""
+        with self._lock:
+            self._refresh()
+        return len(self._keys)
+
+    def get_signing_key(self, kid: str):
+        key = self._keys.get(kid)
+        if key is not None and time.monotonic() - self._fetched_at < self.max_age:
+            self.hits += 1
+            return key
+
+        with self._lock:
+            now = time.monotonic()
+            key = self._keys.get(kid)
+            if key is not None and now - self._fetched_at < self.max_age:
+                self.hits += 1
+                return key
+
+            self.misses += 1
+            if now - self._last_refresh_attempt >= self.min_refresh_interval:
+                self._refresh()
+                key = self._keys.get(kid)
+
+            if key is None:
+                raise PyJWKClientError(f"No se encontró una llave de firma para el kid {kid}.")
+            return key
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._keys),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+        }
 
 
 class AzureAuthAdapter(AuthPort):
+    def __init__(self):
+        self.signing_keys = SigningKeyCache(
+            f"https://login.microsoftonline.com/{settings.AZURE_TENANT_ID}/discovery/v2.0/keys",
+            max_age=settings.AZURE_JWKS_CACHE_SECONDS,
+            min_refresh_interval=settings.AZURE_JWKS_MIN_REFRESH_SECONDS,
+        )
+        self.verified_tokens = TTLCache(maxsize=settings.AZURE_TOKEN_CACHE_SIZE)
+
+    def _token_key(self, token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get_cached_user(self, token: str) -> Optional[dict]:
+        """Identidad de un token ya verificado y vigente, sin volver a validar la firma."""
+        cached = self.verified_tokens.get(self._token_key(token))
+        return dict(cached) if cached is not None else None
+
     def get_current_user(self, token: str) -> dict:
+        cached = self.get_cached_user(token)
+        if cached is not None:
+            return cached
+        return self.verify_token(token)
+
+    def verify_token(self, token: str) -> dict:
+        """Valida firma, audiencia y expiración del token y cachea la identidad resultante."""
         try:
-            jwks_client = PyJWKClient(f"https://login.microsoftonline.com/{settings.AZURE_TENANT_ID}/discovery/v2.0/keys")
-            signing_key = jwks_client.get_signing_key_from_jwt(token).key
+            kid = jwt.get_unverified_header(token).get("kid")
+            signing_key = self.signing_keys.get_signing_key(kid)
 
-            payload = jwt.decode(
-                token,
-                signing_key,
-                algorithms=["RS256"],
-                audience=settings.AZURE_CLIENT_ID,
-            )
+            with observe_dependency("azure_ad", "verify_token"):
+                payload = jwt.decode(
+                    token,
+                    signing_key,
+                    algorithms=["RS256"],
+                    audience=settings.AZURE_CLIENT_ID,
+                )
 
-            return {
+            user = {
                 "email": payload.get("preferred_username") or payload.get("upn"),
                 "sub": payload.get("sub"),
             }
@@ -28,3 +131,48 @@ class AzureAuthAdapter(AuthPort):
             raise HTTPException(status_code=401, detail="Token expirado.")
         except Exception as e:
             raise HTTPException(status_code=401, detail=f"Token inválido: {str(e)}")
+
+        # Válido hasta el exp del token
+        if "exp" in payload:
+            self.verified_tokens.set(self._token_key(token), user, ttl=payload["exp"] - time.time())
+
+        return dict(user)
+
+    def stats(self) -> dict:
+        return {
+            "jwks": self.signing_keys.stats(),
+            "verified_tokens": self.verified_tokens.stats(),
+        }
+
+
+class AsyncAzureAuthAdapter(AsyncAuthPort):
+    """
+    Versión asíncrona: los tokens cacheados se resuelven en el event loop y la
+    verificación RSA (y un posible refresco del JWKS) se hace en un hilo aparte.
+    """
+
+    def __init__(self, adapter: AzureAuthAdapter):
+        self.adapter = adapter
+
+    async def get_current_user(self, token: str) -> dict:
+        cached = self.adapter.get_cached_user(token)
+        if cached is not None:
+            return cached
+        return await asyncio.to_thread(self.adapter.verify_token, token)
+
+
+_auth_adapter: Optional[AzureAuthAdapter] = None
+_auth_adapter_lock = threading.Lock()
+
+
+def get_azure_auth_adapter() -> AzureAuthAdapter:
+    global _auth_adapter
+    if _auth_adapter is None:
+        with _auth_adapter_lock:
+            if _auth_adapter is None:
+                _auth_adapter = AzureAuthAdapter()
+    return _auth_adapter
+
+
+def get_async_azure_auth_adapter() -> AsyncAzureAuthAdapter:
+    return AsyncAzureAuthAdapter(get_azure_auth_adapter())
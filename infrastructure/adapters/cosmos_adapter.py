@@ -1,37 +1,191 @@
 # infrastructure/adapters/cosmos.py
 import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 from azure.cosmos import CosmosClient, PartitionKey
 from core.settings import settings
 from core.exceptions import ConnectionErrorException
+from core.metrics import DEPENDENCY_DURATION, DEPENDENCY_ERRORS
+from infrastructure.adapters.cosmos_diagnostics import prepare_cosmos_request, record_cosmos_response
+from infrastructure.adapters.cosmos_indexing import indexing_policies, policy_matches
+
+
+def configured_containers() -> Dict[str, str]:
+    """Contenedores de la aplicación con su partition key (nombre -> path)."""
+    return {
+        settings.COSMOS_OPPORTUNITY_LEADS_CONTAINER: settings.COSMOS_OPPORTUNITY_LEADS_PARTITION_KEY,
+        # Cabecera y leads de una oportunidad comparten la partition key de OpportunityLeads
+        settings.COSMOS_OPPORTUNITY_LEAD_DOCUMENTS_CONTAINER: settings.COSMOS_OPPORTUNITY_LEADS_PARTITION_KEY,
+        settings.COSMOS_OPPORTUNITY_DETAIL_CONTAINER: settings.COSMOS_OPPORTUNITY_DETAIL_PARTITION_KEY,
+        settings.COSMOS_LEAD_JOBS_CONTAINER: settings.COSMOS_LEAD_JOBS_PARTITION_KEY,
+        settings.COSMOS_OPPORTUNITY_SUMMARY_CONTAINER: settings.COSMOS_OPPORTUNITY_SUMMARY_PARTITION_KEY,
+    }
+
+
+def query_scope(partition_key_path: str, **known_values) -> dict:
+    """
+    Argumentos de alcance para query_items: si la consulta fija el valor de la
+    partition key se limita a esa partición; si no, se hace fan-out entre particiones.
+    """
+    field = partition_key_path.strip("/")
+    value = known_values.get(field)
+    if value is not None:
+        return {"partition_key": value}
+    return {"enable_cross_partition_query": True}
+
+
+def _cosmos_operation(http_request) -> str:
+    """Nombre de operación de baja cardinalidad a partir de la petición REST (p. ej. query_docs, get_docs)."""
+    headers = http_request.headers
+    if headers.get("x-ms-documentdb-isquery") == "True":
+        action = "query"
+    elif headers.get("A-IM") == "Incremental feed":
+        action = "change_feed"
+    else:
+        action = http_request.method.lower()
+    segments = [segment for segment in urlparse(http_request.url).path.split("/") if segment]
+    # /dbs/{db}/colls/{coll}/docs es un feed; /dbs/{db}/colls/{coll}/docs/{id} es un recurso
+    resource = segments[-1] if len(segments) % 2 else segments[-2] if segments else "account"
+    return f"{action}_{resource}"
+
+
+def cosmos_request_hook(request) -> None:
+    prepare_cosmos_request(request.http_request)
+    request.context["metrics_started_at"] = time.perf_counter()
+
+
+def cosmos_response_hook(response) -> None:
+    """Registra latencia y RU de cada petición HTTP a Cosmos (incluidos reintentos)."""
+    started_at = response.context.get("metrics_started_at")
+    if started_at is None:
+        return
+    record_cosmos_response(response.http_response.headers)
+    operation = _cosmos_operation(response.http_request)
+    DEPENDENCY_DURATION.labels("cosmos", operation).observe(time.perf_counter() - started_at)
+    if response.http_response.status_code >= 400:
+        DEPENDENCY_ERRORS.labels("cosmos", operation).inc()
+
+
+def read_change_feed(
+    container, continuation: Optional[str] = None, from_beginning: bool = False
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Lee los cambios del change feed a partir del token de continuación.
+    Sin token empieza desde ahora (o desde el principio con from_beginning); devuelve
+    los documentos y el token de continuación del pager, que es el que acepta la
+    siguiente llamada (el etag de la respuesta no sirve como continuation).
+    """
+    if continuation is None:
+        feed = container.query_items_change_feed(start_time="Beginning" if from_beginning else "Now")
+    else:
+        feed = container.query_items_change_feed(continuation=continuation)
+    pager = feed.by_page()
+    items = [item for page in pager for item in page]
+    return items, pager.continuation_token or continuation
 
 
 class CosmosAdapter:
+    """
+    Cliente de Cosmos DB de larga duración. Se crea una sola vez por proceso
+    y cachea los proxies de contenedor por nombre.
+    """
+
     def __init__(self):
         try:
-            self.client = CosmosClient(settings.COSMOS_URI, credential=settings.COSMOS_KEY)
-            self.database = self.client.create_database_if_not_exists(id=settings.COSMOS_DATABASE)
+            self.client = CosmosClient(
+                settings.COSMOS_URI,
+                credential=settings.COSMOS_KEY,
+                raw_request_hook=cosmos_request_hook,
+                raw_response_hook=cosmos_response_hook,
+            )
+            self.database = self.client.get_database_client(settings.COSMOS_DATABASE)
         except Exception as e:
             logging.error(f"Error al conectar con Cosmos DB: {str(e)}")
             raise ConnectionErrorException("No se pudo establecer conexión con Cosmos DB.")
+        self._containers = {}
+        self._lock = threading.Lock()
 
-    def get_container(self, container_name: str, partition_key: str):
+    def provision(self, containers: Optional[Dict[str, str]] = None) -> None:
+        """
+        Crea la base de datos y los contenedores si no existen (paso explícito de arranque).
+        Los contenedores nuevos se crean con su política de indexación declarada; en los
+        existentes solo se avisa si difiere, porque cambiarla reindexa todo el contenedor.
+        """
+        containers = containers or configured_containers()
+        policies = indexing_policies() if settings.COSMOS_INDEXING_POLICIES_ENABLED else {}
         try:
-            return self.database.create_container_if_not_exists(
-                id=container_name,
-                partition_key=PartitionKey(path=partition_key),
-                offer_throughput=400
-            )
+            self.database = self.client.create_database_if_not_exists(id=settings.COSMOS_DATABASE)
+            for container_name, partition_key in containers.items():
+                policy = policies.get(container_name)
+                container = self.database.create_container_if_not_exists(
+                    id=container_name,
+                    partition_key=PartitionKey(path=partition_key),
+                    indexing_policy=policy,
+                    offer_throughput=400
+                )
+                with self._lock:
+                    self._containers[container_name] = container
+                if policy is not None and not policy_matches(container.read().get("indexingPolicy"), policy):
+                    logging.warning(
+                        f"La política de indexación de {container_name} difiere de la declarada; "
+                        f"aplíquela con: python -m scripts.cosmos_indexing apply --container {container_name}"
+                    )
+                logging.info(f"Contenedor {container_name} aprovisionado.")
+        except Exception as e:
+            logging.error(f"Error al aprovisionar Cosmos DB: {str(e)}")
+            raise ConnectionErrorException("No se pudo aprovisionar Cosmos DB.")
+
+    def get_container(self, container_name: str, partition_key: Optional[str] = None):
+        """Devuelve el proxy cacheado del contenedor, sin llamadas al plano de control."""
+        container = self._containers.get(container_name)
+        if container is not None:
+            return container
+        try:
+            with self._lock:
+                container = self._containers.get(container_name)
+                if container is None:
+                    container = self.database.get_container_client(container_name)
+                    self._containers[container_name] = container
+            return container
         except Exception as e:
             logging.error(f"Error al obtener contenedor {container_name}: {str(e)}")
             raise ConnectionErrorException(f"No se pudo obtener el contenedor {container_name}.")
 
     def close(self):
+        try:
+            self.client.__exit__()
+        except Exception as e:
+            logging.warning(f"Error al cerrar el cliente de Cosmos DB: {str(e)}")
         self.client = None
+        self._containers = {}
+
+
+_adapter: Optional[CosmosAdapter] = None
+_adapter_lock = threading.Lock()
+
+
+def init_cosmos_adapter(provision: bool = False) -> CosmosAdapter:
+    """Crea el cliente de Cosmos del proceso; se invoca desde el lifespan de FastAPI."""
+    global _adapter
+    with _adapter_lock:
+        if _adapter is None:
+            _adapter = CosmosAdapter()
+    if provision:
+        _adapter.provision()
+    return _adapter
+
+
+def close_cosmos_adapter() -> None:
+    global _adapter
+    with _adapter_lock:
+        if _adapter is not None:
+            _adapter.close()
+            _adapter = None
 
 
-def get_cosmos_session():
-    db = CosmosAdapter()
-    try:
-        yield db
-    finally:
-        db.close()
+def get_cosmos_session() -> CosmosAdapter:
+    if _adapter is None:
+        return init_cosmos_adapter()
+    return _adapter
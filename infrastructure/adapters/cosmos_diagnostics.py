@@ -0,0 +1,173 @@
+# infrastructure/adapters/cosmos_diagnostics.py
+import base64
+import functools
+import inspect
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from prometheus_client import Counter
+from core.settings import settings
+
+COSMOS_REQUEST_CHARGE = Counter(
+    "cosmos_request_charge_total",
+    "RU consumidas en Cosmos DB por método de repositorio.",
+    ["operation"],
+)
+
+slow_query_logger = logging.getLogger("cosmos.slow_query")
+
+
+@dataclass
+class CosmosCall:
+    """Costo acumulado de una invocación de un método de repositorio."""
+    operation: str
+    sampled: bool = False
+    request_charge: float = 0.0
+    items: int = 0
+    pages: int = 0
+    query_metrics: Optional[str] = None
+    index_metrics: Optional[str] = None
+    started_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class CosmosOperationStats:
+    calls: int = 0
+    request_charge_total: float = 0.0
+    request_charge_max: float = 0.0
+    duration_total_ms: float = 0.0
+    duration_max_ms: float = 0.0
+    items: int = 0
+    pages: int = 0
+    slow_calls: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "request_charge_total": round(self.request_charge_total, 2),
+            "request_charge_avg": round(self.request_charge_total / self.calls, 2) if self.calls else 0.0,
+            "request_charge_max": round(self.request_charge_max, 2),
+            "duration_avg_ms": round(self.duration_total_ms / self.calls, 3) if self.calls else 0.0,
+            "duration_max_ms": round(self.duration_max_ms, 3),
+            "items": self.items,
+            "pages": self.pages,
+            "slow_calls": self.slow_calls,
+        }
+
+
+_current_call: ContextVar[Optional[CosmosCall]] = ContextVar("cosmos_current_call", default=None)
+_stats: Dict[str, CosmosOperationStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _decode_index_metrics(raw: str) -> str:
+    """El header de utilización de índices llega en base64; si no se puede decodificar se deja tal cual."""
+    try:
+        return json.dumps(json.loads(base64.b64decode(raw)), ensure_ascii=False)
+    except Exception:
+        return raw
+
+
+def prepare_cosmos_request(http_request) -> None:
+    """Pide métricas de consulta e índices a Cosmos cuando la invocación actual fue muestreada."""
+    call = _current_call.get()
+    if call is not None and call.sampled and http_request.headers.get("x-ms-documentdb-isquery") == "True":
+        http_request.headers["x-ms-documentdb-populatequerymetrics"] = "True"
+        http_request.headers["x-ms-cosmos-populateindexmetrics"] = "True"
+
+
+def record_cosmos_response(headers) -> None:
+    """Suma RU, items y páginas de una respuesta HTTP de Cosmos a la invocación en curso."""
+    call = _current_call.get()
+    charge = float(headers.get("x-ms-request-charge") or 0.0)
+    COSMOS_REQUEST_CHARGE.labels(call.operation if call is not None else "unscoped").inc(charge)
+    if call is None:
+        return
+    call.request_charge += charge
+    call.items += int(headers.get("x-ms-item-count") or 0)
+    call.pages += 1
+    if call.sampled:
+        call.query_metrics = headers.get("x-ms-documentdb-query-metrics") or call.query_metrics
+        index_metrics = headers.get("x-ms-cosmos-index-utilization")
+        if index_metrics:
+            call.index_metrics = _decode_index_metrics(index_metrics)
+
+
+def _finish(call: CosmosCall) -> None:
+    duration_ms = (time.perf_counter() - call.started_at) * 1000
+    slow = (
+        call.request_charge >= settings.COSMOS_SLOW_QUERY_RU_THRESHOLD
+        or duration_ms >= settings.COSMOS_SLOW_QUERY_MS_THRESHOLD
+    )
+    with _stats_lock:
+        stats = _stats.setdefault(call.operation, CosmosOperationStats())
+        stats.calls += 1
+        stats.request_charge_total += call.request_charge
+        stats.request_charge_max = max(stats.request_charge_max, call.request_charge)
+        stats.duration_total_ms += duration_ms
+        stats.duration_max_ms = max(stats.duration_max_ms, duration_ms)
+        stats.items += call.items
+        stats.pages += call.pages
+        stats.slow_calls += int(slow)
+
+    entry = {
+        "operation": call.operation,
+        "request_charge": round(call.request_charge, 2),
+        "duration_ms": round(duration_ms, 3),
+        "items": call.items,
+        "pages": call.pages,
+    }
+    if call.query_metrics or call.index_metrics:
+        entry["query_metrics"] = call.query_metrics
+        entry["index_metrics"] = call.index_metrics
+    if slow:
+        slow_query_logger.warning(f"Consulta lenta en Cosmos DB: {json.dumps(entry, ensure_ascii=False)}")
+    elif call.sampled:
+        slow_query_logger.info(f"Métricas de consulta muestreadas en Cosmos DB: {json.dumps(entry, ensure_ascii=False)}")
+
+
+@contextmanager
+def cosmos_call(operation: str):
+    """Agrupa las peticiones a Cosmos hechas dentro del bloque bajo un mismo nombre de operación."""
+    if _current_call.get() is not None:
+        # Llamada anidada (p. ej. get_by_opportunity_ids -> get_by_opportunity_id): cuenta en la externa
+        yield
+        return
+    call = CosmosCall(operation, sampled=random.random() < settings.COSMOS_QUERY_METRICS_SAMPLE_RATE)
+    token = _current_call.set(call)
+    try:
+        yield call
+    finally:
+        _current_call.reset(token)
+        _finish(call)
+
+
+def track_cosmos_operation(func):
+    """Decorador para métodos de repositorio (síncronos o asíncronos) que consultan Cosmos."""
+    operation = func.__qualname__
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with cosmos_call(operation):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with cosmos_call(operation):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def cosmos_operation_stats() -> Dict[str, dict]:
+    """Agregados por método de repositorio desde el arranque."""
+    with _stats_lock:
+        return {operation: stats.as_dict() for operation, stats in sorted(_stats.items())}
@@ -0,0 +1,62 @@
+# infrastructure/adapters/cosmos_indexing.py
+from typing import Dict, List, Optional
+from core.settings import settings
+
+# Cosmos agrega siempre la exclusión de _etag; no cuenta como diferencia
+SYSTEM_EXCLUDED_PATHS = {'/"_etag"/?'}
+
+
+def _policy(included: List[str], composite: Optional[List[List[str]]] = None, excluded: Optional[List[str]] = None) -> dict:
+    """Política que indexa solo las rutas indicadas y excluye todo lo demás."""
+    policy = {
+        "indexingMode": "consistent",
+        "automatic": True,
+        "includedPaths": [{"path": f"/{path}/?"} for path in included],
+        "excludedPaths": [{"path": path} for path in (excluded or [])] + [{"path": "/*"}],
+    }
+    if composite:
+        policy["compositeIndexes"] = [
+            [{"path": f"/{path}", "order": "ascending"} for path in paths]
+            for paths in composite
+        ]
+    return policy
+
+
+def indexing_policies() -> Dict[str, dict]:
+    """
+    Política de indexación por contenedor (nombre -> política). Solo se indexan las
+    propiedades por las que filtran los repositorios; los leads embebidos de
+    OpportunityLeads quedan fuera para que el costo de escritura no crezca con ellos.
+    """
+    return {
+        settings.COSMOS_OPPORTUNITY_LEADS_CONTAINER: _policy(
+            ["IdAgte", "Status", "OpportunityId"],
+            composite=[["IdAgte", "Status"]],
+            excluded=["/leads/*"],
+        ),
+        settings.COSMOS_OPPORTUNITY_LEAD_DOCUMENTS_CONTAINER: _policy(
+            ["docType", "IdAgte", "Status", "OpportunityId", "headerId", "position"],
+            composite=[["IdAgte", "Status"]],
+            excluded=["/lead/*"],
+        ),
+        settings.COSMOS_OPPORTUNITY_DETAIL_CONTAINER: _policy(["OpportunityId"]),
+        settings.COSMOS_LEAD_JOBS_CONTAINER: _policy(["status"]),
+        settings.COSMOS_OPPORTUNITY_SUMMARY_CONTAINER: _policy(["summaries/[]/OpportunityId"]),
+    }
+
+
+def _normalized(policy: dict) -> dict:
+    return {
+        "indexingMode": (policy.get("indexingMode") or "consistent").lower(),
+        "includedPaths": {item["path"] for item in policy.get("includedPaths", [])},
+        "excludedPaths": {item["path"] for item in policy.get("excludedPaths", [])} - SYSTEM_EXCLUDED_PATHS,
+        "compositeIndexes": {
+            tuple((item["path"], (item.get("order") or "ascending").lower()) for item in composite)
+            for composite in policy.get("compositeIndexes", [])
+        },
+    }
+
+
+def policy_matches(current: Optional[dict], desired: dict) -> bool:
+    """Compara la política vigente con la declarada ignorando el orden y los valores que agrega Cosmos."""
+    return current is not None and _normalized(current) == _normalized(desired)
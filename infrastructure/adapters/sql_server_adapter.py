@@ -1,47 +1,316 @@
 # infrastructure/adapters/sql_server_adapter.py
 import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
 import pyodbc
 from core.settings import settings
 from core.exceptions import ConnectionErrorException
+from core.metrics import observe_dependency
 
-class SqlServerAdapter:
-    def __init__(self):
-        self.connection_string = (
-            f"DRIVER={settings.SQL_DRIVER};"
-            f"SERVER={settings.SQL_SERVER};"
-            f"DATABASE={settings.SQL_DATABASE};"
-            f"UID={settings.SQL_USERNAME};"
-            f"PWD={settings.SQL_PASSWORD};"
-        )
-
-    def get_connection(self):
+# SqlConnectionPool ya reutiliza las conexiones; el pooling del driver manager de ODBC
+# se desactiva antes de la primera conexión para no mantener dos pools superpuestos
+pyodbc.pooling = False
+
+
+def build_connection_string() -> str:
+    return (
+        f"DRIVER={settings.SQL_DRIVER};"
+        f"SERVER={settings.SQL_SERVER};"
+        f"DATABASE={settings.SQL_DATABASE};"
+        f"UID={settings.SQL_USERNAME};"
+        f"PWD={settings.SQL_PASSWORD};"
+    )
+
+
+class _PooledConnection:
+    __slots__ = ("connection", "created_at", "last_used_at")
+
+    def __init__(self, connection: Any):
+        now = time.monotonic()
+        self.connection = connection
+        self.created_at = now
+        self.last_used_at = now
+
+
+class SqlConnectionPool:
+    """
+    Pool de conexiones thread-safe compartido por toda la aplicación.
+    Reutiliza conexiones abiertas en lugar de abrir una nueva por consulta.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        idle_timeout: float = 300.0,
+        validation_interval: float = 30.0,
+    ):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Tamaños de pool inválidos.")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.validation_interval = validation_interval
+
+        self._cond = threading.Condition()
+        self._idle: deque[_PooledConnection] = deque()
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._timeouts = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    def open(self) -> None:
+        """Abre las conexiones mínimas del pool."""
+        while True:
+            with self._cond:
+                if self._closed or self._in_use + len(self._idle) >= self.min_size:
+                    return
+                self._in_use += 1
+            pooled = self._create()
+            self.release(pooled)
+
+    def _create(self) -> _PooledConnection:
+        try:
+            pooled = _PooledConnection(self._connect())
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created += 1
+        return pooled
+
+    def _is_valid(self, pooled: _PooledConnection) -> bool:
         try:
-            return pyodbc.connect(self.connection_string)
+            cursor = pooled.connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            finally:
+                cursor.close()
+            return True
         except Exception as e:
-            logging.error(f"Error al conectar con SQL Server: {str(e)}")
-            raise ConnectionErrorException("No se pudo establecer conexión con SQL Server.")
+            logging.warning(f"Conexión SQL inválida descartada del pool: {str(e)}")
+            return False
 
-    def execute_query(self, query: str, params: tuple = None, fetchone=False, fetchall=False):
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def _close_quietly(self, pooled: _PooledConnection) -> None:
         try:
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
+            pooled.connection.close()
+        except Exception:
+            pass
+
+    def _evict_idle_locked(self, now: float) -> list:
+        """Retira conexiones ociosas vencidas manteniendo el tamaño mínimo."""
+        evicted = []
+        while (
+            self._idle
+            and self._in_use + len(self._idle) > self.min_size
+            and now - self._idle[0].last_used_at > self.idle_timeout
+        ):
+            evicted.append(self._idle.popleft())
+        self._discarded += len(evicted)
+        return evicted
+
+    def acquire(self) -> _PooledConnection:
+        start = time.monotonic()
+        deadline = start + self.timeout
+        pooled = None
+        evicted = []
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise ConnectionErrorException("El pool de conexiones SQL está cerrado.")
+                evicted.extend(self._evict_idle_locked(time.monotonic()))
+                if self._idle:
+                    pooled = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._in_use + len(self._idle) < self.max_size:
+                    self._in_use += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    logging.error(f"Tiempo de espera agotado por una conexión SQL: {self.stats()}")
+                    raise ConnectionErrorException("No hay conexiones SQL disponibles en el pool.")
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+            waited = time.monotonic() - start
+            self._checkouts += 1
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+
+        for stale in evicted:
+            self._close_quietly(stale)
+
+        if pooled is None:
+            return self._create()
 
-            if fetchone:
-                result = cursor.fetchone()
-            elif fetchall:
-                result = cursor.fetchall()
+        if time.monotonic() - pooled.last_used_at > self.validation_interval and not self._is_valid(pooled):
+            self._close_quietly(pooled)
+            with self._cond:
+                self._discarded += 1
+            return self._create()
+
+        return pooled
+
+    def release(self, pooled: _PooledConnection, discard: bool = False) -> None:
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._discarded += 1
             else:
-                result = None
+                pooled.last_used_at = time.monotonic()
+                self._idle.append(pooled)
+                pooled = None
+            self._cond.notify()
+        if pooled is not None:
+            self._close_quietly(pooled)
 
-            conn.commit()
-            return result
+    @contextmanager
+    def connection(self):
+        with observe_dependency("sql_server", "pool_acquire"):
+            pooled = self.acquire()
+        discard = False
+        try:
+            yield pooled.connection
+        except Exception:
+            try:
+                pooled.connection.rollback()
+            except Exception:
+                discard = True
+            raise
         finally:
-            cursor.close()
-            conn.close()
+            self.release(pooled, discard=discard)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._discarded += len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            self._close_quietly(pooled)
+
+    def stats(self) -> dict:
+        """Métricas del pool para dimensionarlo frente al threadpool de FastAPI."""
+        with self._cond:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._in_use + len(self._idle),
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "created": self._created,
+                "discarded": self._discarded,
+                "timeouts": self._timeouts,
+                "wait_time_total_ms": round(self._wait_time_total * 1000, 3),
+                "wait_time_max_ms": round(self._wait_time_max * 1000, 3),
+                "wait_time_avg_ms": round(self._wait_time_total * 1000 / self._checkouts, 3) if self._checkouts else 0.0,
+            }
+
+
+def _connect() -> Any:
+    try:
+        return pyodbc.connect(build_connection_string())
+    except Exception as e:
+        logging.error(f"Error al conectar con SQL Server: {str(e)}")
+        raise ConnectionErrorException("No se pudo establecer conexión con SQL Server.")
+
+
+_pool: Optional[SqlConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_sql_pool() -> SqlConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SqlConnectionPool(
+                    _connect,
+                    min_size=settings.SQL_POOL_MIN_SIZE,
+                    max_size=settings.SQL_POOL_MAX_SIZE,
+                    timeout=settings.SQL_POOL_TIMEOUT_SECONDS,
+                    idle_timeout=settings.SQL_POOL_IDLE_TIMEOUT_SECONDS,
+                    validation_interval=settings.SQL_POOL_VALIDATION_INTERVAL_SECONDS,
+                )
+    return _pool
+
+
+def close_sql_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+class SqlServerAdapter:
+    def __init__(self, pool: Optional[SqlConnectionPool] = None):
+        self.pool = pool or get_sql_pool()
+
+    @contextmanager
+    def connection(self):
+        with self.pool.connection() as conn:
+            yield conn
+
+    @contextmanager
+    def transaction(self):
+        """Entrega un cursor dentro de una transacción: commit al salir, rollback si falla."""
+        with self.connection() as conn, observe_dependency("sql_server", "transaction"):
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def execute_query(self, query: str, params: tuple = None, fetchone=False, fetchall=False):
+        with self.connection() as conn, observe_dependency("sql_server", "execute_query"):
+            cursor = conn.cursor()
+            try:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+
+                if fetchone:
+                    result = cursor.fetchone()
+                elif fetchall:
+                    result = cursor.fetchall()
+                else:
+                    result = None
+
+                conn.commit()
+                return result
+            finally:
+                cursor.close()
 
 def get_sql_server_session():
     return SqlServerAdapter()
@@ -0,0 +1,25 @@
+# infrastructure/repositories/async_lead_repository.py
+from typing import Dict, List, Set
+from application.ports.lead_repository_port import AsyncLeadRepositoryPort
+from domain.models.lead import Lead
+from domain.models.lead_bulk_result import LeadBulkResult
+from infrastructure.adapters.async_sql_server_adapter import AsyncSqlServerAdapter
+from infrastructure.repositories.lead_repository import LeadRepository
+
+
+class AsyncLeadRepository(AsyncLeadRepositoryPort):
+    def __init__(self, adapter: AsyncSqlServerAdapter):
+        self.adapter = adapter
+        self.repository = LeadRepository(adapter.sync)
+
+    async def create_lead(self, lead: Lead, lead_id: str) -> None:
+        await self.adapter.run(self.repository.create_lead, lead, lead_id)
+
+    async def create_leads_bulk(self, leads: Dict[str, Lead], verify_user: bool = True) -> LeadBulkResult:
+        return await self.adapter.run(self.repository.create_leads_bulk, leads, verify_user)
+
+    async def user_exists(self, user_id: str) -> bool:
+        return await self.adapter.run(self.repository.user_exists, user_id)
+
+    async def get_existing_ids(self, lead_ids: List[str]) -> Set[str]:
+        return await self.adapter.run(self.repository.get_existing_ids, lead_ids)
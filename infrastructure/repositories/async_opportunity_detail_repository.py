@@ -0,0 +1,90 @@
+# infrastructure/repositories/async_opportunity_detail_repository.py
+import logging
+from typing import AsyncIterator, List, Optional
+from core.settings import settings
+from core.exceptions import ConnectionErrorException
+from core.single_flight import single_flight
+from infrastructure.adapters.async_cosmos_adapter import AsyncCosmosAdapter, async_query_scope
+from infrastructure.adapters.cosmos_diagnostics import track_cosmos_operation
+from infrastructure.repositories.opportunity_detail_repository import OpportunityDetailRepository
+from application.ports.opportunity_detail_repository_port import AsyncOpportunityDetailRepositoryPort
+from domain.models.opportunity_detail import OpportunityDetail
+from domain.models.page import Page
+
+
+class AsyncOpportunityDetailRepository(AsyncOpportunityDetailRepositoryPort):
+    _map_to_domain = OpportunityDetailRepository._map_to_domain
+
+    def __init__(self, session: AsyncCosmosAdapter):
+        self.partition_key = settings.COSMOS_OPPORTUNITY_DETAIL_PARTITION_KEY
+        self.container = session.get_container(
+            settings.COSMOS_OPPORTUNITY_DETAIL_CONTAINER,
+            settings.COSMOS_OPPORTUNITY_DETAIL_PARTITION_KEY
+        )
+
+    @track_cosmos_operation
+    async def get_all(self) -> List[OpportunityDetail]:
+        try:
+            query = "SELECT * FROM c"
+            return [self._map_to_domain(doc) async for doc in self.container.query_items(query=query)]
+        except Exception as e:
+            logging.error(f"Error al consultar Details: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los Details.")
+
+    @track_cosmos_operation
+    async def get_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityDetail]:
+        try:
+            query = "SELECT * FROM c"
+            pager = self.container.query_items(query=query, max_item_count=page_size).by_page(continuation)
+            items = []
+            async for page in pager:
+                items = [self._map_to_domain(doc) async for doc in page]
+                break
+            return Page[OpportunityDetail](items=items, continuation=pager.continuation_token)
+        except Exception as e:
+            logging.error(f"Error al consultar página de Details: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar la página de Details.")
+
+    async def iter_all(self) -> AsyncIterator[OpportunityDetail]:
+        try:
+            query = "SELECT * FROM c"
+            async for doc in self.container.query_items(query=query):
+                yield self._map_to_domain(doc)
+        except Exception as e:
+            logging.error(f"Error al recorrer Details: {str(e)}")
+            raise ConnectionErrorException("No se pudieron recorrer los Details.")
+
+    @single_flight
+    @track_cosmos_operation
+    async def get_by_opportunity_id(self, opportunity_id: int) -> Optional[OpportunityDetail]:
+        try:
+            query = "SELECT * FROM c WHERE c.OpportunityId=@id"
+            parameters = [{"name": "@id", "value": opportunity_id}]
+            items = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                **async_query_scope(self.partition_key, OpportunityId=opportunity_id)
+            )
+            async for doc in items:
+                return self._map_to_domain(doc)
+            return None
+        except Exception as e:
+            logging.error(f"Error al consultar Detail por ID: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar el Detail por ID.")
+
+    @track_cosmos_operation
+    async def get_by_opportunity_ids(self, opportunity_ids: List[int]) -> List[OpportunityDetail]:
+        ids = list(dict.fromkeys(opportunity_ids))
+        if not ids:
+            return []
+        if len(ids) == 1:
+            detail = await self.get_by_opportunity_id(ids[0])
+            return [detail] if detail else []
+        try:
+            query = "SELECT * FROM c WHERE ARRAY_CONTAINS(@ids, c.OpportunityId)"
+            parameters = [{"name": "@ids", "value": ids}]
+            items = self.container.query_items(query=query, parameters=parameters)
+            return [self._map_to_domain(doc) async for doc in items]
+        except Exception as e:
+            logging.error(f"Error al consultar Details por IDs: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los Details por IDs.")
@@ -0,0 +1,217 @@
+# infrastructure/repositories/async_opportunity_leads_repository.py
+import logging
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+from azure.core.utils import CaseInsensitiveDict
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError, CosmosResourceNotFoundError
+from core.settings import settings
+from core.exceptions import ConflictException, ConnectionErrorException, NotFoundException
+from core.single_flight import single_flight
+from infrastructure.adapters.async_cosmos_adapter import AsyncCosmosAdapter, async_query_scope
+from infrastructure.adapters.cosmos_diagnostics import track_cosmos_operation
+from infrastructure.repositories.opportunity_leads_repository import OpportunityLeadsRepository, patched_etag, status_fields
+from application.ports.opportunity_leads_repository_port import AsyncOpportunityLeadsRepositoryPort
+from domain.models.opportunity_lead import OpportunityLead
+from domain.models.opportunity_lead_count import OpportunityLeadCount
+from domain.models.opportunity_leads import OpportunityLeads
+from domain.models.page import Page
+
+
+class AsyncOpportunityLeadsRepository(AsyncOpportunityLeadsRepositoryPort):
+    _to_domain_fields = OpportunityLeadsRepository._to_domain_fields
+    _map_to_domain = OpportunityLeadsRepository._map_to_domain
+    _map_many = OpportunityLeadsRepository._map_many
+    _map_to_document = OpportunityLeadsRepository._map_to_document
+    _patch_status_args = OpportunityLeadsRepository._patch_status_args
+
+    def __init__(self, session: AsyncCosmosAdapter, on_update: Optional[Callable[[OpportunityLeads], Awaitable[None]]] = None):
+        self.on_update = on_update
+        self.partition_key = settings.COSMOS_OPPORTUNITY_LEADS_PARTITION_KEY
+        self.container = session.get_container(
+            settings.COSMOS_OPPORTUNITY_LEADS_CONTAINER,
+            settings.COSMOS_OPPORTUNITY_LEADS_PARTITION_KEY
+        )
+
+    @track_cosmos_operation
+    async def update(self, opportunity_lead: OpportunityLeads) -> None:
+        try:
+            doc = self._map_to_document(opportunity_lead)
+            await self.container.upsert_item(body=doc)
+        except Exception as e:
+            logging.error(f"Error al actualizar OpportunityLead: {str(e)}")
+            raise ConnectionErrorException("No se pudo actualizar el OpportunityLead.")
+        if self.on_update is not None:
+            await self.on_update(opportunity_lead)
+
+    @track_cosmos_operation
+    async def patch_status(
+            self, opportunity_lead: OpportunityLeads, status: int, claimed_by: Optional[str] = None
+    ) -> OpportunityLeads:
+        fields = status_fields(status, claimed_by)
+        headers = CaseInsensitiveDict()
+        try:
+            await self.container.patch_item(**self._patch_status_args(opportunity_lead, fields, headers))
+        except CosmosAccessConditionFailedError:
+            raise ConflictException(
+                f"La oportunidad {opportunity_lead.OpportunityId} fue modificada por otro proceso; vuelva a intentarlo."
+            )
+        except CosmosResourceNotFoundError:
+            raise NotFoundException(f"No se encontró la oportunidad {opportunity_lead.OpportunityId}.")
+        except Exception as e:
+            logging.error(f"Error al actualizar el Status de OpportunityLead: {str(e)}")
+            raise ConnectionErrorException("No se pudo actualizar el OpportunityLead.")
+        updated = opportunity_lead.model_copy(update=dict(fields, etag=patched_etag(headers, opportunity_lead)))
+        if self.on_update is not None:
+            await self.on_update(updated)
+        return updated
+
+    @track_cosmos_operation
+    async def get_all(self) -> List[OpportunityLeads]:
+        try:
+            query = "SELECT * FROM c"
+            return self._map_many([doc async for doc in self.container.query_items(query=query)])
+        except Exception as e:
+            logging.error(f"Error al consultar Leads: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los Leads.")
+
+    @track_cosmos_operation
+    async def get_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityLeads]:
+        try:
+            query = "SELECT * FROM c"
+            pager = self.container.query_items(query=query, max_item_count=page_size).by_page(continuation)
+            items = []
+            async for page in pager:
+                items = self._map_many([doc async for doc in page])
+                break
+            return Page[OpportunityLeads](items=items, continuation=pager.continuation_token)
+        except Exception as e:
+            logging.error(f"Error al consultar página de Leads: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar la página de Leads.")
+
+    async def iter_all(self) -> AsyncIterator[OpportunityLeads]:
+        try:
+            query = "SELECT * FROM c"
+            async for doc in self.container.query_items(query=query):
+                yield self._map_to_domain(doc)
+        except Exception as e:
+            logging.error(f"Error al recorrer Leads: {str(e)}")
+            raise ConnectionErrorException("No se pudieron recorrer los Leads.")
+
+    @track_cosmos_operation
+    async def get_agent_ids(self) -> List[int]:
+        try:
+            query = "SELECT DISTINCT VALUE c.IdAgte FROM c"
+            return [agent_id async for agent_id in self.container.query_items(query=query)]
+        except Exception as e:
+            logging.error(f"Error al consultar los agentes con Leads: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los agentes con Leads.")
+
+    @track_cosmos_operation
+    async def get_by_agte_id(self, agte_id: int) -> List[OpportunityLeads]:
+        try:
+            query = "SELECT * FROM c WHERE c.IdAgte=@agte_id AND c.Status = 1"
+            parameters = [{"name": "@agte_id", "value": agte_id}]
+            items = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                **async_query_scope(self.partition_key, IdAgte=agte_id)
+            )
+            return self._map_many([doc async for doc in items])
+        except Exception as e:
+            logging.error(f"Error al consultar Leads por AgteId: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los Leads por AgteId.")
+
+    @track_cosmos_operation
+    async def get_lead_counts_by_agte_id(self, agte_id: int) -> List[OpportunityLeadCount]:
+        try:
+            query = """
+            SELECT c.OpportunityId, c.Priority, ARRAY_LENGTH(c.leads) AS lead_count
+            FROM c WHERE c.IdAgte=@agte_id AND c.Status = 1
+            """
+            parameters = [{"name": "@agte_id", "value": agte_id}]
+            items = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                **async_query_scope(self.partition_key, IdAgte=agte_id)
+            )
+            return [
+                OpportunityLeadCount(
+                    OpportunityId=doc["OpportunityId"],
+                    Priority=doc["Priority"],
+                    lead_count=doc.get("lead_count") or 0,
+                )
+                async for doc in items
+            ]
+        except Exception as e:
+            logging.error(f"Error al consultar conteo de Leads por AgteId: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar el conteo de Leads por AgteId.")
+
+    @track_cosmos_operation
+    async def get_by_opportunity_ids_and_agte(self, opportunity_ids: List[int], id_agte: int) -> List[OpportunityLeads]:
+        ids = list(dict.fromkeys(opportunity_ids))
+        if not ids:
+            return []
+        try:
+            query = "SELECT * FROM c WHERE ARRAY_CONTAINS(@ids, c.OpportunityId) AND c.IdAgte = @id_agte"
+            parameters = [
+                {"name": "@ids", "value": ids},
+                {"name": "@id_agte", "value": id_agte},
+            ]
+            items = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                **async_query_scope(self.partition_key, IdAgte=id_agte)
+            )
+            return self._map_many([doc async for doc in items])
+        except Exception as e:
+            logging.error(f"Error al consultar Leads por OpportunityIds: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los Leads por OpportunityIds.")
+
+    @track_cosmos_operation
+    async def get_leads(
+        self, opportunity_id: int, id_agte: int, continuation: Optional[str] = None, page_size: Optional[int] = None
+    ) -> Page[OpportunityLead]:
+        try:
+            # Como en _to_domain_fields, el lead puede estar envuelto en {"lead": {...}} o no
+            query = """
+            SELECT VALUE (IS_DEFINED(l.lead) ? l.lead : l) FROM c JOIN l IN c.leads
+            WHERE c.OpportunityId = @opportunity_id AND c.IdAgte = @id_agte
+            """
+            parameters = [
+                {"name": "@opportunity_id", "value": opportunity_id},
+                {"name": "@id_agte", "value": id_agte},
+            ]
+            pager = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                max_item_count=page_size or settings.OPPORTUNITY_LEADS_PAGE_SIZE,
+                **async_query_scope(self.partition_key, OpportunityId=opportunity_id, IdAgte=id_agte)
+            ).by_page(continuation)
+            items = []
+            async for page in pager:
+                items = [OpportunityLead.model_validate(lead) async for lead in page]
+                break
+            return Page[OpportunityLead](items=items, continuation=pager.continuation_token)
+        except Exception as e:
+            logging.error(f"Error al consultar página de leads de la oportunidad: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar la página de leads de la oportunidad.")
+
+    @single_flight
+    @track_cosmos_operation
+    async def get_by_opportunity_id_and_agte(self, opportunity_id: int, id_agte: int) -> Optional[OpportunityLeads]:
+        query = """
+        SELECT * FROM c WHERE c.OpportunityId = @opportunity_id AND c.IdAgte = @id_agte
+        """
+        params = [
+            {"name": "@opportunity_id", "value": opportunity_id},
+            {"name": "@id_agte", "value": id_agte},
+        ]
+
+        items = self.container.query_items(
+            query=query,
+            parameters=params,
+            **async_query_scope(self.partition_key, OpportunityId=opportunity_id, IdAgte=id_agte)
+        )
+
+        async for doc in items:
+            return self._map_to_domain(doc)
+        return None
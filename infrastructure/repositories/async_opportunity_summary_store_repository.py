@@ -0,0 +1,51 @@
+# infrastructure/repositories/async_opportunity_summary_store_repository.py
+import logging
+from typing import Optional
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError, CosmosResourceNotFoundError
+from core.settings import settings
+from core.exceptions import ConflictException, ConnectionErrorException
+from infrastructure.adapters.async_cosmos_adapter import AsyncCosmosAdapter
+from infrastructure.adapters.cosmos_diagnostics import track_cosmos_operation
+from infrastructure.repositories.opportunity_summary_store_repository import OpportunitySummaryStoreRepository
+from application.ports.opportunity_summary_store_port import AsyncOpportunitySummaryStorePort
+from domain.models.agent_opportunity_summary import AgentOpportunitySummary
+
+
+class AsyncOpportunitySummaryStoreRepository(AsyncOpportunitySummaryStorePort):
+    _map_to_domain = OpportunitySummaryStoreRepository._map_to_domain
+    _map_to_document = OpportunitySummaryStoreRepository._map_to_document
+
+    def __init__(self, session: AsyncCosmosAdapter):
+        self.container = session.get_container(
+            settings.COSMOS_OPPORTUNITY_SUMMARY_CONTAINER,
+            settings.COSMOS_OPPORTUNITY_SUMMARY_PARTITION_KEY
+        )
+
+    @track_cosmos_operation
+    async def get(self, id_agte: int) -> Optional[AgentOpportunitySummary]:
+        try:
+            return self._map_to_domain(await self.container.read_item(item=str(id_agte), partition_key=id_agte))
+        except CosmosResourceNotFoundError:
+            return None
+        except Exception as e:
+            logging.error(f"Error al consultar el resumen materializado del agente {id_agte}: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar el resumen de oportunidades.")
+
+    @track_cosmos_operation
+    async def save(self, summary: AgentOpportunitySummary) -> AgentOpportunitySummary:
+        try:
+            doc = self._map_to_document(summary)
+            if summary.etag is None:
+                return self._map_to_domain(await self.container.upsert_item(body=doc))
+            return self._map_to_domain(await self.container.replace_item(
+                item=doc["id"],
+                body=doc,
+                etag=summary.etag,
+                match_condition=MatchConditions.IfNotModified,
+            ))
+        except CosmosAccessConditionFailedError:
+            raise ConflictException(f"El resumen del agente {summary.IdAgte} fue modificado por otro proceso.")
+        except Exception as e:
+            logging.error(f"Error al guardar el resumen materializado del agente {summary.IdAgte}: {str(e)}")
+            raise ConnectionErrorException("No se pudo guardar el resumen de oportunidades.")
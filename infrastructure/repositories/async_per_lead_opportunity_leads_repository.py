@@ -0,0 +1,306 @@
+# infrastructure/repositories/async_per_lead_opportunity_leads_repository.py
+import logging
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+from azure.core.utils import CaseInsensitiveDict
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError, CosmosBatchOperationError, CosmosResourceNotFoundError
+from core.settings import settings
+from core.exceptions import ConflictException, ConnectionErrorException, NotFoundException
+from core.single_flight import single_flight
+from infrastructure.adapters.async_cosmos_adapter import AsyncCosmosAdapter, async_query_scope
+from infrastructure.adapters.cosmos_diagnostics import track_cosmos_operation
+from infrastructure.repositories.opportunity_leads_repository import patched_etag, status_fields
+from infrastructure.repositories.per_lead_opportunity_leads_repository import (
+    ASSEMBLE_BATCH_SIZE,
+    HEADER,
+    LEAD,
+    PerLeadOpportunityLeadsRepository,
+    batch_error,
+    batch_plan,
+    header_id,
+    header_operation,
+)
+from application.ports.opportunity_leads_repository_port import AsyncOpportunityLeadsRepositoryPort
+from domain.models.opportunity_lead import OpportunityLead
+from domain.models.opportunity_lead_count import OpportunityLeadCount
+from domain.models.opportunity_leads import OpportunityLeads
+from domain.models.page import Page
+
+
+class AsyncPerLeadOpportunityLeadsRepository(AsyncOpportunityLeadsRepositoryPort):
+    _partition_value = PerLeadOpportunityLeadsRepository._partition_value
+    _to_domain_fields = PerLeadOpportunityLeadsRepository._to_domain_fields
+    _map_many = PerLeadOpportunityLeadsRepository._map_many
+    _map_mixed = PerLeadOpportunityLeadsRepository._map_mixed
+    _map_to_documents = PerLeadOpportunityLeadsRepository._map_to_documents
+    _patch_status_args = PerLeadOpportunityLeadsRepository._patch_status_args
+
+    def __init__(self, session: AsyncCosmosAdapter, on_update: Optional[Callable[[OpportunityLeads], Awaitable[None]]] = None):
+        self.on_update = on_update
+        self.partition_key = settings.COSMOS_OPPORTUNITY_LEADS_PARTITION_KEY
+        self.container = session.get_container(
+            settings.COSMOS_OPPORTUNITY_LEAD_DOCUMENTS_CONTAINER,
+            settings.COSMOS_OPPORTUNITY_LEADS_PARTITION_KEY
+        )
+
+    async def _assemble(self, headers: List[dict]) -> List[OpportunityLeads]:
+        if not headers:
+            return []
+        query = "SELECT * FROM c WHERE c.docType = @doc_type AND ARRAY_CONTAINS(@header_ids, c.headerId)"
+        parameters = [
+            {"name": "@doc_type", "value": LEAD},
+            {"name": "@header_ids", "value": [header["id"] for header in headers]},
+        ]
+        lead_docs = [doc async for doc in self.container.query_items(query=query, parameters=parameters)]
+        return self._map_many(headers, lead_docs)
+
+    async def _iter_headers(self, query: str, parameters: List[dict]) -> AsyncIterator[OpportunityLeads]:
+        batch = []
+        async for header in self.container.query_items(query=query, parameters=parameters):
+            batch.append(header)
+            if len(batch) >= ASSEMBLE_BATCH_SIZE:
+                for opportunity in await self._assemble(batch):
+                    yield opportunity
+                batch = []
+        for opportunity in await self._assemble(batch):
+            yield opportunity
+
+    async def _read_header(self, opportunity_id: int, id_agte: int) -> Optional[dict]:
+        item = header_id(opportunity_id, id_agte)
+        partition_value = {"OpportunityId": opportunity_id, "IdAgte": id_agte}.get(self.partition_key.strip("/"))
+        if partition_value is None:
+            query = "SELECT * FROM c WHERE c.id = @id"
+            parameters = [{"name": "@id", "value": item}]
+            async for doc in self.container.query_items(query=query, parameters=parameters):
+                return doc
+            return None
+        try:
+            return await self.container.read_item(item=item, partition_key=partition_value)
+        except CosmosResourceNotFoundError:
+            return None
+
+    @track_cosmos_operation
+    async def update(self, opportunity_lead: OpportunityLeads) -> None:
+        try:
+            header, lead_docs = self._map_to_documents(opportunity_lead)
+            previous = await self._read_header(opportunity_lead.OpportunityId, opportunity_lead.IdAgte)
+            etag = previous.get("_etag") if previous is not None else None
+            for operations, header_body in batch_plan(header, lead_docs, previous):
+                if header_body is not None:
+                    operations.append(header_operation(header_body, etag))
+                results = await self.container.execute_item_batch(
+                    batch_operations=operations, partition_key=header[self.partition_key.strip("/")]
+                )
+                if header_body is not None:
+                    etag = results[-1].get("eTag")
+        except CosmosBatchOperationError as e:
+            raise batch_error(e, opportunity_lead)
+        except Exception as e:
+            logging.error(f"Error al actualizar OpportunityLead: {str(e)}")
+            raise ConnectionErrorException("No se pudo actualizar el OpportunityLead.")
+        if self.on_update is not None:
+            await self.on_update(opportunity_lead)
+
+    @track_cosmos_operation
+    async def patch_status(
+            self, opportunity_lead: OpportunityLeads, status: int, claimed_by: Optional[str] = None
+    ) -> OpportunityLeads:
+        fields = status_fields(status, claimed_by)
+        headers = CaseInsensitiveDict()
+        try:
+            await self.container.patch_item(**self._patch_status_args(opportunity_lead, fields, headers))
+        except CosmosAccessConditionFailedError:
+            raise ConflictException(
+                f"La oportunidad {opportunity_lead.OpportunityId} fue modificada por otro proceso; vuelva a intentarlo."
+            )
+        except CosmosResourceNotFoundError:
+            raise NotFoundException(f"No se encontró la oportunidad {opportunity_lead.OpportunityId}.")
+        except Exception as e:
+            logging.error(f"Error al actualizar el Status de OpportunityLead: {str(e)}")
+            raise ConnectionErrorException("No se pudo actualizar el OpportunityLead.")
+        updated = opportunity_lead.model_copy(update=dict(fields, etag=patched_etag(headers, opportunity_lead)))
+        if self.on_update is not None:
+            await self.on_update(updated)
+        return updated
+
+    @track_cosmos_operation
+    async def get_all(self) -> List[OpportunityLeads]:
+        try:
+            query = "SELECT * FROM c"
+            return self._map_mixed([doc async for doc in self.container.query_items(query=query)])
+        except Exception as e:
+            logging.error(f"Error al consultar Leads: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los Leads.")
+
+    @track_cosmos_operation
+    async def get_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityLeads]:
+        try:
+            query = "SELECT * FROM c WHERE c.docType = @doc_type"
+            pager = self.container.query_items(
+                query=query,
+                parameters=[{"name": "@doc_type", "value": HEADER}],
+                max_item_count=page_size
+            ).by_page(continuation)
+            headers = []
+            async for page in pager:
+                headers = [doc async for doc in page]
+                break
+            items = await self._assemble(headers)
+            return Page[OpportunityLeads](items=items, continuation=pager.continuation_token)
+        except Exception as e:
+            logging.error(f"Error al consultar página de Leads: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar la página de Leads.")
+
+    async def iter_all(self) -> AsyncIterator[OpportunityLeads]:
+        try:
+            async for opportunity in self._iter_headers(
+                "SELECT * FROM c WHERE c.docType = @doc_type", [{"name": "@doc_type", "value": HEADER}]
+            ):
+                yield opportunity
+        except Exception as e:
+            logging.error(f"Error al recorrer Leads: {str(e)}")
+            raise ConnectionErrorException("No se pudieron recorrer los Leads.")
+
+    @track_cosmos_operation
+    async def get_agent_ids(self) -> List[int]:
+        try:
+            query = "SELECT DISTINCT VALUE c.IdAgte FROM c WHERE c.docType = @doc_type"
+            parameters = [{"name": "@doc_type", "value": HEADER}]
+            return [agent_id async for agent_id in self.container.query_items(query=query, parameters=parameters)]
+        except Exception as e:
+            logging.error(f"Error al consultar los agentes con Leads: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los agentes con Leads.")
+
+    @track_cosmos_operation
+    async def get_by_agte_id(self, agte_id: int) -> List[OpportunityLeads]:
+        try:
+            query = "SELECT * FROM c WHERE c.docType = @doc_type AND c.IdAgte=@agte_id AND c.Status = 1"
+            parameters = [
+                {"name": "@doc_type", "value": HEADER},
+                {"name": "@agte_id", "value": agte_id},
+            ]
+            headers = [doc async for doc in self.container.query_items(
+                query=query,
+                parameters=parameters,
+                **async_query_scope(self.partition_key, IdAgte=agte_id)
+            )]
+            if not headers:
+                return []
+            query = "SELECT * FROM c WHERE c.docType = @doc_type AND c.IdAgte=@agte_id AND ARRAY_CONTAINS(@ids, c.OpportunityId)"
+            parameters = [
+                {"name": "@doc_type", "value": LEAD},
+                {"name": "@agte_id", "value": agte_id},
+                {"name": "@ids", "value": [header["OpportunityId"] for header in headers]},
+            ]
+            lead_docs = [doc async for doc in self.container.query_items(
+                query=query,
+                parameters=parameters,
+                **async_query_scope(self.partition_key, IdAgte=agte_id)
+            )]
+            return self._map_many(headers, lead_docs)
+        except Exception as e:
+            logging.error(f"Error al consultar Leads por AgteId: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los Leads por AgteId.")
+
+    @track_cosmos_operation
+    async def get_lead_counts_by_agte_id(self, agte_id: int) -> List[OpportunityLeadCount]:
+        try:
+            query = """
+            SELECT c.OpportunityId, c.Priority, c.lead_count
+            FROM c WHERE c.docType = @doc_type AND c.IdAgte=@agte_id AND c.Status = 1
+            """
+            parameters = [
+                {"name": "@doc_type", "value": HEADER},
+                {"name": "@agte_id", "value": agte_id},
+            ]
+            items = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                **async_query_scope(self.partition_key, IdAgte=agte_id)
+            )
+            return [
+                OpportunityLeadCount(
+                    OpportunityId=doc["OpportunityId"],
+                    Priority=doc["Priority"],
+                    lead_count=doc.get("lead_count") or 0,
+                )
+                async for doc in items
+            ]
+        except Exception as e:
+            logging.error(f"Error al consultar conteo de Leads por AgteId: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar el conteo de Leads por AgteId.")
+
+    @track_cosmos_operation
+    async def get_by_opportunity_ids_and_agte(self, opportunity_ids: List[int], id_agte: int) -> List[OpportunityLeads]:
+        ids = list(dict.fromkeys(opportunity_ids))
+        if not ids:
+            return []
+        try:
+            query = "SELECT * FROM c WHERE ARRAY_CONTAINS(@ids, c.OpportunityId) AND c.IdAgte = @id_agte"
+            parameters = [
+                {"name": "@ids", "value": ids},
+                {"name": "@id_agte", "value": id_agte},
+            ]
+            items = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                **async_query_scope(self.partition_key, IdAgte=id_agte)
+            )
+            return self._map_mixed([doc async for doc in items])
+        except Exception as e:
+            logging.error(f"Error al consultar Leads por OpportunityIds: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los Leads por OpportunityIds.")
+
+    @track_cosmos_operation
+    async def get_leads(
+        self, opportunity_id: int, id_agte: int, continuation: Optional[str] = None, page_size: Optional[int] = None
+    ) -> Page[OpportunityLead]:
+        try:
+            header = await self._read_header(opportunity_id, id_agte)
+            if header is None:
+                return Page[OpportunityLead](items=[])
+            query = """
+            SELECT VALUE c.lead FROM c
+            WHERE c.docType = @doc_type AND c.OpportunityId = @opportunity_id AND c.IdAgte = @id_agte
+            AND c.position < @lead_count
+            ORDER BY c.position
+            """
+            parameters = [
+                {"name": "@doc_type", "value": LEAD},
+                {"name": "@opportunity_id", "value": opportunity_id},
+                {"name": "@id_agte", "value": id_agte},
+                {"name": "@lead_count", "value": header.get("lead_count", 0)},
+            ]
+            pager = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                max_item_count=page_size or settings.OPPORTUNITY_LEADS_PAGE_SIZE,
+                **async_query_scope(self.partition_key, OpportunityId=opportunity_id, IdAgte=id_agte)
+            ).by_page(continuation)
+            items = []
+            async for page in pager:
+                items = [OpportunityLead.model_validate(lead) async for lead in page]
+                break
+            return Page[OpportunityLead](items=items, continuation=pager.continuation_token)
+        except Exception as e:
+            logging.error(f"Error al consultar página de leads de la oportunidad: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar la página de leads de la oportunidad.")
+
+    @single_flight
+    @track_cosmos_operation
+    async def get_by_opportunity_id_and_agte(self, opportunity_id: int, id_agte: int) -> Optional[OpportunityLeads]:
+        query = """
+        SELECT * FROM c WHERE c.OpportunityId = @opportunity_id AND c.IdAgte = @id_agte
+        """
+        params = [
+            {"name": "@opportunity_id", "value": opportunity_id},
+            {"name": "@id_agte", "value": id_agte},
+        ]
+
+        items = self.container.query_items(
+            query=query,
+            parameters=params,
+            **async_query_scope(self.partition_key, OpportunityId=opportunity_id, IdAgte=id_agte)
+        )
+
+        opportunities = self._map_mixed([doc async for doc in items])
+        return opportunities[0] if opportunities else None
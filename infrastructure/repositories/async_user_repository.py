@@ -0,0 +1,14 @@
+# infrastructure/repositories/async_user_repository.py
+from application.ports.user_repository_port import AsyncUserRepositoryPort
+from domain.models.user import User
+from infrastructure.adapters.async_sql_server_adapter import AsyncSqlServerAdapter
+from infrastructure.repositories.user_repository import UserRepository
+
+
+class AsyncUserRepository(AsyncUserRepositoryPort):
+    def __init__(self, adapter: AsyncSqlServerAdapter):
+        self.adapter = adapter
+        self.repository = UserRepository(adapter.sync)
+
+    async def get_user_by_email(self, email: str) -> User:
+        return await self.adapter.run(self.repository.get_user_by_email, email)
@@ -0,0 +1,75 @@
+# infrastructure/repositories/lead_job_repository.py
+import logging
+from typing import List, Optional
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError, CosmosResourceNotFoundError
+from core.settings import settings
+from core.exceptions import ConflictException, ConnectionErrorException
+from infrastructure.adapters.cosmos_adapter import CosmosAdapter
+from infrastructure.adapters.cosmos_diagnostics import track_cosmos_operation
+from application.ports.lead_job_repository_port import LeadJobRepositoryPort
+from domain.models.lead_conversion_job import LeadConversionJob, LeadJobStatus
+
+
+class LeadJobRepository(LeadJobRepositoryPort):
+    def __init__(self, session: CosmosAdapter):
+        self.container = session.get_container(
+            settings.COSMOS_LEAD_JOBS_CONTAINER,
+            settings.COSMOS_LEAD_JOBS_PARTITION_KEY
+        )
+
+    def _map_to_domain(self, doc: dict) -> LeadConversionJob:
+        job = LeadConversionJob.model_validate(doc)
+        job.etag = doc.get("_etag")
+        return job
+
+    def _map_to_document(self, job: LeadConversionJob) -> dict:
+        return job.model_dump(mode="json", exclude={"throughput"})
+
+    @track_cosmos_operation
+    def create(self, job: LeadConversionJob) -> LeadConversionJob:
+        try:
+            return self._map_to_domain(self.container.create_item(body=self._map_to_document(job)))
+        except Exception as e:
+            logging.error(f"Error al crear el job de conversión {job.id}: {str(e)}")
+            raise ConnectionErrorException("No se pudo crear el job de conversión.")
+
+    @track_cosmos_operation
+    def get(self, job_id: str) -> Optional[LeadConversionJob]:
+        try:
+            return self._map_to_domain(self.container.read_item(item=job_id, partition_key=job_id))
+        except CosmosResourceNotFoundError:
+            return None
+        except Exception as e:
+            logging.error(f"Error al consultar el job de conversión {job_id}: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar el job de conversión.")
+
+    @track_cosmos_operation
+    def save(self, job: LeadConversionJob) -> LeadConversionJob:
+        try:
+            doc = self.container.replace_item(
+                item=job.id,
+                body=self._map_to_document(job),
+                etag=job.etag,
+                match_condition=MatchConditions.IfNotModified,
+            )
+            return self._map_to_domain(doc)
+        except CosmosAccessConditionFailedError:
+            raise ConflictException(f"El job {job.id} fue modificado por otro proceso.")
+        except Exception as e:
+            logging.error(f"Error al guardar el job de conversión {job.id}: {str(e)}")
+            raise ConnectionErrorException("No se pudo guardar el job de conversión.")
+
+    @track_cosmos_operation
+    def list_unfinished(self) -> List[LeadConversionJob]:
+        try:
+            query = "SELECT * FROM c WHERE c.status IN (@pending, @running)"
+            parameters = [
+                {"name": "@pending", "value": LeadJobStatus.pending.value},
+                {"name": "@running", "value": LeadJobStatus.running.value},
+            ]
+            items = self.container.query_items(query=query, parameters=parameters, enable_cross_partition_query=True)
+            return [self._map_to_domain(doc) for doc in items]
+        except Exception as e:
+            logging.error(f"Error al consultar jobs de conversión pendientes: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los jobs de conversión pendientes.")
@@ -1,76 +1,166 @@
 # infrastructure/repositories/lead_repository.py
 import json
+import logging
+from typing import Dict, List, Optional, Set
+from application.ports.lead_repository_port import LeadRepositoryPort
 from domain.models.lead import Lead
+from domain.models.lead_bulk_result import LeadBulkFailure, LeadBulkResult
 from infrastructure.adapters.sql_server_adapter import SqlServerAdapter
+from infrastructure.repositories.user_cache import UserIdentityCache, get_user_identity_cache
 from fastapi import HTTPException
 
+# SQL Server admite como máximo 2100 parámetros por sentencia
+IN_CLAUSE_CHUNK_SIZE = 1000
 
-class LeadRepository:
-    def __init__(self, adapter: SqlServerAdapter):
+LEAD_COLUMNS = """
+    CreatedBy, Id, Name, Email, Phone, DocumentNumber, Company, Source, Campaign,
+    Product, Stage, Priority, Value, AssignedTo, CreatedAt, UpdatedAt,
+    NextFollowUp, Notes, Tags, DocumentType, SelectedPortfolios, CampaignOwnerName, Age, Gender,
+    PreferredContactChannel, AdditionalInfo
+"""
+
+INSERT_LEAD_QUERY = f"""
+    INSERT INTO dalilm.Leads ({LEAD_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, GETUTCDATE(), GETUTCDATE(),
+            ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_RAW_QUERY = f"""
+    INSERT INTO dalilm.LeadsRaw ({LEAD_COLUMNS})
+    SELECT {LEAD_COLUMNS}
+    FROM dalilm.Leads
+    WHERE Id IN ({{placeholders}})
+"""
+
+
+class LeadRepository(LeadRepositoryPort):
+    def __init__(self, adapter: SqlServerAdapter, cache: Optional[UserIdentityCache] = None):
         self.adapter = adapter
+        self.cache = cache if cache is not None else get_user_identity_cache()
+
+    def _to_params(self, lead: Lead, lead_id: str) -> tuple:
+        """Serializa un lead en los parámetros del INSERT de Leads."""
+        product_json = json.dumps(lead.product) if lead.product else None
+        tags_json = json.dumps(lead.tags) if lead.tags else None
+        portfolios_json = json.dumps(lead.SelectedPortfolios) if lead.SelectedPortfolios else None
+        additional_info_json = json.dumps(lead.AdditionalInfo) if lead.AdditionalInfo else None
+
+        return (
+            lead.CreatedBy, lead_id, lead.name, lead.email, lead.phone, lead.documentNumber,
+            lead.company, lead.source, lead.campaign, product_json, lead.stage, lead.priority,
+            lead.value, lead.assignedTo, lead.nextFollowUp, lead.notes, tags_json,
+            lead.DocumentType, portfolios_json, lead.CampaignOwnerName, lead.Age,
+            lead.Gender, lead.PreferredContactChannel, additional_info_json
+        )
+
+    def _copy_to_raw(self, cursor, lead_ids: List[str]) -> None:
+        """Copia a LeadsRaw los leads indicados con un INSERT ... SELECT por bloque de Ids."""
+        for start in range(0, len(lead_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = lead_ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(INSERT_RAW_QUERY.format(placeholders=placeholders), tuple(chunk))
+
+    def user_exists(self, user_id: str) -> bool:
+        if self.cache is not None:
+            cached = self.cache.get_exists(user_id)
+            if cached is not None:
+                return cached
+
+        exists = bool(self.adapter.execute_query(
+            "SELECT 1 FROM dalilm.Users WHERE Id = ?",
+            (user_id,),
+            fetchone=True
+        ))
+        if self.cache is not None:
+            self.cache.set_exists(user_id, exists)
+        return exists
+
+    def get_existing_ids(self, lead_ids: List[str]) -> Set[str]:
+        existing = set()
+        for start in range(0, len(lead_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = lead_ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = self.adapter.execute_query(
+                f"SELECT Id FROM dalilm.Leads WHERE Id IN ({placeholders})",
+                tuple(chunk),
+                fetchall=True
+            )
+            existing.update(str(row[0]).lower() for row in rows or [])
+        return existing
 
     def create_lead(self, lead: Lead, lead_id: str):
         """
         Inserta un lead en SQL Server en las tablas Leads y LeadsRaw.
         """
         try:
-            # Serializar campos JSON
-            product_json = json.dumps(lead.product) if lead.product else None
-            tags_json = json.dumps(lead.tags) if lead.tags else None
-            portfolios_json = json.dumps(lead.SelectedPortfolios) if lead.SelectedPortfolios else None
-            additional_info_json = json.dumps(lead.AdditionalInfo) if lead.AdditionalInfo else None
-
             # Verificar si el usuario asignado existe
-            user_exists = self.adapter.execute_query(
-                "SELECT 1 FROM dalilm.Users WHERE Id = ?",
-                (lead.assignedTo,),
-                fetchone=True
-            )
-            if not user_exists:
+            if not self.user_exists(lead.assignedTo):
                 raise HTTPException(status_code=404, detail="El usuario asignado no existe.")
 
-            # Insertar en Leads
-            insert_lead_query = """
-                INSERT INTO dalilm.Leads (
-                    CreatedBy, Id, Name, Email, Phone, DocumentNumber, Company, Source, Campaign,
-                    Product, Stage, Priority, Value, AssignedTo, CreatedAt, UpdatedAt,
-                    NextFollowUp, Notes, Tags, DocumentType, SelectedPortfolios, CampaignOwnerName, Age, Gender, 
-                    PreferredContactChannel, AdditionalInfo
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, GETUTCDATE(), GETUTCDATE(),
-                        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            self.adapter.execute_query(
-                insert_lead_query,
-                (
-                    lead.CreatedBy, lead_id, lead.name, lead.email, lead.phone, lead.documentNumber,
-                    lead.company, lead.source, lead.campaign, product_json, lead.stage, lead.priority,
-                    lead.value, lead.assignedTo, lead.nextFollowUp, lead.notes, tags_json,
-                    lead.DocumentType, portfolios_json, lead.CampaignOwnerName, lead.Age,
-                    lead.Gender, lead.PreferredContactChannel, additional_info_json
-                )
-            )
-
-            # Insertar copia en LeadsRaw
-            insert_raw_query = """
-                INSERT INTO dalilm.LeadsRaw (
-                    CreatedBy, Id, Name, Email, Phone, DocumentNumber, Company, Source, Campaign,
-                    Product, Stage, Priority, Value, AssignedTo, CreatedAt, UpdatedAt,
-                    NextFollowUp, Notes, Tags, DocumentType, SelectedPortfolios, CampaignOwnerName, Age, Gender, 
-                    PreferredContactChannel, AdditionalInfo
-                )
-                SELECT 
-                    CreatedBy, Id, Name, Email, Phone, DocumentNumber, Company, Source, Campaign,
-                    Product, Stage, Priority, Value, AssignedTo, CreatedAt, UpdatedAt,
-                    NextFollowUp, Notes, Tags, DocumentType, SelectedPortfolios, CampaignOwnerName, Age, Gender, 
-                    PreferredContactChannel, AdditionalInfo
-                FROM dalilm.Leads
-                WHERE Id = ?
-            """
-            self.adapter.execute_query(insert_raw_query, (lead_id,))
+            with self.adapter.transaction() as cursor:
+                cursor.execute(INSERT_LEAD_QUERY, self._to_params(lead, lead_id))
+                self._copy_to_raw(cursor, [lead_id])
 
         except HTTPException:
             # Se relanza si ya fue manejado (ej: usuario no existe)
             raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error al crear lead: {str(e)}")
+
+    def create_leads_bulk(self, leads: Dict[str, Lead], verify_user: bool = True) -> LeadBulkResult:
+        """
+        Inserta varios leads en una sola transacción usando array binding (fast_executemany)
+        y copia todos a LeadsRaw con un INSERT ... SELECT. Si el lote falla, se reintenta
+        fila por fila para aislar los leads con error sin descartar el resto.
+        """
+        result = LeadBulkResult()
+        if not leads:
+            return result
+
+        try:
+            if verify_user:
+                # El usuario asignado se verifica una sola vez por lote
+                for assigned_to in {lead.assignedTo for lead in leads.values()}:
+                    if not self.user_exists(assigned_to):
+                        raise HTTPException(status_code=404, detail="El usuario asignado no existe.")
+
+            rows = {}
+            for lead_id, lead in leads.items():
+                try:
+                    rows[lead_id] = self._to_params(lead, lead_id)
+                except Exception as e:
+                    result.failures.append(LeadBulkFailure(
+                        lead_id=lead_id, documentNumber=lead.documentNumber, error=str(e)
+                    ))
+
+            if not rows:
+                return result
+
+            try:
+                with self.adapter.transaction() as cursor:
+                    cursor.fast_executemany = True
+                    cursor.executemany(INSERT_LEAD_QUERY, list(rows.values()))
+                    self._copy_to_raw(cursor, list(rows.keys()))
+                result.created_ids.extend(rows.keys())
+                return result
+            except Exception as e:
+                logging.warning(f"Falló la inserción masiva de {len(rows)} leads, se reintenta fila por fila: {str(e)}")
+
+            for lead_id, params in rows.items():
+                try:
+                    with self.adapter.transaction() as cursor:
+                        cursor.execute(INSERT_LEAD_QUERY, params)
+                        self._copy_to_raw(cursor, [lead_id])
+                    result.created_ids.append(lead_id)
+                except Exception as e:
+                    logging.error(f"Error al crear lead {lead_id}: {str(e)}")
+                    result.failures.append(LeadBulkFailure(
+                        lead_id=lead_id, documentNumber=leads[lead_id].documentNumber, error=str(e)
+                    ))
+
+            return result
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error al crear leads: {str(e)}")
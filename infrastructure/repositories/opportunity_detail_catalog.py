@@ -0,0 +1,246 @@
+# infrastructure/repositories/opportunity_detail_catalog.py
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+from core.exceptions import BusinessException
+from core.settings import settings
+from infrastructure.adapters.cosmos_adapter import CosmosAdapter, read_change_feed
+from infrastructure.repositories.opportunity_detail_repository import OpportunityDetailRepository
+from application.ports.opportunity_detail_repository_port import OpportunityDetailRepositoryPort
+from domain.models.opportunity_detail import OpportunityDetail
+from domain.models.page import Page
+
+# Prefijos del token de continuación de get_page según dónde se sirve la paginación
+OFFSET_TOKEN_PREFIX = "o:"
+COSMOS_TOKEN_PREFIX = "c:"
+
+
+class OpportunityDetailCatalog(OpportunityDetailRepositoryPort):
+    """
+    Catálogo en memoria de OpportunityDetail indexado por OpportunityId.
+    Un hilo en segundo plano lo mantiene al día con el change feed y lo recarga
+    completo antes de que venza el TTL; las peticiones nunca recargan: sirven la
+    instantánea vigente o, si venció, van a Cosmos (read-through).
+    on_change recibe los Details modificados que llegan por el change feed.
+    """
+
+    def __init__(
+        self,
+        repository: OpportunityDetailRepository,
+        ttl: float,
+        refresh_interval: float,
+        on_change: Optional[Callable[[List[OpportunityDetail]], None]] = None,
+    ):
+        self.repository = repository
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.on_change = on_change
+        self._items: Dict[int, OpportunityDetail] = {}
+        self._loaded_at: Optional[float] = None
+        self._continuation: Optional[str] = None
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    @property
+    def needs_reload(self) -> bool:
+        """La recarga se adelanta un intervalo de refresco para que el TTL no llegue a vencer."""
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl - self.refresh_interval
+
+    def load(self) -> None:
+        """Recarga el catálogo completo desde Cosmos."""
+        if self.on_change is not None:
+            # Los cambios pendientes se notifican antes de descartar el token anterior
+            self.apply_changes()
+        # El token se toma antes de leer para no perder cambios concurrentes a la carga;
+        # la instantánea anterior sigue sirviendo lecturas hasta el reemplazo
+        _, continuation = read_change_feed(self.repository.container)
+        details = self.repository.get_all()
+        items = {detail.OpportunityId: detail for detail in details}
+        with self._lock:
+            self._items = items
+            self._continuation = continuation
+            self._loaded_at = time.monotonic()
+            self.version += 1
+        logging.info(f"Catálogo de OpportunityDetail cargado con {len(details)} elementos.")
+
+    def apply_changes(self) -> int:
+        """Aplica los cambios pendientes del change feed; devuelve cuántos documentos cambiaron."""
+        if self._loaded_at is None:
+            return 0
+        with self._lock:
+            docs, self._continuation = read_change_feed(self.repository.container, self._continuation)
+            details = [self.repository._map_to_domain(doc) for doc in docs]
+            for detail in details:
+                self._items[detail.OpportunityId] = detail
+            if docs:
+                self.version += 1
+        if docs:
+            logging.info(f"Catálogo de OpportunityDetail actualizado con {len(docs)} cambios.")
+            if self.on_change is not None:
+                try:
+                    self.on_change(details)
+                except Exception as e:
+                    logging.error(f"Error al notificar cambios de OpportunityDetail: {str(e)}")
+        return len(docs)
+
+    def invalidate(self, opportunity_id: Optional[int] = None) -> None:
+        with self._lock:
+            if opportunity_id is None:
+                self._loaded_at = None
+            else:
+                self._items.pop(opportunity_id, None)
+            self.version += 1
+
+    def _ensure_fresh(self) -> bool:
+        """
+        Indica si la instantánea está vigente; si no, hay que ir directo a Cosmos. No
+        recarga: la recarga completa la hace el hilo de refresco, fuera de las peticiones.
+        """
+        return self.is_fresh
+
+    def _store(self, details: List[OpportunityDetail]) -> None:
+        if not details:
+            return
+        with self._lock:
+            for detail in details:
+                self._items[detail.OpportunityId] = detail
+            self.version += 1
+
+    def get_all(self) -> List[OpportunityDetail]:
+        if not self._ensure_fresh():
+            return self.repository.get_all()
+        return list(self._items.values())
+
+    def _cosmos_page(self, page_size: int, continuation: Optional[str]) -> Page[OpportunityDetail]:
+        page = self.repository.get_page(page_size, continuation)
+        if page.continuation is not None:
+            page.continuation = COSMOS_TOKEN_PREFIX + page.continuation
+        return page
+
+    def get_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityDetail]:
+        """
+        Pagina sobre el catálogo en memoria (continuación "o:<desplazamiento>") o sobre
+        Cosmos si el catálogo no está vigente (continuación "c:<token de Cosmos>"). Una
+        paginación sigue con el mecanismo con el que empezó; un desplazamiento que ya no
+        se puede servir desde memoria o un token desconocido se rechazan con 400.
+        """
+        if continuation is not None and continuation.startswith(COSMOS_TOKEN_PREFIX):
+            return self._cosmos_page(page_size, continuation[len(COSMOS_TOKEN_PREFIX):])
+        offset = 0
+        if continuation is not None:
+            raw_offset = continuation[len(OFFSET_TOKEN_PREFIX):]
+            if not continuation.startswith(OFFSET_TOKEN_PREFIX) or not raw_offset.isdigit():
+                raise BusinessException("El token de continuación no es válido.")
+            offset = int(raw_offset)
+        if not self._ensure_fresh():
+            if continuation is not None:
+                raise BusinessException("El token de continuación venció; vuelva a pedir la primera página.")
+            return self._cosmos_page(page_size, None)
+        items = list(self._items.values())
+        end = offset + page_size
+        return Page[OpportunityDetail](
+            items=items[offset:end],
+            continuation=f"{OFFSET_TOKEN_PREFIX}{end}" if end < len(items) else None,
+        )
+
+    def iter_all(self) -> Iterator[OpportunityDetail]:
+        return iter(self.get_all())
+
+    def get_by_opportunity_id(self, opportunity_id: int) -> Optional[OpportunityDetail]:
+        if self._ensure_fresh():
+            detail = self._items.get(opportunity_id)
+            if detail is not None:
+                return detail
+        detail = self.repository.get_by_opportunity_id(opportunity_id)
+        if detail is not None:
+            self._store([detail])
+        return detail
+
+    def get_by_opportunity_ids(self, opportunity_ids: List[int]) -> List[OpportunityDetail]:
+        if not self._ensure_fresh():
+            return self.repository.get_by_opportunity_ids(opportunity_ids)
+        found = []
+        missing = []
+        for opportunity_id in dict.fromkeys(opportunity_ids):
+            detail = self._items.get(opportunity_id)
+            if detail is None:
+                missing.append(opportunity_id)
+            else:
+                found.append(detail)
+        if missing:
+            fetched = self.repository.get_by_opportunity_ids(missing)
+            self._store(fetched)
+            found.extend(fetched)
+        return found
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                if self.needs_reload:
+                    self.load()
+                else:
+                    self.apply_changes()
+            except Exception as e:
+                logging.error(f"Error al refrescar el catálogo de OpportunityDetail: {str(e)}")
+
+    def start(self) -> None:
+        try:
+            self.load()
+        except Exception as e:
+            logging.error(f"No se pudo cargar el catálogo de OpportunityDetail al iniciar: {str(e)}")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="opportunity-detail-catalog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+_catalog: Optional[OpportunityDetailCatalog] = None
+
+
+def init_opportunity_detail_catalog(
+    session: CosmosAdapter,
+    on_change: Optional[Callable[[List[OpportunityDetail]], None]] = None,
+) -> OpportunityDetailCatalog:
+    global _catalog
+    if _catalog is None:
+        _catalog = OpportunityDetailCatalog(
+            OpportunityDetailRepository(session),
+            ttl=settings.OPPORTUNITY_DETAIL_CACHE_TTL_SECONDS,
+            refresh_interval=settings.OPPORTUNITY_DETAIL_CACHE_REFRESH_SECONDS,
+            on_change=on_change,
+        )
+        _catalog.start()
+    return _catalog
+
+
+def close_opportunity_detail_catalog() -> None:
+    global _catalog
+    if _catalog is not None:
+        _catalog.stop()
+        _catalog = None
+
+
+def get_opportunity_detail_catalog() -> Optional[OpportunityDetailCatalog]:
+    return _catalog
+
+
+def get_opportunity_detail_repository(session: CosmosAdapter) -> OpportunityDetailRepositoryPort:
+    """Repositorio de Details a usar: el catálogo en memoria si está activo, si no Cosmos."""
+    if _catalog is not None:
+        return _catalog
+    return OpportunityDetailRepository(session)
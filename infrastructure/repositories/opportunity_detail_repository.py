@@ -1,15 +1,19 @@
 # infrastructure/repositories/opportunity_detail_repository.py
 import logging
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from core.settings import settings
 from core.exceptions import ConnectionErrorException
-from infrastructure.adapters.cosmos_adapter import CosmosAdapter
+from core.single_flight import single_flight
+from infrastructure.adapters.cosmos_adapter import CosmosAdapter, query_scope
+from infrastructure.adapters.cosmos_diagnostics import track_cosmos_operation
 from application.ports.opportunity_detail_repository_port import OpportunityDetailRepositoryPort
 from domain.models.opportunity_detail import OpportunityDetail
+from domain.models.page import Page
 
 
 class OpportunityDetailRepository(OpportunityDetailRepositoryPort):
     def __init__(self, session: CosmosAdapter):
+        self.partition_key = settings.COSMOS_OPPORTUNITY_DETAIL_PARTITION_KEY
         self.container = session.get_container(
             settings.COSMOS_OPPORTUNITY_DETAIL_CONTAINER,
             settings.COSMOS_OPPORTUNITY_DETAIL_PARTITION_KEY
@@ -25,8 +29,10 @@ class OpportunityDetailRepository(OpportunityDetailRepositoryPort):
             EmailTemplate=doc.get("EmailTemplate"),
             DaliPrompt=doc.get("DaliPrompt"),
             Categories=doc.get("Categories", []),
+            etag=doc.get("_etag"),
         )
 
+    @track_cosmos_operation
     def get_all(self) -> List[OpportunityDetail]:
         try:
             query = "SELECT * FROM c"
@@ -36,6 +42,32 @@ class OpportunityDetailRepository(OpportunityDetailRepositoryPort):
             logging.error(f"Error al consultar Details: {str(e)}")
             raise ConnectionErrorException("No se pudieron consultar los Details.")
 
+    @track_cosmos_operation
+    def get_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityDetail]:
+        try:
+            query = "SELECT * FROM c"
+            pager = self.container.query_items(
+                query=query,
+                enable_cross_partition_query=True,
+                max_item_count=page_size
+            ).by_page(continuation)
+            items = [self._map_to_domain(doc) for doc in next(pager, [])]
+            return Page[OpportunityDetail](items=items, continuation=pager.continuation_token)
+        except Exception as e:
+            logging.error(f"Error al consultar página de Details: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar la página de Details.")
+
+    def iter_all(self) -> Iterator[OpportunityDetail]:
+        try:
+            query = "SELECT * FROM c"
+            for doc in self.container.query_items(query=query, enable_cross_partition_query=True):
+                yield self._map_to_domain(doc)
+        except Exception as e:
+            logging.error(f"Error al recorrer Details: {str(e)}")
+            raise ConnectionErrorException("No se pudieron recorrer los Details.")
+
+    @single_flight
+    @track_cosmos_operation
     def get_by_opportunity_id(self, opportunity_id: int) -> Optional[OpportunityDetail]:
         try:
             query = "SELECT * FROM c WHERE c.OpportunityId=@id"
@@ -43,7 +75,7 @@ class OpportunityDetailRepository(OpportunityDetailRepositoryPort):
             items = list(self.container.query_items(
                 query=query,
                 parameters=parameters,
-                enable_cross_partition_query=True
+                **query_scope(self.partition_key, OpportunityId=opportunity_id)
             ))
             if items:
                 return self._map_to_domain(items[0])
@@ -51,3 +83,24 @@ class OpportunityDetailRepository(OpportunityDetailRepositoryPort):
         except Exception as e:
             logging.error(f"Error al consultar Detail por ID: {str(e)}")
             raise ConnectionErrorException("No se pudo consultar el Detail por ID.")
+
+    @track_cosmos_operation
+    def get_by_opportunity_ids(self, opportunity_ids: List[int]) -> List[OpportunityDetail]:
+        ids = list(dict.fromkeys(opportunity_ids))
+        if not ids:
+            return []
+        if len(ids) == 1:
+            detail = self.get_by_opportunity_id(ids[0])
+            return [detail] if detail else []
+        try:
+            query = "SELECT * FROM c WHERE ARRAY_CONTAINS(@ids, c.OpportunityId)"
+            parameters = [{"name": "@ids", "value": ids}]
+            items = list(self.container.query_items(
+                query=query,
+                parameters=parameters,
+                enable_cross_partition_query=True
+            ))
+            return [self._map_to_domain(doc) for doc in items]
+        except Exception as e:
+            logging.error(f"Error al consultar Details por IDs: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los Details por IDs.")
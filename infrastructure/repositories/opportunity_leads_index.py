@@ -0,0 +1,335 @@
+# infrastructure/repositories/opportunity_leads_index.py
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+from core.settings import settings
+from infrastructure.adapters.cosmos_adapter import read_change_feed
+from infrastructure.repositories.opportunity_leads_layout import OpportunityLeadsStorage
+from application.ports.opportunity_leads_repository_port import OpportunityLeadsRepositoryPort
+from domain.models.opportunity_lead import OpportunityLead
+from domain.models.opportunity_lead_count import OpportunityLeadCount
+from domain.models.opportunity_leads import OPPORTUNITY_LEADS_LIST, OpportunityLeads
+from domain.models.page import Page
+
+ACTIVE_STATUS = 1
+
+# 2: el token de continuación es el del pager del change feed (antes, el etag de la respuesta)
+SNAPSHOT_VERSION = 2
+
+
+def index_opportunity(
+    by_key: Dict[Tuple[int, int], OpportunityLeads],
+    by_agent: Dict[int, Dict[int, OpportunityLeads]],
+    opportunity: OpportunityLeads,
+) -> None:
+    """Inserta, reemplaza o quita (si ya no está activa) la oportunidad en ambos índices."""
+    key = (opportunity.OpportunityId, opportunity.IdAgte)
+    if by_key.pop(key, None) is not None:
+        agent = by_agent.get(opportunity.IdAgte)
+        if agent is not None:
+            agent.pop(opportunity.OpportunityId, None)
+            if not agent:
+                del by_agent[opportunity.IdAgte]
+    if opportunity.Status == ACTIVE_STATUS:
+        by_key[key] = opportunity
+        by_agent.setdefault(opportunity.IdAgte, {})[opportunity.OpportunityId] = opportunity
+
+
+class OpportunityLeadsIndex(OpportunityLeadsRepositoryPort):
+    """
+    Índice en memoria de los OpportunityLeads activos (Status = 1), por IdAgte y por
+    (OpportunityId, IdAgte). Se mantiene al día con el change feed en segundo plano y
+    guarda una instantánea con el token de continuación para retomar al reiniciar.
+    Si el índice acumula más atraso que max_staleness, las lecturas van a Cosmos.
+    """
+
+    def __init__(
+        self,
+        repository: OpportunityLeadsStorage,
+        refresh_interval: float,
+        max_staleness: float,
+        reload_interval: float,
+        snapshot_path: Optional[str] = None,
+        snapshot_interval: float = 60.0,
+    ):
+        self.repository = repository
+        self.refresh_interval = refresh_interval
+        self.max_staleness = max_staleness
+        self.reload_interval = reload_interval
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self._by_key: Dict[Tuple[int, int], OpportunityLeads] = {}
+        self._by_agent: Dict[int, Dict[int, OpportunityLeads]] = {}
+        self._continuation: Optional[str] = None
+        self._loaded_at: Optional[float] = None
+        self._synced_at: Optional[float] = None
+        self._snapshot_at = time.monotonic()
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.hits = 0
+        self.fallbacks = 0
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    @property
+    def lag(self) -> Optional[float]:
+        """Segundos desde la última sincronización exitosa con el change feed."""
+        if self._synced_at is None:
+            return None
+        return time.monotonic() - self._synced_at
+
+    @property
+    def is_current(self) -> bool:
+        lag = self.lag
+        return lag is not None and lag <= self.max_staleness
+
+    def _put(self, opportunity: OpportunityLeads) -> None:
+        index_opportunity(self._by_key, self._by_agent, opportunity)
+
+    def _replace_all(self, opportunities: List[OpportunityLeads], continuation: Optional[str]) -> None:
+        by_key: Dict[Tuple[int, int], OpportunityLeads] = {}
+        by_agent: Dict[int, Dict[int, OpportunityLeads]] = {}
+        for opportunity in opportunities:
+            index_opportunity(by_key, by_agent, opportunity)
+        with self._lock:
+            self._by_key = by_key
+            self._by_agent = by_agent
+            self._continuation = continuation
+
+    def load(self) -> None:
+        """Recarga el índice completo desde Cosmos."""
+        # El token se toma antes de leer para no perder cambios concurrentes a la carga;
+        # el índice anterior sigue sirviendo lecturas hasta el reemplazo
+        _, continuation = read_change_feed(self.repository.container)
+        opportunities = list(self.repository.iter_active())
+        with self._lock:
+            self._replace_all(opportunities, continuation)
+            self._loaded_at = self._synced_at = time.monotonic()
+        logging.info(f"Índice de OpportunityLeads cargado con {len(opportunities)} oportunidades activas.")
+
+    def apply_changes(self) -> int:
+        """Aplica los cambios pendientes del change feed; devuelve cuántos documentos cambiaron."""
+        if self._loaded_at is None:
+            return 0
+        with self._lock:
+            docs, self._continuation = read_change_feed(self.repository.container, self._continuation)
+            for opportunity in self.repository.from_change_feed(docs):
+                self._put(opportunity)
+            self._synced_at = time.monotonic()
+        if docs:
+            logging.info(f"Índice de OpportunityLeads actualizado con {len(docs)} cambios.")
+        return len(docs)
+
+    def save_snapshot(self) -> None:
+        """Guarda el contenido y el token de continuación; se escribe a un temporal y se renombra."""
+        if self.snapshot_path is None or self._loaded_at is None:
+            return
+        with self._lock:
+            opportunities = list(self._by_key.values())
+            continuation = self._continuation
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "container": self.repository.container.id,
+            "saved_at": time.time(),
+            "continuation": continuation,
+            # El etag se guarda aparte porque el modelo lo excluye al serializar
+            "items": [
+                dict(opportunity.model_dump(mode="json"), etag=opportunity.etag)
+                for opportunity in opportunities
+            ],
+        }
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.snapshot_path)
+        self._snapshot_at = time.monotonic()
+
+    def restore_snapshot(self) -> bool:
+        """Carga la instantánea guardada y se pone al día con el change feed desde su token."""
+        if self.snapshot_path is None or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("container") != self.repository.container.id:
+                logging.info("La instantánea del índice de OpportunityLeads no corresponde a este contenedor, se descarta.")
+                return False
+            if snapshot.get("continuation") is None or time.time() - snapshot["saved_at"] > self.reload_interval:
+                logging.info("La instantánea del índice de OpportunityLeads está vencida, se descarta.")
+                return False
+            with self._lock:
+                self._replace_all(OPPORTUNITY_LEADS_LIST.validate_python(snapshot["items"]), snapshot["continuation"])
+                self._loaded_at = time.monotonic()
+                self.apply_changes()
+        except Exception as e:
+            logging.warning(f"No se pudo restaurar la instantánea del índice de OpportunityLeads: {str(e)}")
+            with self._lock:
+                self._replace_all([], None)
+                self._loaded_at = self._synced_at = None
+            return False
+        logging.info(f"Índice de OpportunityLeads restaurado desde la instantánea con {len(self)} oportunidades activas.")
+        return True
+
+    def _copy(self, opportunity: OpportunityLeads) -> OpportunityLeads:
+        # Los servicios modifican el objeto devuelto (Status, leads); el índice no debe verlo hasta el update
+        return opportunity.model_copy(deep=True)
+
+    def _serve(self) -> bool:
+        if self.is_current:
+            self.hits += 1
+            return True
+        self.fallbacks += 1
+        return False
+
+    def get_all(self) -> List[OpportunityLeads]:
+        return self.repository.get_all()
+
+    def get_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityLeads]:
+        return self.repository.get_page(page_size, continuation)
+
+    def iter_all(self) -> Iterator[OpportunityLeads]:
+        return self.repository.iter_all()
+
+    def get_agent_ids(self) -> List[int]:
+        return self.repository.get_agent_ids()
+
+    def get_by_agte_id(self, agte_id: int) -> List[OpportunityLeads]:
+        if not self._serve():
+            return self.repository.get_by_agte_id(agte_id)
+        with self._lock:
+            return [self._copy(opportunity) for opportunity in self._by_agent.get(agte_id, {}).values()]
+
+    def get_lead_counts_by_agte_id(self, agte_id: int) -> List[OpportunityLeadCount]:
+        if not self._serve():
+            return self.repository.get_lead_counts_by_agte_id(agte_id)
+        with self._lock:
+            return [
+                OpportunityLeadCount(
+                    OpportunityId=opportunity.OpportunityId,
+                    Priority=opportunity.Priority,
+                    lead_count=len(opportunity.leads),
+                )
+                for opportunity in self._by_agent.get(agte_id, {}).values()
+            ]
+
+    def get_by_opportunity_id_and_agte(self, opportunity_id: int, id_agte: int) -> Optional[OpportunityLeads]:
+        # Solo se indexan las activas: si no está, se confirma en Cosmos
+        if self._serve():
+            opportunity = self._by_key.get((opportunity_id, id_agte))
+            if opportunity is not None:
+                return self._copy(opportunity)
+        return self.repository.get_by_opportunity_id_and_agte(opportunity_id, id_agte)
+
+    def get_by_opportunity_ids_and_agte(self, opportunity_ids: List[int], id_agte: int) -> List[OpportunityLeads]:
+        if not self._serve():
+            return self.repository.get_by_opportunity_ids_and_agte(opportunity_ids, id_agte)
+        found = []
+        missing = []
+        for opportunity_id in dict.fromkeys(opportunity_ids):
+            opportunity = self._by_key.get((opportunity_id, id_agte))
+            if opportunity is None:
+                missing.append(opportunity_id)
+            else:
+                found.append(self._copy(opportunity))
+        if missing:
+            found.extend(self.repository.get_by_opportunity_ids_and_agte(missing, id_agte))
+        return found
+
+    def get_leads(
+        self, opportunity_id: int, id_agte: int, continuation: Optional[str] = None, page_size: Optional[int] = None
+    ) -> Page[OpportunityLead]:
+        # Los tokens de continuación son de Cosmos: la paginación no se sirve desde memoria
+        return self.repository.get_leads(opportunity_id, id_agte, continuation, page_size)
+
+    def update(self, opportunity_lead: OpportunityLeads) -> None:
+        self.repository.update(opportunity_lead)
+        # Se refleja de inmediato; el change feed traerá el mismo documento más tarde
+        with self._lock:
+            if self._loaded_at is not None:
+                self._put(opportunity_lead.model_copy(deep=True))
+
+    def patch_status(
+            self, opportunity_lead: OpportunityLeads, status: int, claimed_by: Optional[str] = None
+    ) -> OpportunityLeads:
+        updated = self.repository.patch_status(opportunity_lead, status, claimed_by)
+        with self._lock:
+            if self._loaded_at is not None:
+                self._put(updated.model_copy(deep=True))
+        return updated
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.reload_interval:
+                    # La recarga completa también descarta los documentos borrados, que el change feed no informa
+                    self.load()
+                else:
+                    self.apply_changes()
+                if time.monotonic() - self._snapshot_at >= self.snapshot_interval:
+                    self.save_snapshot()
+            except Exception as e:
+                logging.error(f"Error al refrescar el índice de OpportunityLeads: {str(e)}")
+
+    def start(self) -> None:
+        if not self.restore_snapshot():
+            try:
+                self.load()
+            except Exception as e:
+                logging.error(f"No se pudo cargar el índice de OpportunityLeads al iniciar: {str(e)}")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="opportunity-leads-index", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        try:
+            self.save_snapshot()
+        except Exception as e:
+            logging.warning(f"No se pudo guardar la instantánea del índice de OpportunityLeads: {str(e)}")
+
+    def stats(self) -> dict:
+        lag = self.lag
+        return {
+            "opportunities": len(self._by_key),
+            "agents": len(self._by_agent),
+            "lag_seconds": round(lag, 3) if lag is not None else None,
+            "hits": self.hits,
+            "fallbacks": self.fallbacks,
+        }
+
+
+_index: Optional[OpportunityLeadsIndex] = None
+
+
+def init_opportunity_leads_index(repository: OpportunityLeadsStorage) -> OpportunityLeadsIndex:
+    global _index
+    if _index is None:
+        _index = OpportunityLeadsIndex(
+            repository,
+            refresh_interval=settings.OPPORTUNITY_LEADS_INDEX_REFRESH_SECONDS,
+            max_staleness=settings.OPPORTUNITY_LEADS_INDEX_MAX_STALENESS_SECONDS,
+            reload_interval=settings.OPPORTUNITY_LEADS_INDEX_RELOAD_SECONDS,
+            snapshot_path=settings.OPPORTUNITY_LEADS_INDEX_SNAPSHOT_PATH,
+            snapshot_interval=settings.OPPORTUNITY_LEADS_INDEX_SNAPSHOT_SECONDS,
+        )
+        _index.start()
+    return _index
+
+
+def close_opportunity_leads_index() -> None:
+    global _index
+    if _index is not None:
+        _index.stop()
+        _index = None
+
+
+def get_opportunity_leads_index() -> Optional[OpportunityLeadsIndex]:
+    return _index
@@ -0,0 +1,41 @@
+# infrastructure/repositories/opportunity_leads_layout.py
+from typing import Awaitable, Callable, Optional, Union
+from core.settings import settings
+from infrastructure.adapters.async_cosmos_adapter import AsyncCosmosAdapter
+from infrastructure.adapters.cosmos_adapter import CosmosAdapter
+from infrastructure.repositories.async_opportunity_leads_repository import AsyncOpportunityLeadsRepository
+from infrastructure.repositories.async_per_lead_opportunity_leads_repository import AsyncPerLeadOpportunityLeadsRepository
+from infrastructure.repositories.opportunity_leads_repository import OpportunityLeadsRepository
+from infrastructure.repositories.per_lead_opportunity_leads_repository import PerLeadOpportunityLeadsRepository
+from domain.models.opportunity_leads import OpportunityLeads
+
+EMBEDDED = "embedded"
+PER_LEAD = "per_lead"
+
+OpportunityLeadsStorage = Union[OpportunityLeadsRepository, PerLeadOpportunityLeadsRepository]
+AsyncOpportunityLeadsStorage = Union[AsyncOpportunityLeadsRepository, AsyncPerLeadOpportunityLeadsRepository]
+
+
+def _layout() -> str:
+    if settings.OPPORTUNITY_LEADS_LAYOUT not in (EMBEDDED, PER_LEAD):
+        raise ValueError(
+            f"OPPORTUNITY_LEADS_LAYOUT inválido: {settings.OPPORTUNITY_LEADS_LAYOUT!r} (use {EMBEDDED!r} o {PER_LEAD!r})."
+        )
+    return settings.OPPORTUNITY_LEADS_LAYOUT
+
+
+def create_opportunity_leads_repository(
+    session: CosmosAdapter, on_update: Optional[Callable[[OpportunityLeads], None]] = None
+) -> OpportunityLeadsStorage:
+    """Repositorio de OpportunityLeads según el formato de almacenamiento configurado."""
+    if _layout() == PER_LEAD:
+        return PerLeadOpportunityLeadsRepository(session, on_update=on_update)
+    return OpportunityLeadsRepository(session, on_update=on_update)
+
+
+def create_async_opportunity_leads_repository(
+    session: AsyncCosmosAdapter, on_update: Optional[Callable[[OpportunityLeads], Awaitable[None]]] = None
+) -> AsyncOpportunityLeadsStorage:
+    if _layout() == PER_LEAD:
+        return AsyncPerLeadOpportunityLeadsRepository(session, on_update=on_update)
+    return AsyncOpportunityLeadsRepository(session, on_update=on_update)
@@ -1,44 +1,107 @@
 # infrastructure/repositories/opportunity_leads_repository.py
 import logging
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Callable, Iterator, List, Mapping, Optional
+from azure.core import MatchConditions
+from azure.core.utils import CaseInsensitiveDict
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError, CosmosResourceNotFoundError
 from core.settings import settings
-from core.exceptions import ConnectionErrorException
-from infrastructure.adapters.cosmos_adapter import CosmosAdapter
+from core.exceptions import ConflictException, ConnectionErrorException, NotFoundException
+from core.single_flight import single_flight
+from infrastructure.adapters.cosmos_adapter import CosmosAdapter, query_scope
+from infrastructure.adapters.cosmos_diagnostics import track_cosmos_operation
 from application.ports.opportunity_leads_repository_port import OpportunityLeadsRepositoryPort
-from domain.models.opportunity_leads import OpportunityLeads
 from domain.models.opportunity_lead import OpportunityLead
+from domain.models.opportunity_lead_count import OpportunityLeadCount
+from domain.models.opportunity_leads import OPPORTUNITY_LEADS_LIST, OpportunityLeads
+from domain.models.page import Page
+
+
+def patched_etag(headers: Mapping[str, str], opportunity_lead: OpportunityLeads) -> str:
+    """
+    Etag que devolvió el patch. Sin él, el siguiente patch sobre la copia devuelta
+    (liberar o marcar convertida) perdería su condición, así que se falla.
+    """
+    etag = headers.get("etag")
+    if etag is None:
+        logging.error(f"Cosmos no devolvió el etag del patch de la oportunidad {opportunity_lead.OpportunityId}")
+        raise ConnectionErrorException("No se pudo actualizar el OpportunityLead.")
+    return etag
+
+
+def status_fields(status: int, claimed_by: Optional[str] = None) -> dict:
+    """Campos que cambia patch_status; con claimed_by se anotan el dueño y la hora del reclamo."""
+    fields = {"Status": status}
+    if claimed_by is not None:
+        fields.update(ClaimedBy=claimed_by, ClaimedAt=datetime.now(timezone.utc))
+    return fields
+
+
+def status_operations(fields: dict) -> List[dict]:
+    return [
+        {"op": "set", "path": f"/{name}", "value": value.isoformat() if isinstance(value, datetime) else value}
+        for name, value in fields.items()
+    ]
+
 
 class OpportunityLeadsRepository(OpportunityLeadsRepositoryPort):
-    def __init__(self, session: CosmosAdapter):
+    def __init__(self, session: CosmosAdapter, on_update: Optional[Callable[[OpportunityLeads], None]] = None):
+        self.on_update = on_update
+        self.partition_key = settings.COSMOS_OPPORTUNITY_LEADS_PARTITION_KEY
         self.container = session.get_container(
             settings.COSMOS_OPPORTUNITY_LEADS_CONTAINER,
             settings.COSMOS_OPPORTUNITY_LEADS_PARTITION_KEY
         )
 
+    def _to_domain_fields(self, doc: dict) -> dict:
+        """Extrae de un documento de Cosmos los campos del modelo de dominio, sin validarlos."""
+        return {
+            "id": doc.get("id"),
+            "OpportunityId": doc["OpportunityId"],
+            "Beggining": doc["Beggining"],
+            "End": doc["End"],
+            "IdAgte": doc["IdAgte"],
+            "IdSociedad": doc["IdSociedad"],
+            "WSaler": doc["WSaler"],
+            "Status": doc["Status"],
+            "Priority": doc["Priority"],
+            "leads": [l.get("lead", l) for l in doc.get("leads", [])],
+            "ClaimedBy": doc.get("ClaimedBy"),
+            "ClaimedAt": doc.get("ClaimedAt"),
+            "etag": doc.get("_etag"),
+        }
+
     def _map_to_domain(self, doc: dict) -> OpportunityLeads:
         """Convierte un documento de Cosmos en un modelo de dominio."""
-        leads = [OpportunityLead(**l["lead"]) for l in doc.get("leads", [])]
-
-        return OpportunityLeads(
-            id=doc.get("id"),
-            OpportunityId=doc["OpportunityId"],
-            Beggining=doc["Beggining"],
-            End=doc["End"],
-            IdAgte=doc["IdAgte"],
-            IdSociedad=doc["IdSociedad"],
-            WSaler=doc["WSaler"],
-            Status=doc["Status"],
-            Priority=doc["Priority"],
-            leads=leads,
-        )
+        return OpportunityLeads.model_validate(self._to_domain_fields(doc))
+
+    def _map_many(self, docs) -> List[OpportunityLeads]:
+        """Valida todos los documentos en un solo paso con el TypeAdapter compilado."""
+        return OPPORTUNITY_LEADS_LIST.validate_python([self._to_domain_fields(doc) for doc in docs])
+
+    def _patch_status_args(self, opportunity_lead: OpportunityLeads, fields: dict, headers: CaseInsensitiveDict) -> dict:
+        """Argumentos de patch_item para cambiar el Status, condicionado al etag si se conoce."""
+        args = {
+            "item": opportunity_lead.id,
+            "partition_key": getattr(opportunity_lead, self.partition_key.strip("/")),
+            "patch_operations": status_operations(fields),
+            # Sin cuerpo de respuesta: el documento con todos sus leads no vuelve por la red
+            "no_response": True,
+            "response_hook": lambda response_headers, _: headers.update(response_headers),
+        }
+        if opportunity_lead.etag is not None:
+            args["etag"] = opportunity_lead.etag
+            args["match_condition"] = MatchConditions.IfNotModified
+        return args
 
     def _map_to_document(self, opportunity_lead: OpportunityLeads) -> dict:
         """Convierte un modelo de dominio en un documento de Cosmos."""
-        doc = opportunity_lead.model_dump()
-        # Pydantic V2 uses model_dump, V1 uses dict
-        # doc = opportunity_lead.dict()
+        doc = opportunity_lead.model_dump(mode="json")
+        # Cosmos guarda cada lead envuelto en {"lead": {...}}
+        doc["leads"] = [{"lead": lead} for lead in doc["leads"]]
         return doc
 
+    @track_cosmos_operation
     def update(self, opportunity_lead: OpportunityLeads) -> None:
         try:
             doc = self._map_to_document(opportunity_lead)
@@ -46,26 +109,177 @@ class OpportunityLeadsRepository(OpportunityLeadsRepositoryPort):
         except Exception as e:
             logging.error(f"Error al actualizar OpportunityLead: {str(e)}")
             raise ConnectionErrorException("No se pudo actualizar el OpportunityLead.")
+        if self.on_update is not None:
+            self.on_update(opportunity_lead)
+
+    @track_cosmos_operation
+    def patch_status(
+            self, opportunity_lead: OpportunityLeads, status: int, claimed_by: Optional[str] = None
+    ) -> OpportunityLeads:
+        fields = status_fields(status, claimed_by)
+        headers = CaseInsensitiveDict()
+        try:
+            self.container.patch_item(**self._patch_status_args(opportunity_lead, fields, headers))
+        except CosmosAccessConditionFailedError:
+            raise ConflictException(
+                f"La oportunidad {opportunity_lead.OpportunityId} fue modificada por otro proceso; vuelva a intentarlo."
+            )
+        except CosmosResourceNotFoundError:
+            raise NotFoundException(f"No se encontró la oportunidad {opportunity_lead.OpportunityId}.")
+        except Exception as e:
+            logging.error(f"Error al actualizar el Status de OpportunityLead: {str(e)}")
+            raise ConnectionErrorException("No se pudo actualizar el OpportunityLead.")
+        updated = opportunity_lead.model_copy(update=dict(fields, etag=patched_etag(headers, opportunity_lead)))
+        if self.on_update is not None:
+            self.on_update(updated)
+        return updated
 
+    @track_cosmos_operation
     def get_all(self) -> List[OpportunityLeads]:
         try:
             query = "SELECT * FROM c"
-            items = list(self.container.query_items(query=query, enable_cross_partition_query=True))
-            return [self._map_to_domain(doc) for doc in items]
+            items = self.container.query_items(query=query, enable_cross_partition_query=True)
+            return self._map_many(items)
         except Exception as e:
             logging.error(f"Error al consultar Leads: {str(e)}")
             raise ConnectionErrorException("No se pudieron consultar los Leads.")
 
+    @track_cosmos_operation
+    def get_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityLeads]:
+        try:
+            query = "SELECT * FROM c"
+            pager = self.container.query_items(
+                query=query,
+                enable_cross_partition_query=True,
+                max_item_count=page_size
+            ).by_page(continuation)
+            items = self._map_many(next(pager, []))
+            return Page[OpportunityLeads](items=items, continuation=pager.continuation_token)
+        except Exception as e:
+            logging.error(f"Error al consultar página de Leads: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar la página de Leads.")
+
+    def iter_all(self) -> Iterator[OpportunityLeads]:
+        try:
+            query = "SELECT * FROM c"
+            for doc in self.container.query_items(query=query, enable_cross_partition_query=True):
+                yield self._map_to_domain(doc)
+        except Exception as e:
+            logging.error(f"Error al recorrer Leads: {str(e)}")
+            raise ConnectionErrorException("No se pudieron recorrer los Leads.")
+
+    def iter_active(self) -> Iterator[OpportunityLeads]:
+        """Recorre los OpportunityLeads activos de todas las particiones."""
+        try:
+            query = "SELECT * FROM c WHERE c.Status = 1"
+            for doc in self.container.query_items(query=query, enable_cross_partition_query=True):
+                yield self._map_to_domain(doc)
+        except Exception as e:
+            logging.error(f"Error al recorrer Leads activos: {str(e)}")
+            raise ConnectionErrorException("No se pudieron recorrer los Leads activos.")
+
+    @track_cosmos_operation
+    def get_agent_ids(self) -> List[int]:
+        try:
+            query = "SELECT DISTINCT VALUE c.IdAgte FROM c"
+            return list(self.container.query_items(query=query, enable_cross_partition_query=True))
+        except Exception as e:
+            logging.error(f"Error al consultar los agentes con Leads: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los agentes con Leads.")
+
+    @track_cosmos_operation
     def get_by_agte_id(self, agte_id: int) -> List[OpportunityLeads]:
         try:
             query = "SELECT * FROM c WHERE c.IdAgte=@agte_id AND c.Status = 1"
             parameters = [{"name": "@agte_id", "value": agte_id}]
-            items = list(self.container.query_items(query=query, parameters=parameters, enable_cross_partition_query=True))
-            return [self._map_to_domain(doc) for doc in items]
+            items = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                **query_scope(self.partition_key, IdAgte=agte_id)
+            )
+            return self._map_many(items)
         except Exception as e:
             logging.error(f"Error al consultar Leads por AgteId: {str(e)}")
             raise ConnectionErrorException("No se pudieron consultar los Leads por AgteId.")
         
+    @track_cosmos_operation
+    def get_lead_counts_by_agte_id(self, agte_id: int) -> List[OpportunityLeadCount]:
+        try:
+            query = """
+            SELECT c.OpportunityId, c.Priority, ARRAY_LENGTH(c.leads) AS lead_count
+            FROM c WHERE c.IdAgte=@agte_id AND c.Status = 1
+            """
+            parameters = [{"name": "@agte_id", "value": agte_id}]
+            items = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                **query_scope(self.partition_key, IdAgte=agte_id)
+            )
+            return [
+                OpportunityLeadCount(
+                    OpportunityId=doc["OpportunityId"],
+                    Priority=doc["Priority"],
+                    lead_count=doc.get("lead_count") or 0,
+                )
+                for doc in items
+            ]
+        except Exception as e:
+            logging.error(f"Error al consultar conteo de Leads por AgteId: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar el conteo de Leads por AgteId.")
+
+    @track_cosmos_operation
+    def get_by_opportunity_ids_and_agte(self, opportunity_ids: List[int], id_agte: int) -> List[OpportunityLeads]:
+        ids = list(dict.fromkeys(opportunity_ids))
+        if not ids:
+            return []
+        try:
+            query = "SELECT * FROM c WHERE ARRAY_CONTAINS(@ids, c.OpportunityId) AND c.IdAgte = @id_agte"
+            parameters = [
+                {"name": "@ids", "value": ids},
+                {"name": "@id_agte", "value": id_agte},
+            ]
+            items = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                **query_scope(self.partition_key, IdAgte=id_agte)
+            )
+            return self._map_many(items)
+        except Exception as e:
+            logging.error(f"Error al consultar Leads por OpportunityIds: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los Leads por OpportunityIds.")
+
+    @track_cosmos_operation
+    def get_leads(
+        self, opportunity_id: int, id_agte: int, continuation: Optional[str] = None, page_size: Optional[int] = None
+    ) -> Page[OpportunityLead]:
+        try:
+            # Como en _to_domain_fields, el lead puede estar envuelto en {"lead": {...}} o no
+            query = """
+            SELECT VALUE (IS_DEFINED(l.lead) ? l.lead : l) FROM c JOIN l IN c.leads
+            WHERE c.OpportunityId = @opportunity_id AND c.IdAgte = @id_agte
+            """
+            parameters = [
+                {"name": "@opportunity_id", "value": opportunity_id},
+                {"name": "@id_agte", "value": id_agte},
+            ]
+            pager = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                max_item_count=page_size or settings.OPPORTUNITY_LEADS_PAGE_SIZE,
+                **query_scope(self.partition_key, OpportunityId=opportunity_id, IdAgte=id_agte)
+            ).by_page(continuation)
+            items = [OpportunityLead.model_validate(lead) for lead in next(pager, [])]
+            return Page[OpportunityLead](items=items, continuation=pager.continuation_token)
+        except Exception as e:
+            logging.error(f"Error al consultar página de leads de la oportunidad: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar la página de leads de la oportunidad.")
+
+    def from_change_feed(self, docs: List[dict]) -> List[OpportunityLeads]:
+        """OpportunityLeads afectados por los documentos leídos del change feed."""
+        return [self._map_to_domain(doc) for doc in docs]
+
+    @single_flight
+    @track_cosmos_operation
     def get_by_opportunity_id_and_agte(self, opportunity_id: int, id_agte: int) -> Optional[OpportunityLeads]:
         query = """
         SELECT * FROM c WHERE c.OpportunityId = @opportunity_id AND c.IdAgte = @id_agte
@@ -78,7 +292,7 @@ class OpportunityLeadsRepository(OpportunityLeadsRepositoryPort):
         items = list(self.container.query_items(
             query=query,
             parameters=params,
-            enable_cross_partition_query=True
+            **query_scope(self.partition_key, OpportunityId=opportunity_id, IdAgte=id_agte)
         ))
 
         if not items:
@@ -0,0 +1,79 @@
+# infrastructure/repositories/opportunity_summary_store_repository.py
+import logging
+from typing import Iterator, List, Optional
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError, CosmosResourceNotFoundError
+from core.settings import settings
+from core.exceptions import ConflictException, ConnectionErrorException
+from infrastructure.adapters.cosmos_adapter import CosmosAdapter
+from infrastructure.adapters.cosmos_diagnostics import track_cosmos_operation
+from application.ports.opportunity_summary_store_port import OpportunitySummaryStorePort
+from domain.models.agent_opportunity_summary import AgentOpportunitySummary
+
+
+class OpportunitySummaryStoreRepository(OpportunitySummaryStorePort):
+    """Resúmenes materializados por agente: un documento por IdAgte, con id = IdAgte."""
+
+    def __init__(self, session: CosmosAdapter):
+        self.container = session.get_container(
+            settings.COSMOS_OPPORTUNITY_SUMMARY_CONTAINER,
+            settings.COSMOS_OPPORTUNITY_SUMMARY_PARTITION_KEY
+        )
+
+    def _map_to_domain(self, doc: dict) -> AgentOpportunitySummary:
+        summary = AgentOpportunitySummary.model_validate(doc)
+        summary.etag = doc.get("_etag")
+        return summary
+
+    def _map_to_document(self, summary: AgentOpportunitySummary) -> dict:
+        doc = summary.model_dump(mode="json")
+        doc["id"] = str(summary.IdAgte)
+        return doc
+
+    @track_cosmos_operation
+    def get(self, id_agte: int) -> Optional[AgentOpportunitySummary]:
+        try:
+            return self._map_to_domain(self.container.read_item(item=str(id_agte), partition_key=id_agte))
+        except CosmosResourceNotFoundError:
+            return None
+        except Exception as e:
+            logging.error(f"Error al consultar el resumen materializado del agente {id_agte}: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar el resumen de oportunidades.")
+
+    @track_cosmos_operation
+    def save(self, summary: AgentOpportunitySummary) -> AgentOpportunitySummary:
+        try:
+            doc = self._map_to_document(summary)
+            if summary.etag is None:
+                return self._map_to_domain(self.container.upsert_item(body=doc))
+            return self._map_to_domain(self.container.replace_item(
+                item=doc["id"],
+                body=doc,
+                etag=summary.etag,
+                match_condition=MatchConditions.IfNotModified,
+            ))
+        except CosmosAccessConditionFailedError:
+            raise ConflictException(f"El resumen del agente {summary.IdAgte} fue modificado por otro proceso.")
+        except Exception as e:
+            logging.error(f"Error al guardar el resumen materializado del agente {summary.IdAgte}: {str(e)}")
+            raise ConnectionErrorException("No se pudo guardar el resumen de oportunidades.")
+
+    @track_cosmos_operation
+    def get_agent_ids_with_opportunity(self, opportunity_id: int) -> List[int]:
+        try:
+            query = "SELECT VALUE c.IdAgte FROM c WHERE ARRAY_CONTAINS(c.summaries, {\"OpportunityId\": @opportunity_id}, true)"
+            parameters = [{"name": "@opportunity_id", "value": opportunity_id}]
+            items = self.container.query_items(query=query, parameters=parameters, enable_cross_partition_query=True)
+            return list(items)
+        except Exception as e:
+            logging.error(f"Error al consultar agentes con la oportunidad {opportunity_id}: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los resúmenes por oportunidad.")
+
+    def iter_all(self) -> Iterator[AgentOpportunitySummary]:
+        try:
+            query = "SELECT * FROM c"
+            for doc in self.container.query_items(query=query, enable_cross_partition_query=True):
+                yield self._map_to_domain(doc)
+        except Exception as e:
+            logging.error(f"Error al recorrer los resúmenes materializados: {str(e)}")
+            raise ConnectionErrorException("No se pudieron recorrer los resúmenes de oportunidades.")
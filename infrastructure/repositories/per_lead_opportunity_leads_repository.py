@@ -0,0 +1,452 @@
+# infrastructure/repositories/per_lead_opportunity_leads_repository.py
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from azure.core import MatchConditions
+from azure.core.utils import CaseInsensitiveDict
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError, CosmosBatchOperationError, CosmosResourceNotFoundError
+from core.settings import settings
+from core.exceptions import ConflictException, ConnectionErrorException, NotFoundException
+from core.single_flight import single_flight
+from infrastructure.adapters.cosmos_adapter import CosmosAdapter, query_scope
+from infrastructure.adapters.cosmos_diagnostics import track_cosmos_operation
+from infrastructure.repositories.opportunity_leads_repository import patched_etag, status_fields, status_operations
+from application.ports.opportunity_leads_repository_port import OpportunityLeadsRepositoryPort
+from domain.models.opportunity_lead import OpportunityLead
+from domain.models.opportunity_lead_count import OpportunityLeadCount
+from domain.models.opportunity_leads import OPPORTUNITY_LEADS_LIST, OpportunityLeads
+from domain.models.page import Page
+
+HEADER = "header"
+LEAD = "lead"
+
+# Cabeceras cuyos leads se piden en una sola consulta al recorrer o paginar el contenedor
+ASSEMBLE_BATCH_SIZE = 100
+
+# Máximo de operaciones de un batch transaccional de Cosmos
+TRANSACTIONAL_BATCH_LIMIT = 100
+
+
+def header_id(opportunity_id: int, id_agte: int) -> str:
+    """Id de la cabecera, derivado de la clave para poder leerla sin consultar."""
+    return f"{opportunity_id}-{id_agte}"
+
+
+def lead_id(header: str, position: int) -> str:
+    return f"{header}:{position}"
+
+
+def batch_plan(header: dict, lead_docs: List[dict], previous: Optional[dict]) -> List[Tuple[list, Optional[dict]]]:
+    """
+    Reparte la actualización en batches transaccionales: upserts de los leads, luego
+    el borrado de las posiciones que sobran, y en cada batch una operación sobre la
+    cabecera. Mientras quedan leads por escribir esa operación reescribe la cabecera
+    anterior sin cambios (solo para condicionar el batch a su etag); la nueva cabecera
+    va en el batch que escribe los últimos leads, junto con los borrados.
+    Devuelve (operaciones de leads, cuerpo de la cabecera o None si no hay que escribirla).
+    """
+    previous_count = previous.get("lead_count", 0) if previous is not None else 0
+    operations = [("upsert", (doc,)) for doc in lead_docs]
+    operations += [("delete", (lead_id(header["id"], position),)) for position in range(len(lead_docs), previous_count)]
+    unchanged = {key: value for key, value in previous.items() if not key.startswith("_")} if previous is not None else None
+    size = TRANSACTIONAL_BATCH_LIMIT - 1
+    return [
+        (operations[start:start + size], header if start + size >= len(lead_docs) else unchanged)
+        for start in range(0, max(len(operations), 1), size)
+    ]
+
+
+def header_operation(header: dict, etag: Optional[str]) -> tuple:
+    """Operación de batch para la cabecera: se crea si no existía, si no se reemplaza condicionada al etag."""
+    if etag is None:
+        return ("create", (header,))
+    return ("replace", (header["id"], header), {"if_match_etag": etag})
+
+
+def batch_error(error: CosmosBatchOperationError, opportunity_lead: OpportunityLeads) -> Exception:
+    """Traduce el fallo de un batch: si otro proceso cambió la cabecera, es un conflicto."""
+    if error.status_code in (409, 412):
+        return ConflictException(
+            f"La oportunidad {opportunity_lead.OpportunityId} fue modificada por otro proceso; vuelva a intentarlo."
+        )
+    logging.error(f"Error en el batch al actualizar OpportunityLead: {str(error)}")
+    return ConnectionErrorException("No se pudo actualizar el OpportunityLead.")
+
+
+class PerLeadOpportunityLeadsRepository(OpportunityLeadsRepositoryPort):
+    """
+    OpportunityLeads guardado como una cabecera (datos de la oportunidad y lead_count)
+    más un documento por lead, todos en la misma partición. Ningún documento crece con
+    el número de leads, el conteo sale de la cabecera y los leads se pueden paginar.
+    Las actualizaciones se escriben en batches transaccionales condicionados al etag de
+    la cabecera; si no caben en uno, los documentos de lead con position >= lead_count
+    que deje un batch fallido son restos que se ignoran al leer.
+    """
+
+    def __init__(self, session: CosmosAdapter, on_update: Optional[Callable[[OpportunityLeads], None]] = None):
+        self.on_update = on_update
+        self.partition_key = settings.COSMOS_OPPORTUNITY_LEADS_PARTITION_KEY
+        self.container = session.get_container(
+            settings.COSMOS_OPPORTUNITY_LEAD_DOCUMENTS_CONTAINER,
+            settings.COSMOS_OPPORTUNITY_LEADS_PARTITION_KEY
+        )
+
+    def _partition_value(self, opportunity_lead: OpportunityLeads):
+        return getattr(opportunity_lead, self.partition_key.strip("/"))
+
+    def _to_domain_fields(self, header: dict, lead_docs: Iterable[dict]) -> dict:
+        """Arma los campos del modelo de dominio con la cabecera y sus documentos de lead, sin validarlos."""
+        lead_count = header.get("lead_count", 0)
+        leads = sorted((doc for doc in lead_docs if doc["position"] < lead_count), key=lambda doc: doc["position"])
+        return {
+            "id": header.get("id"),
+            "OpportunityId": header["OpportunityId"],
+            "Beggining": header["Beggining"],
+            "End": header["End"],
+            "IdAgte": header["IdAgte"],
+            "IdSociedad": header["IdSociedad"],
+            "WSaler": header["WSaler"],
+            "Status": header["Status"],
+            "Priority": header["Priority"],
+            "leads": [doc["lead"] for doc in leads],
+            "ClaimedBy": header.get("ClaimedBy"),
+            "ClaimedAt": header.get("ClaimedAt"),
+            "etag": header.get("_etag"),
+        }
+
+    def _map_many(self, headers: Iterable[dict], lead_docs: Iterable[dict]) -> List[OpportunityLeads]:
+        """Agrupa los leads por cabecera y valida todo en un solo paso con el TypeAdapter compilado."""
+        leads_by_header: Dict[str, List[dict]] = defaultdict(list)
+        for doc in lead_docs:
+            leads_by_header[doc["headerId"]].append(doc)
+        return OPPORTUNITY_LEADS_LIST.validate_python([
+            self._to_domain_fields(header, leads_by_header.get(header["id"], [])) for header in headers
+        ])
+
+    def _map_mixed(self, docs: Iterable[dict]) -> List[OpportunityLeads]:
+        """Separa cabeceras y leads de una consulta que devuelve ambos tipos de documento."""
+        headers, lead_docs = [], []
+        for doc in docs:
+            (lead_docs if doc.get("docType") == LEAD else headers).append(doc)
+        return self._map_many(headers, lead_docs)
+
+    def _map_to_documents(self, opportunity_lead: OpportunityLeads) -> tuple:
+        """Convierte el modelo de dominio en la cabecera y la lista de documentos de lead."""
+        header = opportunity_lead.model_dump(mode="json", exclude={"leads"})
+        header.update(
+            id=header_id(opportunity_lead.OpportunityId, opportunity_lead.IdAgte),
+            docType=HEADER,
+            lead_count=len(opportunity_lead.leads),
+        )
+        partition_field = self.partition_key.strip("/")
+        lead_docs = [
+            {
+                "id": lead_id(header["id"], position),
+                "docType": LEAD,
+                "headerId": header["id"],
+                "OpportunityId": opportunity_lead.OpportunityId,
+                "IdAgte": opportunity_lead.IdAgte,
+                partition_field: header[partition_field],
+                "position": position,
+                "lead": lead.model_dump(),
+            }
+            for position, lead in enumerate(opportunity_lead.leads)
+        ]
+        return header, lead_docs
+
+    def _patch_status_args(self, opportunity_lead: OpportunityLeads, fields: dict, headers: CaseInsensitiveDict) -> dict:
+        """Argumentos de patch_item para cambiar el Status de la cabecera, condicionado al etag si se conoce."""
+        args = {
+            "item": header_id(opportunity_lead.OpportunityId, opportunity_lead.IdAgte),
+            "partition_key": self._partition_value(opportunity_lead),
+            "patch_operations": status_operations(fields),
+            "no_response": True,
+            "response_hook": lambda response_headers, _: headers.update(response_headers),
+        }
+        if opportunity_lead.etag is not None:
+            args["etag"] = opportunity_lead.etag
+            args["match_condition"] = MatchConditions.IfNotModified
+        return args
+
+    def _assemble(self, headers: List[dict]) -> List[OpportunityLeads]:
+        """Completa cabeceras de cualquier partición con sus leads en una sola consulta."""
+        if not headers:
+            return []
+        query = "SELECT * FROM c WHERE c.docType = @doc_type AND ARRAY_CONTAINS(@header_ids, c.headerId)"
+        parameters = [
+            {"name": "@doc_type", "value": LEAD},
+            {"name": "@header_ids", "value": [header["id"] for header in headers]},
+        ]
+        lead_docs = self.container.query_items(query=query, parameters=parameters, enable_cross_partition_query=True)
+        return self._map_many(headers, lead_docs)
+
+    def _iter_headers(self, query: str, parameters: List[dict]) -> Iterator[OpportunityLeads]:
+        batch = []
+        for header in self.container.query_items(query=query, parameters=parameters, enable_cross_partition_query=True):
+            batch.append(header)
+            if len(batch) >= ASSEMBLE_BATCH_SIZE:
+                yield from self._assemble(batch)
+                batch = []
+        yield from self._assemble(batch)
+
+    def _read_header(self, opportunity_id: int, id_agte: int) -> Optional[dict]:
+        """Lectura puntual de la cabecera; si la partition key no es parte de la clave, se consulta por id."""
+        item = header_id(opportunity_id, id_agte)
+        partition_value = {"OpportunityId": opportunity_id, "IdAgte": id_agte}.get(self.partition_key.strip("/"))
+        if partition_value is None:
+            query = "SELECT * FROM c WHERE c.id = @id"
+            parameters = [{"name": "@id", "value": item}]
+            return next(iter(self.container.query_items(query=query, parameters=parameters, enable_cross_partition_query=True)), None)
+        try:
+            return self.container.read_item(item=item, partition_key=partition_value)
+        except CosmosResourceNotFoundError:
+            return None
+
+    @track_cosmos_operation
+    def update(self, opportunity_lead: OpportunityLeads) -> None:
+        try:
+            header, lead_docs = self._map_to_documents(opportunity_lead)
+            previous = self._read_header(opportunity_lead.OpportunityId, opportunity_lead.IdAgte)
+            etag = previous.get("_etag") if previous is not None else None
+            for operations, header_body in batch_plan(header, lead_docs, previous):
+                if header_body is not None:
+                    operations.append(header_operation(header_body, etag))
+                results = self.container.execute_item_batch(
+                    batch_operations=operations, partition_key=header[self.partition_key.strip("/")]
+                )
+                if header_body is not None:
+                    # Cada batch queda condicionado a la cabecera que escribió el anterior
+                    etag = results[-1].get("eTag")
+        except CosmosBatchOperationError as e:
+            raise batch_error(e, opportunity_lead)
+        except Exception as e:
+            logging.error(f"Error al actualizar OpportunityLead: {str(e)}")
+            raise ConnectionErrorException("No se pudo actualizar el OpportunityLead.")
+        if self.on_update is not None:
+            self.on_update(opportunity_lead)
+
+    @track_cosmos_operation
+    def patch_status(
+            self, opportunity_lead: OpportunityLeads, status: int, claimed_by: Optional[str] = None
+    ) -> OpportunityLeads:
+        fields = status_fields(status, claimed_by)
+        headers = CaseInsensitiveDict()
+        try:
+            self.container.patch_item(**self._patch_status_args(opportunity_lead, fields, headers))
+        except CosmosAccessConditionFailedError:
+            raise ConflictException(
+                f"La oportunidad {opportunity_lead.OpportunityId} fue modificada por otro proceso; vuelva a intentarlo."
+            )
+        except CosmosResourceNotFoundError:
+            raise NotFoundException(f"No se encontró la oportunidad {opportunity_lead.OpportunityId}.")
+        except Exception as e:
+            logging.error(f"Error al actualizar el Status de OpportunityLead: {str(e)}")
+            raise ConnectionErrorException("No se pudo actualizar el OpportunityLead.")
+        updated = opportunity_lead.model_copy(update=dict(fields, etag=patched_etag(headers, opportunity_lead)))
+        if self.on_update is not None:
+            self.on_update(updated)
+        return updated
+
+    @track_cosmos_operation
+    def get_all(self) -> List[OpportunityLeads]:
+        try:
+            query = "SELECT * FROM c"
+            return self._map_mixed(self.container.query_items(query=query, enable_cross_partition_query=True))
+        except Exception as e:
+            logging.error(f"Error al consultar Leads: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los Leads.")
+
+    @track_cosmos_operation
+    def get_page(self, page_size: int, continuation: Optional[str] = None) -> Page[OpportunityLeads]:
+        try:
+            query = "SELECT * FROM c WHERE c.docType = @doc_type"
+            pager = self.container.query_items(
+                query=query,
+                parameters=[{"name": "@doc_type", "value": HEADER}],
+                enable_cross_partition_query=True,
+                max_item_count=page_size
+            ).by_page(continuation)
+            items = self._assemble(list(next(pager, [])))
+            return Page[OpportunityLeads](items=items, continuation=pager.continuation_token)
+        except Exception as e:
+            logging.error(f"Error al consultar página de Leads: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar la página de Leads.")
+
+    def iter_all(self) -> Iterator[OpportunityLeads]:
+        try:
+            yield from self._iter_headers(
+                "SELECT * FROM c WHERE c.docType = @doc_type", [{"name": "@doc_type", "value": HEADER}]
+            )
+        except Exception as e:
+            logging.error(f"Error al recorrer Leads: {str(e)}")
+            raise ConnectionErrorException("No se pudieron recorrer los Leads.")
+
+    def iter_active(self) -> Iterator[OpportunityLeads]:
+        """Recorre los OpportunityLeads activos de todas las particiones."""
+        try:
+            yield from self._iter_headers(
+                "SELECT * FROM c WHERE c.docType = @doc_type AND c.Status = 1", [{"name": "@doc_type", "value": HEADER}]
+            )
+        except Exception as e:
+            logging.error(f"Error al recorrer Leads activos: {str(e)}")
+            raise ConnectionErrorException("No se pudieron recorrer los Leads activos.")
+
+    def from_change_feed(self, docs: List[dict]) -> List[OpportunityLeads]:
+        """
+        OpportunityLeads afectados por los documentos leídos del change feed. Un cambio
+        puede traer solo la cabecera o solo algunos leads, así que se releen completos.
+        """
+        opportunity_ids: Dict[int, List[int]] = defaultdict(list)
+        for doc in docs:
+            if doc["OpportunityId"] not in opportunity_ids[doc["IdAgte"]]:
+                opportunity_ids[doc["IdAgte"]].append(doc["OpportunityId"])
+        changed = []
+        for id_agte, ids in opportunity_ids.items():
+            changed.extend(self.get_by_opportunity_ids_and_agte(ids, id_agte))
+        return changed
+
+    @track_cosmos_operation
+    def get_agent_ids(self) -> List[int]:
+        try:
+            query = "SELECT DISTINCT VALUE c.IdAgte FROM c WHERE c.docType = @doc_type"
+            parameters = [{"name": "@doc_type", "value": HEADER}]
+            return list(self.container.query_items(query=query, parameters=parameters, enable_cross_partition_query=True))
+        except Exception as e:
+            logging.error(f"Error al consultar los agentes con Leads: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los agentes con Leads.")
+
+    @track_cosmos_operation
+    def get_by_agte_id(self, agte_id: int) -> List[OpportunityLeads]:
+        try:
+            query = "SELECT * FROM c WHERE c.docType = @doc_type AND c.IdAgte=@agte_id AND c.Status = 1"
+            parameters = [
+                {"name": "@doc_type", "value": HEADER},
+                {"name": "@agte_id", "value": agte_id},
+            ]
+            headers = list(self.container.query_items(
+                query=query,
+                parameters=parameters,
+                **query_scope(self.partition_key, IdAgte=agte_id)
+            ))
+            if not headers:
+                return []
+            query = "SELECT * FROM c WHERE c.docType = @doc_type AND c.IdAgte=@agte_id AND ARRAY_CONTAINS(@ids, c.OpportunityId)"
+            parameters = [
+                {"name": "@doc_type", "value": LEAD},
+                {"name": "@agte_id", "value": agte_id},
+                {"name": "@ids", "value": [header["OpportunityId"] for header in headers]},
+            ]
+            lead_docs = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                **query_scope(self.partition_key, IdAgte=agte_id)
+            )
+            return self._map_many(headers, lead_docs)
+        except Exception as e:
+            logging.error(f"Error al consultar Leads por AgteId: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los Leads por AgteId.")
+
+    @track_cosmos_operation
+    def get_lead_counts_by_agte_id(self, agte_id: int) -> List[OpportunityLeadCount]:
+        try:
+            # Solo cabeceras: el conteo se mantiene en lead_count y no se lee ningún lead
+            query = """
+            SELECT c.OpportunityId, c.Priority, c.lead_count
+            FROM c WHERE c.docType = @doc_type AND c.IdAgte=@agte_id AND c.Status = 1
+            """
+            parameters = [
+                {"name": "@doc_type", "value": HEADER},
+                {"name": "@agte_id", "value": agte_id},
+            ]
+            items = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                **query_scope(self.partition_key, IdAgte=agte_id)
+            )
+            return [
+                OpportunityLeadCount(
+                    OpportunityId=doc["OpportunityId"],
+                    Priority=doc["Priority"],
+                    lead_count=doc.get("lead_count") or 0,
+                )
+                for doc in items
+            ]
+        except Exception as e:
+            logging.error(f"Error al consultar conteo de Leads por AgteId: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar el conteo de Leads por AgteId.")
+
+    @track_cosmos_operation
+    def get_by_opportunity_ids_and_agte(self, opportunity_ids: List[int], id_agte: int) -> List[OpportunityLeads]:
+        ids = list(dict.fromkeys(opportunity_ids))
+        if not ids:
+            return []
+        try:
+            # Cabeceras y leads llegan en la misma consulta
+            query = "SELECT * FROM c WHERE ARRAY_CONTAINS(@ids, c.OpportunityId) AND c.IdAgte = @id_agte"
+            parameters = [
+                {"name": "@ids", "value": ids},
+                {"name": "@id_agte", "value": id_agte},
+            ]
+            items = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                **query_scope(self.partition_key, IdAgte=id_agte)
+            )
+            return self._map_mixed(items)
+        except Exception as e:
+            logging.error(f"Error al consultar Leads por OpportunityIds: {str(e)}")
+            raise ConnectionErrorException("No se pudieron consultar los Leads por OpportunityIds.")
+
+    @track_cosmos_operation
+    def get_leads(
+        self, opportunity_id: int, id_agte: int, continuation: Optional[str] = None, page_size: Optional[int] = None
+    ) -> Page[OpportunityLead]:
+        try:
+            header = self._read_header(opportunity_id, id_agte)
+            if header is None:
+                return Page[OpportunityLead](items=[])
+            query = """
+            SELECT VALUE c.lead FROM c
+            WHERE c.docType = @doc_type AND c.OpportunityId = @opportunity_id AND c.IdAgte = @id_agte
+            AND c.position < @lead_count
+            ORDER BY c.position
+            """
+            parameters = [
+                {"name": "@doc_type", "value": LEAD},
+                {"name": "@opportunity_id", "value": opportunity_id},
+                {"name": "@id_agte", "value": id_agte},
+                {"name": "@lead_count", "value": header.get("lead_count", 0)},
+            ]
+            pager = self.container.query_items(
+                query=query,
+                parameters=parameters,
+                max_item_count=page_size or settings.OPPORTUNITY_LEADS_PAGE_SIZE,
+                **query_scope(self.partition_key, OpportunityId=opportunity_id, IdAgte=id_agte)
+            ).by_page(continuation)
+            items = [OpportunityLead.model_validate(lead) for lead in next(pager, [])]
+            return Page[OpportunityLead](items=items, continuation=pager.continuation_token)
+        except Exception as e:
+            logging.error(f"Error al consultar página de leads de la oportunidad: {str(e)}")
+            raise ConnectionErrorException("No se pudo consultar la página de leads de la oportunidad.")
+
+    @single_flight
+    @track_cosmos_operation
+    def get_by_opportunity_id_and_agte(self, opportunity_id: int, id_agte: int) -> Optional[OpportunityLeads]:
+        query = """
+        SELECT * FROM c WHERE c.OpportunityId = @opportunity_id AND c.IdAgte = @id_agte
+        """
+        params = [
+            {"name": "@opportunity_id", "value": opportunity_id},
+            {"name": "@id_agte", "value": id_agte},
+        ]
+
+        items = self._map_mixed(self.container.query_items(
+            query=query,
+            parameters=params,
+            **query_scope(self.partition_key, OpportunityId=opportunity_id, IdAgte=id_agte)
+        ))
+
+        if not items:
+            return None
+
+        return items[0]
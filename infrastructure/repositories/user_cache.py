@@ -0,0 +1,79 @@
+# infrastructure/repositories/user_cache.py
+import threading
+from typing import Optional
+from core.cache import TTLCache
+from core.settings import settings
+from domain.models.user import User
+
+# Marca de usuario inexistente en el cache negativo
+NOT_FOUND = object()
+
+
+class UserIdentityCache:
+    """
+    Cache en proceso de la identidad de usuarios (email -> Id, idAgte) y de la
+    existencia del usuario asignado (Id -> bool). Los usuarios inexistentes se
+    cachean con un TTL más corto (cache negativo).
+    """
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: float):
+        self.negative_ttl = negative_ttl
+        self.by_email = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.exists = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _email_key(self, email: str) -> str:
+        return email.strip().lower()
+
+    def get_user(self, email: str):
+        """Devuelve el User cacheado, NOT_FOUND si se sabe que no existe, o None si no hay entrada."""
+        return self.by_email.get(self._email_key(email))
+
+    def set_user(self, email: str, user: Optional[User]) -> None:
+        if user is None:
+            self.by_email.set(self._email_key(email), NOT_FOUND, ttl=self.negative_ttl)
+            return
+        self.by_email.set(self._email_key(email), user)
+        # Un usuario resuelto por email existe: evita el SELECT de verificación posterior
+        self.exists.set(user.id, True)
+
+    def get_exists(self, user_id: str) -> Optional[bool]:
+        return self.exists.get(user_id)
+
+    def set_exists(self, user_id: str, exists: bool) -> None:
+        self.exists.set(user_id, exists, ttl=None if exists else self.negative_ttl)
+
+    def invalidate(self, email: Optional[str] = None, user_id: Optional[str] = None) -> None:
+        if email is not None:
+            self.by_email.invalidate(self._email_key(email))
+        if user_id is not None:
+            self.exists.invalidate(user_id)
+
+    def clear(self) -> None:
+        self.by_email.clear()
+        self.exists.clear()
+
+    def stats(self) -> dict:
+        return {
+            "by_email": self.by_email.stats(),
+            "exists": self.exists.stats(),
+        }
+
+
+_cache: Optional[UserIdentityCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_user_identity_cache() -> Optional[UserIdentityCache]:
+    """Cache de identidad del proceso, o None si está deshabilitado por configuración."""
+    global _cache
+    if not settings.USER_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = UserIdentityCache(
+                    maxsize=settings.USER_CACHE_SIZE,
+                    ttl=settings.USER_CACHE_TTL_SECONDS,
+                    negative_ttl=settings.USER_CACHE_NEGATIVE_TTL_SECONDS,
+                )
+    return _cache
@@ -1,29 +1,45 @@
 # infrastructure/repositories/user_repository.py
 import logging
+from typing import Optional
 from fastapi import HTTPException
 from domain.models.user import User
 from infrastructure.adapters.sql_server_adapter import SqlServerAdapter
+from infrastructure.repositories.user_cache import NOT_FOUND, UserIdentityCache, get_user_identity_cache
 
 
 class UserRepository:
-    def __init__(self, adapter: SqlServerAdapter):
+    def __init__(self, adapter: SqlServerAdapter, cache: Optional[UserIdentityCache] = None):
         self.adapter = adapter
+        self.cache = cache if cache is not None else get_user_identity_cache()
+
+    def _not_found(self, email: str) -> HTTPException:
+        return HTTPException(status_code=404, detail=f"Usuario con email {email} no encontrado.")
 
     def get_user_by_email(self, email: str) -> User:
         """
         Obtiene un usuario de SQL Server a partir de su correo electrónico.
         """
+        if self.cache is not None:
+            cached = self.cache.get_user(email)
+            if cached is NOT_FOUND:
+                raise self._not_found(email)
+            if cached is not None:
+                return cached
+
         try:
             query = "SELECT Id, idAgte FROM dalilm.Users WHERE Email = ?"
             result = self.adapter.execute_query(query, (email,), fetchone=True)
 
             if not result:
                 logging.error(f"Usuario no encontrado para email: {email}")
-                raise HTTPException(
-                    status_code=404, detail=f"Usuario con email {email} no encontrado."
-                )
+                if self.cache is not None:
+                    self.cache.set_user(email, None)
+                raise self._not_found(email)
 
-            return User(id=result[0], id_agte=result[1])
+            user = User(id=result[0], id_agte=result[1])
+            if self.cache is not None:
+                self.cache.set_user(email, user)
+            return user
 
         except HTTPException:
             # si ya lanzamos el error, lo dejamos pasar
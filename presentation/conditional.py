@@ -0,0 +1,70 @@
+# presentation/conditional.py
+import hashlib
+from typing import Any, Callable, Iterable, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+from domain.models.opportunity_detail import OpportunityDetail
+
+
+def strong_etag(*parts: Any) -> str:
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def details_etag(details: Iterable[OpportunityDetail]) -> Optional[str]:
+    """
+    ETag de una colección de Details a partir de los _etag de Cosmos, sin
+    serializar la respuesta. Devuelve None si a algún Detail le falta el _etag.
+    """
+    versions = []
+    for detail in details:
+        if detail.etag is None:
+            return None
+        versions.append(f"{detail.OpportunityId}:{detail.etag}")
+    return strong_etag(*sorted(versions))
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """Compara If-None-Match con el ETag (comparación débil, como pide RFC 9110 para GET)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def conditional_response(
+    request: Request,
+    serialize: Callable[[], bytes],
+    cache_control: str,
+    etag: Optional[str] = None,
+) -> Response:
+    """
+    Responde 304 si el cliente ya tiene la versión vigente. Con un ETag
+    precalculado el 304 se resuelve sin serializar; si no, el ETag es el hash
+    del contenido.
+    """
+    if etag is not None and if_none_match(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+    content = serialize()
+    etag = etag or strong_etag(hashlib.sha256(content).hexdigest())
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if if_none_match(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def conditional_json_response(
+    request: Request,
+    adapter: TypeAdapter,
+    value: Any,
+    cache_control: str,
+    etag: Optional[str] = None,
+) -> Response:
+    return conditional_response(request, lambda: adapter.dump_json(value), cache_control, etag)
@@ -0,0 +1,12 @@
+# presentation/json_response.py
+from typing import Any
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+
+def json_bytes_response(adapter: TypeAdapter, value: Any) -> Response:
+    """
+    Serializa directo a bytes con el serializador compilado de pydantic-core.
+    Al devolver un Response, FastAPI no vuelve a validar contra el response_model.
+    """
+    return Response(content=adapter.dump_json(value), media_type="application/json")
@@ -0,0 +1,71 @@
+# presentation/lead_jobs.py
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from core.settings import settings
+from application.services.lead_job_service import LeadJobService
+from infrastructure.adapters.azure_auth_adapter import get_azure_auth_adapter
+from infrastructure.adapters.cosmos_adapter import get_cosmos_session
+from infrastructure.adapters.sql_server_adapter import get_sql_server_session
+from infrastructure.repositories.lead_job_repository import LeadJobRepository
+from infrastructure.repositories.lead_repository import LeadRepository
+from infrastructure.repositories.user_repository import UserRepository
+from presentation.opportunity_summaries import get_opportunity_leads_repository
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_stop_event = threading.Event()
+
+
+def get_lead_job_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _stop_event.clear()
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.LEAD_JOBS_MAX_WORKERS,
+                    thread_name_prefix="lead-jobs",
+                )
+    return _executor
+
+
+def close_lead_job_executor() -> None:
+    """
+    Detiene el executor antes de cerrar los pools: los jobs en curso terminan su bloque
+    y vuelven a pending, y los encolados no llegan a empezar. Todos se reanudan desde su
+    checkpoint al reiniciar.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _stop_event.set()
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+
+def get_lead_job_service() -> LeadJobService:
+    sql = get_sql_server_session()
+    cosmos = get_cosmos_session()
+    return LeadJobService(
+        LeadJobRepository(cosmos),
+        LeadRepository(sql),
+        get_opportunity_leads_repository(cosmos),
+        UserRepository(sql),
+        get_azure_auth_adapter(),
+        get_lead_job_executor(),
+        settings.LEAD_JOBS_CHUNK_SIZE,
+        _stop_event,
+        settings.LEAD_CONVERSION_CLAIM_LEASE_SECONDS,
+    )
+
+
+def resume_lead_jobs() -> None:
+    try:
+        resumed = get_lead_job_service().resume_unfinished()
+        if resumed:
+            logging.info(f"Se reanudaron {resumed} jobs de conversión de leads.")
+    except Exception as e:
+        logging.error(f"No se pudieron reanudar los jobs de conversión de leads: {str(e)}")
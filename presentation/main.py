@@ -1,19 +1,77 @@
 # presentation/main.py
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from core.logging_config import LogLevels, configure_logging
-from presentation.routers import opportunity_detail_router, opportunity_leads_router, opportunity_summary_router, lead_router
+from core.settings import settings
+from core.single_flight import single_flight_stats
+from infrastructure.adapters.async_cosmos_adapter import close_async_cosmos_adapter, init_async_cosmos_adapter
+from infrastructure.adapters.async_sql_server_adapter import close_sql_executor
+from infrastructure.adapters.cosmos_diagnostics import cosmos_operation_stats
+from infrastructure.adapters.cosmos_adapter import close_cosmos_adapter, init_cosmos_adapter
+from infrastructure.adapters.sql_server_adapter import close_sql_pool, get_sql_pool
+from infrastructure.repositories.user_cache import get_user_identity_cache
+from infrastructure.repositories.opportunity_detail_catalog import close_opportunity_detail_catalog
+from infrastructure.repositories.opportunity_leads_index import close_opportunity_leads_index, get_opportunity_leads_index
+from presentation.metrics import PrometheusMiddleware, router as metrics_router
+from presentation.lead_jobs import close_lead_job_executor
+from presentation.warmup import run_warmup, stop_warmup
+from presentation.routers import health_router, opportunity_detail_router, opportunity_leads_router, opportunity_summary_router, lead_router
 
 configure_logging(LogLevels.info)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.ASYNC_STACK_ENABLED:
+        if settings.OPPORTUNITY_DETAIL_CACHE_ENABLED or settings.OPPORTUNITY_LEADS_INDEX_ENABLED:
+            logging.warning(
+                "El catálogo de Details y el índice de OpportunityLeads solo se usan en la pila sync; "
+                "con ASYNC_STACK_ENABLED las lecturas van a Cosmos."
+            )
+        cosmos = await init_async_cosmos_adapter(provision=settings.COSMOS_PROVISION_ON_STARTUP)
+    else:
+        cosmos = init_cosmos_adapter(provision=settings.COSMOS_PROVISION_ON_STARTUP)
+    warmup_task = None
+    if settings.WARMUP_IN_BACKGROUND:
+        # /live responde mientras tanto; /ready recién cuando termina
+        warmup_task = asyncio.create_task(run_warmup(cosmos))
+    else:
+        await run_warmup(cosmos)
+    yield
+    # Ningún paso del calentamiento puede seguir abriendo catálogos o jobs tras el cierre
+    await stop_warmup(warmup_task)
+    # Espera el bloque en curso de cada job sin bloquear el event loop
+    await asyncio.to_thread(close_lead_job_executor)
+    close_opportunity_detail_catalog()
+    leads_index = get_opportunity_leads_index()
+    if leads_index is not None:
+        logging.info(f"Índice de OpportunityLeads: {leads_index.stats()}")
+    close_opportunity_leads_index()
+    logging.info(f"Cerrando pool de SQL Server: {get_sql_pool().stats()}")
+    logging.info(f"Costo de Cosmos DB por método de repositorio: {cosmos_operation_stats()}")
+    logging.info(f"Lecturas coalescidas por método de repositorio: {single_flight_stats()}")
+    user_cache = get_user_identity_cache()
+    if user_cache is not None:
+        logging.info(f"Cache de usuarios: {user_cache.stats()}")
+    close_sql_executor()
+    close_sql_pool()
+    close_cosmos_adapter()
+    await close_async_cosmos_adapter()
+
+
 app = FastAPI(
     title="Market DALI",
     description="API for Market DALI",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
-app.include_router(opportunity_leads_router.router)
-app.include_router(opportunity_detail_router.router)
-app.include_router(opportunity_summary_router.router)
-app.include_router(lead_router.router)
\ No newline at end of file
+app.add_middleware(PrometheusMiddleware)
+app.include_router(metrics_router)
+app.include_router(health_router.router)
+
+for module in (opportunity_leads_router, opportunity_detail_router, opportunity_summary_router, lead_router):
+    app.include_router(module.async_router if settings.ASYNC_STACK_ENABLED else module.router)
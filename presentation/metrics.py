@@ -0,0 +1,127 @@
+# presentation/metrics.py
+import time
+
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Gauge, generate_latest
+
+from core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUEST_ERRORS, HTTP_REQUESTS_IN_FLIGHT
+from core.single_flight import single_flight_stats
+from infrastructure.adapters.azure_auth_adapter import get_azure_auth_adapter
+from infrastructure.adapters.sql_server_adapter import get_sql_pool
+from infrastructure.repositories.opportunity_detail_catalog import get_opportunity_detail_catalog
+from infrastructure.repositories.opportunity_leads_index import get_opportunity_leads_index
+from infrastructure.repositories.user_cache import get_user_identity_cache
+
+SQL_POOL_CONNECTIONS = Gauge(
+    "sql_pool_connections",
+    "Conexiones del pool de SQL Server por estado.",
+    ["state"],
+)
+SQL_POOL_TIMEOUTS = Gauge(
+    "sql_pool_timeouts",
+    "Esperas por conexión SQL que agotaron el tiempo desde el arranque.",
+)
+CACHE_ENTRIES = Gauge(
+    "app_cache_entries",
+    "Entradas en los caches en proceso.",
+    ["cache"],
+)
+CACHE_HIT_RATIO = Gauge(
+    "app_cache_hit_ratio",
+    "Tasa de aciertos de los caches en proceso desde el arranque.",
+    ["cache"],
+)
+SINGLE_FLIGHT_COALESCING_RATIO = Gauge(
+    "single_flight_coalescing_ratio",
+    "Fracción de llamadas que reutilizaron una lectura idéntica en curso, desde el arranque.",
+    ["operation"],
+)
+OPPORTUNITY_LEADS_INDEX_LAG = Gauge(
+    "opportunity_leads_index_lag_seconds",
+    "Segundos desde la última sincronización del índice de OpportunityLeads con el change feed.",
+)
+
+
+class PrometheusMiddleware:
+    """
+    Middleware ASGI que mide la latencia por ruta, las peticiones en curso y los
+    errores. La ruta se etiqueta con su plantilla (/opportunity-summary/{agte_id})
+    para mantener acotada la cardinalidad.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUEST_DURATION.labels(method, route_path, str(status_code)).observe(time.perf_counter() - start)
+            if status_code >= 500:
+                HTTP_REQUEST_ERRORS.labels(method, route_path).inc()
+
+
+def _record_cache(name: str, stats: dict) -> None:
+    CACHE_ENTRIES.labels(name).set(stats["size"])
+    CACHE_HIT_RATIO.labels(name).set(stats["hit_rate"])
+
+
+def collect_snapshot_metrics() -> None:
+    """Copia a gauges el estado actual del pool SQL y de los caches en proceso."""
+    pool = get_sql_pool().stats()
+    for state in ("in_use", "idle", "waiting"):
+        SQL_POOL_CONNECTIONS.labels(state).set(pool[state])
+    SQL_POOL_TIMEOUTS.set(pool["timeouts"])
+
+    auth = get_azure_auth_adapter().stats()
+    _record_cache("verified_tokens", auth["verified_tokens"])
+    jwks = auth["jwks"]
+    lookups = jwks["hits"] + jwks["misses"]
+    CACHE_ENTRIES.labels("jwks").set(jwks["keys"])
+    CACHE_HIT_RATIO.labels("jwks").set(jwks["hits"] / lookups if lookups else 0.0)
+
+    user_cache = get_user_identity_cache()
+    if user_cache is not None:
+        user_stats = user_cache.stats()
+        _record_cache("user_by_email", user_stats["by_email"])
+        _record_cache("user_exists", user_stats["exists"])
+
+    catalog = get_opportunity_detail_catalog()
+    if catalog is not None:
+        CACHE_ENTRIES.labels("opportunity_detail_catalog").set(len(catalog))
+
+    leads_index = get_opportunity_leads_index()
+    if leads_index is not None:
+        CACHE_ENTRIES.labels("opportunity_leads_index").set(len(leads_index))
+        if leads_index.lag is not None:
+            OPPORTUNITY_LEADS_INDEX_LAG.set(leads_index.lag)
+    for operation, stats in single_flight_stats().items():
+        SINGLE_FLIGHT_COALESCING_RATIO.labels(operation).set(stats["coalescing_ratio"])
+
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Métricas en formato de texto de Prometheus."""
+    collect_snapshot_metrics()
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
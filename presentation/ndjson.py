@@ -0,0 +1,23 @@
+# presentation/ndjson.py
+from typing import AsyncIterable, Iterable
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def ndjson_response(items: Iterable[BaseModel]) -> StreamingResponse:
+    """Serializa cada documento a medida que llega del feed, una línea JSON por elemento."""
+    def _lines():
+        for item in items:
+            yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(_lines(), media_type=NDJSON_MEDIA_TYPE)
+
+
+def async_ndjson_response(items: AsyncIterable[BaseModel]) -> StreamingResponse:
+    async def _lines():
+        async for item in items:
+            yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(_lines(), media_type=NDJSON_MEDIA_TYPE)
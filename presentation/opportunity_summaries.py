@@ -0,0 +1,76 @@
+# presentation/opportunity_summaries.py
+from typing import List, Optional
+
+from core.settings import settings
+from application.ports.opportunity_leads_repository_port import OpportunityLeadsRepositoryPort
+from application.services.opportunity_summary_service import AsyncOpportunitySummaryService, OpportunitySummaryService
+from application.services.opportunity_summary_store_service import AsyncOpportunitySummaryMaintainer, OpportunitySummaryMaintainer
+from domain.models.opportunity_detail import OpportunityDetail
+from infrastructure.adapters.async_cosmos_adapter import AsyncCosmosAdapter
+from infrastructure.adapters.cosmos_adapter import CosmosAdapter, get_cosmos_session
+from infrastructure.repositories.async_opportunity_detail_repository import AsyncOpportunityDetailRepository
+from infrastructure.repositories.async_opportunity_summary_store_repository import AsyncOpportunitySummaryStoreRepository
+from infrastructure.repositories.opportunity_detail_catalog import get_opportunity_detail_repository
+from infrastructure.repositories.opportunity_leads_index import get_opportunity_leads_index
+from infrastructure.repositories.opportunity_leads_layout import (
+    AsyncOpportunityLeadsStorage,
+    OpportunityLeadsStorage,
+    create_async_opportunity_leads_repository,
+    create_opportunity_leads_repository,
+)
+from infrastructure.repositories.opportunity_summary_store_repository import OpportunitySummaryStoreRepository
+
+
+def get_opportunity_summary_maintainer(session: CosmosAdapter) -> Optional[OpportunitySummaryMaintainer]:
+    """Mantenedor del resumen materializado, o None si el almacén está desactivado."""
+    if not settings.OPPORTUNITY_SUMMARY_STORE_ENABLED:
+        return None
+    opportunity_detail_repo = get_opportunity_detail_repository(session)
+    return OpportunitySummaryMaintainer(
+        OpportunitySummaryStoreRepository(session),
+        OpportunitySummaryService(opportunity_detail_repo, create_opportunity_leads_repository(session)),
+        opportunity_detail_repo,
+    )
+
+
+def get_async_opportunity_summary_maintainer(session: AsyncCosmosAdapter) -> Optional[AsyncOpportunitySummaryMaintainer]:
+    if not settings.OPPORTUNITY_SUMMARY_STORE_ENABLED:
+        return None
+    opportunity_detail_repo = AsyncOpportunityDetailRepository(session)
+    return AsyncOpportunitySummaryMaintainer(
+        AsyncOpportunitySummaryStoreRepository(session),
+        AsyncOpportunitySummaryService(opportunity_detail_repo, create_async_opportunity_leads_repository(session)),
+        opportunity_detail_repo,
+    )
+
+
+def build_opportunity_leads_repository(session: CosmosAdapter) -> OpportunityLeadsStorage:
+    """Repositorio de OpportunityLeads que propaga sus actualizaciones al resumen materializado."""
+    maintainer = get_opportunity_summary_maintainer(session)
+    return create_opportunity_leads_repository(
+        session,
+        on_update=maintainer.apply_opportunity_change if maintainer is not None else None,
+    )
+
+
+def get_opportunity_leads_repository(session: CosmosAdapter) -> OpportunityLeadsRepositoryPort:
+    """Repositorio de OpportunityLeads a usar: el índice en memoria si está activo, si no Cosmos."""
+    index = get_opportunity_leads_index()
+    if index is not None:
+        return index
+    return build_opportunity_leads_repository(session)
+
+
+def get_async_opportunity_leads_repository(session: AsyncCosmosAdapter) -> AsyncOpportunityLeadsStorage:
+    maintainer = get_async_opportunity_summary_maintainer(session)
+    return create_async_opportunity_leads_repository(
+        session,
+        on_update=maintainer.apply_opportunity_change if maintainer is not None else None,
+    )
+
+
+def apply_opportunity_detail_changes(details: List[OpportunityDetail]) -> None:
+    """Callback del catálogo de Details: lleva los cambios del change feed al resumen materializado."""
+    maintainer = get_opportunity_summary_maintainer(get_cosmos_session())
+    if maintainer is not None:
+        maintainer.apply_detail_changes(details)
@@ -0,0 +1,20 @@
+# presentation/routers/health_router.py
+from fastapi import APIRouter, Response, status
+from presentation.warmup import get_warmup_state
+
+router = APIRouter(tags=["Health"])
+
+
+@router.get("/live")
+def live():
+    """El proceso está vivo y atiende peticiones, aunque el calentamiento no haya terminado."""
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+def ready(response: Response):
+    """Listo para recibir tráfico solo cuando terminó el calentamiento de arranque."""
+    state = get_warmup_state()
+    if not state.finished:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "ready" if state.finished else "warming_up", **state.as_dict()}
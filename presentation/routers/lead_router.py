@@ -1,18 +1,29 @@
 # presentation/routers/lead_router.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import List
 
-from application.services.lead_service import LeadService
+from core.settings import settings
+from application.services.lead_job_service import LeadJobService
+from application.services.lead_service import AsyncLeadService, LeadService
 from domain.models.lead import Lead
+from domain.models.lead_conversion_job import LeadConversionJob
+from domain.models.opportunity_conversion_result import OpportunityConversionResult
 from infrastructure.adapters.sql_server_adapter import SqlServerAdapter, get_sql_server_session
 from infrastructure.adapters.cosmos_adapter import CosmosAdapter, get_cosmos_session
-from infrastructure.adapters.azure_auth_adapter import AzureAuthAdapter
-from infrastructure.repositories.opportunity_leads_repository import OpportunityLeadsRepository
+from infrastructure.adapters.azure_auth_adapter import get_async_azure_auth_adapter, get_azure_auth_adapter
+from infrastructure.adapters.async_cosmos_adapter import AsyncCosmosAdapter, get_async_cosmos_session
+from infrastructure.adapters.async_sql_server_adapter import AsyncSqlServerAdapter, get_async_sql_server_session
+from infrastructure.repositories.async_lead_repository import AsyncLeadRepository
+from infrastructure.repositories.async_user_repository import AsyncUserRepository
 from infrastructure.repositories.lead_repository import LeadRepository
 from infrastructure.repositories.user_repository import UserRepository
+from presentation.lead_jobs import get_lead_job_service
+from presentation.opportunity_summaries import get_async_opportunity_leads_repository, get_opportunity_leads_repository
 
 router = APIRouter(prefix="/leads", tags=["Leads"])
+async_router = APIRouter(prefix="/leads", tags=["Leads"])
 security = HTTPBearer()
 
 
@@ -21,7 +32,7 @@ def get_lead_service(
     cosmos: CosmosAdapter = Depends(get_cosmos_session),
 ) -> LeadService:
     # Repositorio para leer OpportunityLeads desde Cosmos
-    opportunity_leads_repo = OpportunityLeadsRepository(cosmos)
+    opportunity_leads_repo = get_opportunity_leads_repository(cosmos)
 
     # Repositorio para guardar Leads en SQL Server
     lead_repo = LeadRepository(sql)
@@ -30,9 +41,13 @@ def get_lead_service(
     user_repo = UserRepository(sql)
 
     # Adaptador de autenticación (AuthPort implementation)
-    auth_adapter = AzureAuthAdapter()
+    auth_adapter = get_azure_auth_adapter()
 
-    return LeadService(lead_repo, opportunity_leads_repo, user_repo, auth_adapter)
+    return LeadService(
+        lead_repo, opportunity_leads_repo, user_repo, auth_adapter,
+        max_concurrency=settings.LEAD_BULK_MAX_CONCURRENCY,
+        claim_lease=settings.LEAD_CONVERSION_CLAIM_LEASE_SECONDS,
+    )
 
 
 @router.post("/from-opportunity", response_model=List[Lead])
@@ -49,5 +64,114 @@ def create_leads_from_opportunity(
         token = credentials.credentials
         leads = service.create_leads_from_opportunity(opportunity_id, token)
         return leads
+    except HTTPException:
+        # Errores de negocio (404, 409, ...) llegan al cliente con su propio status
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/from-opportunities", response_model=List[OpportunityConversionResult])
+def create_leads_from_opportunities(
+    opportunity_ids: List[int] = Body(..., min_length=1),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    service: LeadService = Depends(get_lead_service),
+):
+    """
+    Crea leads para varias oportunidades en una sola llamada y devuelve el
+    resultado de cada oportunidad por separado.
+    """
+    return service.create_leads_from_opportunities(opportunity_ids, credentials.credentials)
+
+
+@router.post("/jobs", response_model=LeadConversionJob, status_code=status.HTTP_202_ACCEPTED)
+def start_lead_job(
+    opportunity_id: int,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    service: LeadJobService = Depends(get_lead_job_service),
+):
+    """
+    Encola la conversión de los leads de una oportunidad y responde de inmediato
+    con el job; el avance se consulta en GET /leads/jobs/{job_id}.
+    """
+    return service.start_job(opportunity_id, credentials.credentials)
+
+
+@router.get("/jobs/{job_id}", response_model=LeadConversionJob)
+def get_lead_job(
+    job_id: str,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    service: LeadJobService = Depends(get_lead_job_service),
+):
+    """Estado y avance de un job de conversión de leads creado por el usuario autenticado."""
+    return service.get_job(job_id, credentials.credentials)
+
+
+def get_async_lead_service(
+    sql: AsyncSqlServerAdapter = Depends(get_async_sql_server_session),
+    cosmos: AsyncCosmosAdapter = Depends(get_async_cosmos_session),
+) -> AsyncLeadService:
+    return AsyncLeadService(
+        AsyncLeadRepository(sql),
+        get_async_opportunity_leads_repository(cosmos),
+        AsyncUserRepository(sql),
+        get_async_azure_auth_adapter(),
+        max_concurrency=settings.LEAD_BULK_MAX_CONCURRENCY,
+        claim_lease=settings.LEAD_CONVERSION_CLAIM_LEASE_SECONDS,
+    )
+
+
+@async_router.post("/from-opportunity", response_model=List[Lead])
+async def create_leads_from_opportunity_async(
+    opportunity_id: int,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    service: AsyncLeadService = Depends(get_async_lead_service),
+):
+    """
+    Crea leads en SQL Server a partir de los OpportunityLeads almacenados en Cosmos.
+    El usuario autenticado se obtiene del token JWT de Azure.
+    """
+    try:
+        token = credentials.credentials
+        return await service.create_leads_from_opportunity(opportunity_id, token)
+    except HTTPException:
+        # Errores de negocio (404, 409, ...) llegan al cliente con su propio status
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@async_router.post("/from-opportunities", response_model=List[OpportunityConversionResult])
+async def create_leads_from_opportunities_async(
+    opportunity_ids: List[int] = Body(..., min_length=1),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    service: AsyncLeadService = Depends(get_async_lead_service),
+):
+    """
+    Crea leads para varias oportunidades en una sola llamada y devuelve el
+    resultado de cada oportunidad por separado.
+    """
+    return await service.create_leads_from_opportunities(opportunity_ids, credentials.credentials)
+
+
+@async_router.post("/jobs", response_model=LeadConversionJob, status_code=status.HTTP_202_ACCEPTED)
+async def start_lead_job_async(
+    opportunity_id: int,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    service: LeadJobService = Depends(get_lead_job_service),
+):
+    """
+    Encola la conversión de los leads de una oportunidad y responde de inmediato
+    con el job; el avance se consulta en GET /leads/jobs/{job_id}.
+    """
+    return await run_in_threadpool(service.start_job, opportunity_id, credentials.credentials)
+
+
+@async_router.get("/jobs/{job_id}", response_model=LeadConversionJob)
+async def get_lead_job_async(
+    job_id: str,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    service: LeadJobService = Depends(get_lead_job_service),
+):
+    """Estado y avance de un job de conversión de leads creado por el usuario autenticado."""
+    return await run_in_threadpool(service.get_job, job_id, credentials.credentials)
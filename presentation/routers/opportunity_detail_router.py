@@ -1,21 +1,79 @@
 # presentation/routers/opportunity_detail_router.py
-from fastapi import APIRouter, Depends
-from domain.models.opportunity_detail import OpportunityDetail
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
+from core.settings import settings
+from domain.models.opportunity_detail import OPPORTUNITY_DETAIL, OPPORTUNITY_DETAIL_LIST, OpportunityDetail
+from domain.models.page import Page
 from infrastructure.adapters.cosmos_adapter import get_cosmos_session, CosmosAdapter
-from infrastructure.repositories.opportunity_detail_repository import OpportunityDetailRepository
-from application.services.opportunity_detail_service import OpportunityDetailService
+from infrastructure.repositories.opportunity_detail_catalog import get_opportunity_detail_repository
+from infrastructure.adapters.async_cosmos_adapter import AsyncCosmosAdapter, get_async_cosmos_session
+from infrastructure.repositories.async_opportunity_detail_repository import AsyncOpportunityDetailRepository
+from application.services.opportunity_detail_service import AsyncOpportunityDetailService, OpportunityDetailService
+from presentation.conditional import conditional_json_response, details_etag
+from presentation.ndjson import async_ndjson_response, ndjson_response
 
 router = APIRouter(prefix="/opportunity-detail", tags=["Opportunity Details"])
+async_router = APIRouter(prefix="/opportunity-detail", tags=["Opportunity Details"])
 
 
 def get_opportunity_detail_service(session: CosmosAdapter = Depends(get_cosmos_session)):
-    repo = OpportunityDetailRepository(session)
+    repo = get_opportunity_detail_repository(session)
     return OpportunityDetailService(repo)
 
+def details_response(request: Request, details: list[OpportunityDetail]):
+    return conditional_json_response(
+        request, OPPORTUNITY_DETAIL_LIST, details,
+        settings.CACHE_CONTROL_OPPORTUNITY_DETAIL_LIST, details_etag(details),
+    )
+
+def detail_response(request: Request, detail: Optional[OpportunityDetail]):
+    if detail is None:
+        return None
+    return conditional_json_response(
+        request, OPPORTUNITY_DETAIL, detail,
+        settings.CACHE_CONTROL_OPPORTUNITY_DETAIL, details_etag([detail]),
+    )
+
 @router.get("/", response_model=list[OpportunityDetail])
-def list_details(service: OpportunityDetailService = Depends(get_opportunity_detail_service)):
-    return service.list_details()
+def list_details(request: Request, service: OpportunityDetailService = Depends(get_opportunity_detail_service)):
+    return details_response(request, service.list_details())
+
+@router.get("/page", response_model=Page[OpportunityDetail])
+def list_details_page(
+    page_size: int = Query(100, ge=1, le=1000),
+    continuation: Optional[str] = None,
+    service: OpportunityDetailService = Depends(get_opportunity_detail_service),
+):
+    return service.list_details_page(page_size, continuation)
+
+@router.get("/export")
+def export_details(service: OpportunityDetailService = Depends(get_opportunity_detail_service)):
+    return ndjson_response(service.iter_details())
 
 @router.get("/{opportunity_id}", response_model=OpportunityDetail)
-def get_detail_by_opportunity_id(opportunity_id: int, service: OpportunityDetailService = Depends(get_opportunity_detail_service)):
-    return service.get_detail_by_opportunity_id(opportunity_id)
\ No newline at end of file
+def get_detail_by_opportunity_id(opportunity_id: int, request: Request, service: OpportunityDetailService = Depends(get_opportunity_detail_service)):
+    return detail_response(request, service.get_detail_by_opportunity_id(opportunity_id))
+
+
+def get_async_opportunity_detail_service(session: AsyncCosmosAdapter = Depends(get_async_cosmos_session)):
+    return AsyncOpportunityDetailService(AsyncOpportunityDetailRepository(session))
+
+@async_router.get("/", response_model=list[OpportunityDetail])
+async def list_details_async(request: Request, service: AsyncOpportunityDetailService = Depends(get_async_opportunity_detail_service)):
+    return details_response(request, await service.list_details())
+
+@async_router.get("/page", response_model=Page[OpportunityDetail])
+async def list_details_page_async(
+    page_size: int = Query(100, ge=1, le=1000),
+    continuation: Optional[str] = None,
+    service: AsyncOpportunityDetailService = Depends(get_async_opportunity_detail_service),
+):
+    return await service.list_details_page(page_size, continuation)
+
+@async_router.get("/export")
+async def export_details_async(service: AsyncOpportunityDetailService = Depends(get_async_opportunity_detail_service)):
+    return async_ndjson_response(service.iter_details())
+
+@async_router.get("/{opportunity_id}", response_model=OpportunityDetail)
+async def get_detail_by_opportunity_id_async(opportunity_id: int, request: Request, service: AsyncOpportunityDetailService = Depends(get_async_opportunity_detail_service)):
+    return detail_response(request, await service.get_detail_by_opportunity_id(opportunity_id))
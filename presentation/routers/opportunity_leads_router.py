@@ -1,21 +1,85 @@
 # presentation/routers/opportunity_leads_router.py
-from fastapi import APIRouter, Depends
-from domain.models.opportunity_leads import OpportunityLeads
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from domain.models.opportunity_lead import OpportunityLead
+from domain.models.opportunity_leads import OPPORTUNITY_LEADS_LIST, OpportunityLeads
+from domain.models.page import Page
 from infrastructure.adapters.cosmos_adapter import get_cosmos_session, CosmosAdapter
-from infrastructure.repositories.opportunity_leads_repository import OpportunityLeadsRepository
-from application.services.opportunity_leads_service import OpportunityLeadsService
+from infrastructure.adapters.async_cosmos_adapter import AsyncCosmosAdapter, get_async_cosmos_session
+from infrastructure.repositories.opportunity_leads_layout import create_async_opportunity_leads_repository
+from application.services.opportunity_leads_service import AsyncOpportunityLeadsService, OpportunityLeadsService
+from presentation.json_response import json_bytes_response
+from presentation.ndjson import async_ndjson_response, ndjson_response
+from presentation.opportunity_summaries import get_opportunity_leads_repository
 
 router = APIRouter(prefix="/opportunity-leads", tags=["Opportunity Leads"])
+async_router = APIRouter(prefix="/opportunity-leads", tags=["Opportunity Leads"])
 
 
 def get_leads_service(session: CosmosAdapter = Depends(get_cosmos_session)):
-    repo = OpportunityLeadsRepository(session)
+    repo = get_opportunity_leads_repository(session)
     return OpportunityLeadsService(repo)
 
 @router.get("/", response_model=list[OpportunityLeads])
 def list_leads(service: OpportunityLeadsService = Depends(get_leads_service)):
-    return service.list_leads()
+    return json_bytes_response(OPPORTUNITY_LEADS_LIST, service.list_leads())
+
+@router.get("/page", response_model=Page[OpportunityLeads])
+def list_leads_page(
+    page_size: int = Query(100, ge=1, le=1000),
+    continuation: Optional[str] = None,
+    service: OpportunityLeadsService = Depends(get_leads_service),
+):
+    return service.list_leads_page(page_size, continuation)
+
+@router.get("/export")
+def export_leads(service: OpportunityLeadsService = Depends(get_leads_service)):
+    return ndjson_response(service.iter_leads())
 
 @router.get("/{agte_id}", response_model=list[OpportunityLeads])
 def get_leads_by_agte_id(agte_id: int, service: OpportunityLeadsService = Depends(get_leads_service)):
-    return service.get_leads_by_agte_id(agte_id)
+    return json_bytes_response(OPPORTUNITY_LEADS_LIST, service.get_leads_by_agte_id(agte_id))
+
+@router.get("/{agte_id}/{opportunity_id}/leads", response_model=Page[OpportunityLead])
+def get_opportunity_leads_page(
+    agte_id: int,
+    opportunity_id: int,
+    page_size: int = Query(100, ge=1, le=1000),
+    continuation: Optional[str] = None,
+    service: OpportunityLeadsService = Depends(get_leads_service),
+):
+    return service.get_opportunity_leads_page(agte_id, opportunity_id, page_size, continuation)
+
+
+def get_async_leads_service(session: AsyncCosmosAdapter = Depends(get_async_cosmos_session)):
+    return AsyncOpportunityLeadsService(create_async_opportunity_leads_repository(session))
+
+@async_router.get("/", response_model=list[OpportunityLeads])
+async def list_leads_async(service: AsyncOpportunityLeadsService = Depends(get_async_leads_service)):
+    return json_bytes_response(OPPORTUNITY_LEADS_LIST, await service.list_leads())
+
+@async_router.get("/page", response_model=Page[OpportunityLeads])
+async def list_leads_page_async(
+    page_size: int = Query(100, ge=1, le=1000),
+    continuation: Optional[str] = None,
+    service: AsyncOpportunityLeadsService = Depends(get_async_leads_service),
+):
+    return await service.list_leads_page(page_size, continuation)
+
+@async_router.get("/export")
+async def export_leads_async(service: AsyncOpportunityLeadsService = Depends(get_async_leads_service)):
+    return async_ndjson_response(service.iter_leads())
+
+@async_router.get("/{agte_id}", response_model=list[OpportunityLeads])
+async def get_leads_by_agte_id_async(agte_id: int, service: AsyncOpportunityLeadsService = Depends(get_async_leads_service)):
+    return json_bytes_response(OPPORTUNITY_LEADS_LIST, await service.get_leads_by_agte_id(agte_id))
+
+@async_router.get("/{agte_id}/{opportunity_id}/leads", response_model=Page[OpportunityLead])
+async def get_opportunity_leads_page_async(
+    agte_id: int,
+    opportunity_id: int,
+    page_size: int = Query(100, ge=1, le=1000),
+    continuation: Optional[str] = None,
+    service: AsyncOpportunityLeadsService = Depends(get_async_leads_service),
+):
+    return await service.get_opportunity_leads_page(agte_id, opportunity_id, page_size, continuation)
@@ -1,19 +1,52 @@
 # presentation/routers/opportunity_summary_router.py
-from fastapi import APIRouter, Depends
-from application.services.opportunity_summary_service import OpportunitySummaryService
-from domain.models.opportunity_summary import OpportunitySummary
+from fastapi import APIRouter, Depends, Request
+from core.settings import settings
+from application.services.opportunity_summary_service import AsyncOpportunitySummaryService, OpportunitySummaryService
+from application.services.opportunity_summary_store_service import AsyncMaterializedOpportunitySummaryService, MaterializedOpportunitySummaryService
+from domain.models.opportunity_summary import OPPORTUNITY_SUMMARY_LIST, OpportunitySummary
 from infrastructure.adapters.cosmos_adapter import get_cosmos_session, CosmosAdapter
-from infrastructure.repositories.opportunity_detail_repository import OpportunityDetailRepository
-from infrastructure.repositories.opportunity_leads_repository import OpportunityLeadsRepository
+from infrastructure.repositories.opportunity_detail_catalog import get_opportunity_detail_repository
+from infrastructure.adapters.async_cosmos_adapter import AsyncCosmosAdapter, get_async_cosmos_session
+from infrastructure.repositories.async_opportunity_detail_repository import AsyncOpportunityDetailRepository
+from infrastructure.repositories.opportunity_leads_layout import create_async_opportunity_leads_repository
+from infrastructure.repositories.async_opportunity_summary_store_repository import AsyncOpportunitySummaryStoreRepository
+from infrastructure.repositories.opportunity_summary_store_repository import OpportunitySummaryStoreRepository
+from presentation.conditional import conditional_json_response
+from presentation.opportunity_summaries import get_async_opportunity_summary_maintainer, get_opportunity_leads_repository, get_opportunity_summary_maintainer
 
 router = APIRouter(prefix="/opportunity-summary", tags=["Opportunity Summary"])
+async_router = APIRouter(prefix="/opportunity-summary", tags=["Opportunity Summary"])
 
 
 def get_opportunity_simmary_service(session: CosmosAdapter = Depends(get_cosmos_session)):
-    opportunity_detail_repo = OpportunityDetailRepository(session)
-    opportunity_leads_repo = OpportunityLeadsRepository(session)
+    maintainer = get_opportunity_summary_maintainer(session)
+    if maintainer is not None:
+        return MaterializedOpportunitySummaryService(
+            OpportunitySummaryStoreRepository(session), maintainer, settings.OPPORTUNITY_SUMMARY_MAX_AGE_SECONDS
+        )
+    opportunity_detail_repo = get_opportunity_detail_repository(session)
+    opportunity_leads_repo = get_opportunity_leads_repository(session)
     return OpportunitySummaryService(opportunity_detail_repo, opportunity_leads_repo)
 
 @router.get("/{agte_id}", response_model=list[OpportunitySummary])
-def list_opportunity_summary_by_agte_id(agte_id: int, service: OpportunitySummaryService = Depends(get_opportunity_simmary_service)):
-    return service.list_opportunity_summary_by_agte_id(agte_id)
\ No newline at end of file
+def list_opportunity_summary_by_agte_id(agte_id: int, request: Request, service: OpportunitySummaryService | MaterializedOpportunitySummaryService = Depends(get_opportunity_simmary_service)):
+    return conditional_json_response(
+        request, OPPORTUNITY_SUMMARY_LIST, service.list_opportunity_summary_by_agte_id(agte_id),
+        settings.CACHE_CONTROL_OPPORTUNITY_SUMMARY,
+    )
+
+
+def get_async_opportunity_summary_service(session: AsyncCosmosAdapter = Depends(get_async_cosmos_session)):
+    maintainer = get_async_opportunity_summary_maintainer(session)
+    if maintainer is not None:
+        return AsyncMaterializedOpportunitySummaryService(
+            AsyncOpportunitySummaryStoreRepository(session), maintainer, settings.OPPORTUNITY_SUMMARY_MAX_AGE_SECONDS
+        )
+    return AsyncOpportunitySummaryService(AsyncOpportunityDetailRepository(session), create_async_opportunity_leads_repository(session))
+
+@async_router.get("/{agte_id}", response_model=list[OpportunitySummary])
+async def list_opportunity_summary_by_agte_id_async(agte_id: int, request: Request, service: AsyncOpportunitySummaryService | AsyncMaterializedOpportunitySummaryService = Depends(get_async_opportunity_summary_service)):
+    return conditional_json_response(
+        request, OPPORTUNITY_SUMMARY_LIST, await service.list_opportunity_summary_by_agte_id(agte_id),
+        settings.CACHE_CONTROL_OPPORTUNITY_SUMMARY,
+    )
@@ -0,0 +1,194 @@
+# presentation/warmup.py
+import asyncio
+import logging
+import threading
+import time
+from contextlib import suppress
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable, List, Optional
+
+from core.settings import settings
+from infrastructure.adapters.async_cosmos_adapter import AsyncCosmosAdapter
+from infrastructure.adapters.async_sql_server_adapter import get_async_sql_server_session
+from infrastructure.adapters.azure_auth_adapter import get_azure_auth_adapter
+from infrastructure.adapters.cosmos_adapter import CosmosAdapter, configured_containers
+from infrastructure.adapters.sql_server_adapter import get_sql_pool, get_sql_server_session
+from infrastructure.repositories.async_lead_repository import AsyncLeadRepository
+from infrastructure.repositories.async_opportunity_detail_repository import AsyncOpportunityDetailRepository
+from infrastructure.repositories.async_opportunity_summary_store_repository import AsyncOpportunitySummaryStoreRepository
+from infrastructure.repositories.lead_repository import LeadRepository
+from infrastructure.repositories.opportunity_detail_catalog import init_opportunity_detail_catalog
+from infrastructure.repositories.opportunity_detail_repository import OpportunityDetailRepository
+from infrastructure.repositories.opportunity_leads_index import init_opportunity_leads_index
+from infrastructure.repositories.opportunity_leads_layout import create_async_opportunity_leads_repository, create_opportunity_leads_repository
+from infrastructure.repositories.opportunity_summary_store_repository import OpportunitySummaryStoreRepository
+from presentation.lead_jobs import resume_lead_jobs
+from presentation.opportunity_summaries import apply_opportunity_detail_changes, build_opportunity_leads_repository
+
+# Valores que no existen: las consultas de calentamiento solo abren conexiones y cachean planes
+WARMUP_AGENT_ID = -1
+WARMUP_OPPORTUNITY_ID = -1
+WARMUP_LEAD_ID = "00000000-0000-0000-0000-000000000000"
+
+
+@dataclass
+class WarmupStep:
+    name: str
+    duration_ms: float
+    ok: bool
+    error: Optional[str] = None
+
+
+@dataclass
+class WarmupState:
+    """Avance del calentamiento de arranque; /ready responde OK cuando termina."""
+    started: bool = False
+    finished: bool = False
+    duration_ms: float = 0.0
+    steps: List[WarmupStep] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+_state = WarmupState()
+# El cierre de la aplicación lo activa: los pasos que aún no empezaron ya no se ejecutan
+_stopping = threading.Event()
+# Paso bloqueante en curso; el cierre lo espera antes de cerrar las dependencias que usa
+_in_flight: Optional[asyncio.Future] = None
+
+
+def get_warmup_state() -> WarmupState:
+    return _state
+
+
+async def _run_step(name: str, step: Callable[[], Awaitable]) -> None:
+    """Ejecuta el paso; el paso se arma dentro del try para que un error al crearlo también quede registrado."""
+    start = time.perf_counter()
+    try:
+        await step()
+        ok, error = True, None
+    except Exception as e:
+        ok, error = False, str(getattr(e, "detail", e))
+    duration_ms = round((time.perf_counter() - start) * 1000, 3)
+    _state.steps.append(WarmupStep(name=name, duration_ms=duration_ms, ok=ok, error=error))
+    if ok:
+        logging.info(f"Calentamiento: {name} en {duration_ms} ms.")
+    else:
+        logging.warning(f"Calentamiento: {name} falló en {duration_ms} ms: {error}")
+
+
+def _in_thread(func: Callable[[], object]) -> Callable[[], Awaitable]:
+    """
+    Paso bloqueante ejecutado fuera del event loop, para que /live siga respondiendo.
+    Cancelar el calentamiento no detiene el hilo: queda en _in_flight para que el cierre
+    lo espere, y si el cierre ya empezó el paso no se ejecuta.
+    """
+    def guarded():
+        if _stopping.is_set():
+            raise RuntimeError("La aplicación se está cerrando.")
+        return func()
+
+    async def step():
+        global _in_flight
+        _in_flight = asyncio.ensure_future(asyncio.to_thread(guarded))
+        await asyncio.shield(_in_flight)
+
+    return step
+
+
+def _common_steps() -> list:
+    steps = [("sql_pool", _in_thread(lambda: get_sql_pool().open()))]
+    if settings.AZURE_TENANT_ID:
+        steps.append(("azure_ad_jwks", _in_thread(lambda: get_azure_auth_adapter().signing_keys.warm())))
+    return steps
+
+
+def _sync_steps(cosmos: CosmosAdapter) -> list:
+    steps = _common_steps()
+    for container_name, partition_key in configured_containers().items():
+        steps.append((f"cosmos_container:{container_name}", _in_thread(
+            lambda name=container_name, key=partition_key: cosmos.get_container(name, key).read()
+        )))
+    if settings.OPPORTUNITY_DETAIL_CACHE_ENABLED:
+        steps.append(("opportunity_detail_catalog", _in_thread(lambda: init_opportunity_detail_catalog(
+            cosmos,
+            apply_opportunity_detail_changes if settings.OPPORTUNITY_SUMMARY_STORE_ENABLED else None,
+        ))))
+    if settings.OPPORTUNITY_LEADS_INDEX_ENABLED:
+        steps.append(("opportunity_leads_index", _in_thread(
+            lambda: init_opportunity_leads_index(build_opportunity_leads_repository(cosmos))
+        )))
+    if settings.WARMUP_QUERIES_ENABLED:
+        steps += [
+            ("query:OpportunityLeadsRepository", _in_thread(
+                lambda: create_opportunity_leads_repository(cosmos).get_lead_counts_by_agte_id(WARMUP_AGENT_ID)
+            )),
+            ("query:OpportunityDetailRepository", _in_thread(
+                lambda: OpportunityDetailRepository(cosmos).get_by_opportunity_id(WARMUP_OPPORTUNITY_ID)
+            )),
+            ("query:LeadRepository", _in_thread(
+                lambda: LeadRepository(get_sql_server_session()).get_existing_ids([WARMUP_LEAD_ID])
+            )),
+        ]
+        if settings.OPPORTUNITY_SUMMARY_STORE_ENABLED:
+            steps.append(("query:OpportunitySummaryStoreRepository", _in_thread(
+                lambda: OpportunitySummaryStoreRepository(cosmos).get(WARMUP_AGENT_ID)
+            )))
+    return steps
+
+
+def _async_steps(cosmos: AsyncCosmosAdapter) -> list:
+    steps = _common_steps()
+    for container_name, partition_key in configured_containers().items():
+        steps.append((
+            f"cosmos_container:{container_name}",
+            lambda name=container_name, key=partition_key: cosmos.get_container(name, key).read(),
+        ))
+    if settings.WARMUP_QUERIES_ENABLED:
+        steps += [
+            ("query:AsyncOpportunityLeadsRepository", lambda: create_async_opportunity_leads_repository(cosmos).get_lead_counts_by_agte_id(WARMUP_AGENT_ID)),
+            ("query:AsyncOpportunityDetailRepository", lambda: AsyncOpportunityDetailRepository(cosmos).get_by_opportunity_id(WARMUP_OPPORTUNITY_ID)),
+            ("query:AsyncLeadRepository", lambda: AsyncLeadRepository(get_async_sql_server_session()).get_existing_ids([WARMUP_LEAD_ID])),
+        ]
+        if settings.OPPORTUNITY_SUMMARY_STORE_ENABLED:
+            steps.append(("query:AsyncOpportunitySummaryStoreRepository", lambda: AsyncOpportunitySummaryStoreRepository(cosmos).get(WARMUP_AGENT_ID)))
+    return steps
+
+
+async def run_warmup(cosmos) -> WarmupState:
+    """
+    Establece y precalienta las dependencias (pool SQL, llaves de Azure AD, metadatos de
+    contenedores, catálogos en memoria) y lanza una consulta representativa por repositorio.
+    Un paso fallido se registra pero no detiene el resto: la dependencia se resolverá a demanda.
+    Al final se reanudan los jobs de conversión pendientes.
+    """
+    _stopping.clear()
+    _state.started, _state.finished = True, False
+    _state.steps.clear()
+    start = time.perf_counter()
+    try:
+        steps = _async_steps(cosmos) if isinstance(cosmos, AsyncCosmosAdapter) else _sync_steps(cosmos)
+        for name, step in steps:
+            await _run_step(name, step)
+        # Los jobs de conversión interrumpidos se reanudan con las dependencias ya listas
+        await _run_step("resume_lead_jobs", _in_thread(resume_lead_jobs))
+    finally:
+        # /ready no debe quedar esperando para siempre si el calentamiento se interrumpe
+        _state.duration_ms = round((time.perf_counter() - start) * 1000, 3)
+        _state.finished = True
+    failed = [step.name for step in _state.steps if not step.ok]
+    logging.info(f"Calentamiento terminado en {_state.duration_ms} ms" + (f"; pasos fallidos: {failed}" if failed else "."))
+    return _state
+
+
+async def stop_warmup(task: Optional[asyncio.Task]) -> None:
+    """Detiene el calentamiento al cerrar: cancela lo pendiente y espera el paso bloqueante en curso."""
+    _stopping.set()
+    if task is not None and not task.done():
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    if _in_flight is not None:
+        with suppress(Exception):
+            await _in_flight
@@ -0,0 +1,184 @@
+# scripts/cosmos_indexing.py
+"""
+Políticas de indexación declaradas de los contenedores de Cosmos DB.
+
+    python -m scripts.cosmos_indexing show                         # compara vigente vs declarada
+    python -m scripts.cosmos_indexing apply --container OpportunityLeads --wait
+    python -m scripts.cosmos_indexing measure --samples 50         # RU con la política por defecto vs la declarada
+
+measure copia una muestra de documentos a dos contenedores temporales (uno con la
+política por defecto y otro con la declarada), repite las escrituras y las consultas
+por las propiedades indexadas en ambos y reporta el costo promedio en RU. Los
+contenedores temporales se eliminan al terminar.
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from azure.cosmos import PartitionKey
+from core.logging_config import LogLevels, configure_logging
+from infrastructure.adapters.cosmos_adapter import CosmosAdapter, close_cosmos_adapter, configured_containers, init_cosmos_adapter
+from infrastructure.adapters.cosmos_diagnostics import cosmos_call
+from infrastructure.adapters.cosmos_indexing import indexing_policies, policy_matches
+
+TRANSFORMATION_PROGRESS_HEADER = "x-ms-documentdb-collection-index-transformation-progress"
+
+DEFAULT_POLICY = {
+    "indexingMode": "consistent",
+    "automatic": True,
+    "includedPaths": [{"path": "/*"}],
+    "excludedPaths": [],
+}
+
+
+def selected_containers(names: Optional[List[str]]) -> Dict[str, str]:
+    containers = configured_containers()
+    policies = indexing_policies()
+    return {
+        name: partition_key
+        for name, partition_key in containers.items()
+        if name in policies and (not names or name in names)
+    }
+
+
+def show(session: CosmosAdapter, containers: Dict[str, str]) -> int:
+    policies = indexing_policies()
+    differences = 0
+    for name in containers:
+        current = session.get_container(name).read().get("indexingPolicy")
+        if policy_matches(current, policies[name]):
+            print(f"{name}: la política vigente coincide con la declarada.")
+            continue
+        differences += 1
+        print(f"{name}: la política vigente difiere de la declarada.")
+        print(f"  vigente:   {json.dumps(current, ensure_ascii=False)}")
+        print(f"  declarada: {json.dumps(policies[name], ensure_ascii=False)}")
+    return 1 if differences else 0
+
+
+def transformation_progress(container) -> int:
+    headers = {}
+    container.read(populate_quota_info=True, response_hook=lambda response_headers, _: headers.update(response_headers))
+    return int(headers.get(TRANSFORMATION_PROGRESS_HEADER, 100))
+
+
+def apply(session: CosmosAdapter, containers: Dict[str, str], wait: bool) -> int:
+    policies = indexing_policies()
+    for name, partition_key in containers.items():
+        container = session.get_container(name)
+        properties = container.read()
+        if policy_matches(properties.get("indexingPolicy"), policies[name]):
+            print(f"{name}: sin cambios.")
+            continue
+        session.database.replace_container(
+            container,
+            partition_key=PartitionKey(path=partition_key),
+            indexing_policy=policies[name],
+            default_ttl=properties.get("defaultTtl"),
+        )
+        print(f"{name}: política aplicada, Cosmos reindexa el contenedor en segundo plano.")
+        while wait:
+            progress = transformation_progress(container)
+            print(f"{name}: reindexación al {progress}%.")
+            if progress >= 100:
+                break
+            time.sleep(5)
+    return 0
+
+
+def sample_queries(policy: dict, doc: dict) -> List[tuple]:
+    """Consultas de igualdad por cada propiedad indexada y por cada índice compuesto, con valores de la muestra."""
+    fields = [item["path"][1:-2] for item in policy["includedPaths"] if "[]" not in item["path"]]
+    groups = [[field] for field in fields]
+    groups += [[item["path"][1:] for item in composite] for composite in policy.get("compositeIndexes", [])]
+    queries = []
+    for group in groups:
+        if not all(field in doc for field in group):
+            continue
+        condition = " AND ".join(f"c.{field} = @p{i}" for i, field in enumerate(group))
+        parameters = [{"name": f"@p{i}", "value": doc[field]} for i, field in enumerate(group)]
+        queries.append((f"SELECT * FROM c WHERE {condition}", parameters))
+    return queries
+
+
+def _measure_container(container, docs: List[dict], queries: List[tuple]) -> dict:
+    with cosmos_call("indexing.write") as write:
+        for doc in docs:
+            container.upsert_item(body=doc)
+    with cosmos_call("indexing.query") as query:
+        for query_text, parameters in queries:
+            list(container.query_items(query=query_text, parameters=parameters, enable_cross_partition_query=True))
+    return {
+        "write_ru_avg": round(write.request_charge / len(docs), 2),
+        "query_ru_avg": round(query.request_charge / len(queries), 2) if queries else 0.0,
+    }
+
+
+def measure(session: CosmosAdapter, containers: Dict[str, str], samples: int) -> int:
+    policies = indexing_policies()
+    suffix = uuid.uuid4().hex[:8]
+    for name, partition_key in containers.items():
+        docs = list(session.get_container(name).query_items(
+            query=f"SELECT TOP {samples} * FROM c", enable_cross_partition_query=True
+        ))
+        if not docs:
+            print(f"{name}: sin documentos para muestrear.")
+            continue
+        docs = [{key: value for key, value in doc.items() if not key.startswith("_")} for doc in docs]
+        queries = sample_queries(policies[name], docs[0])
+        results = {}
+        for label, policy in (("default", DEFAULT_POLICY), ("declared", policies[name])):
+            scratch_name = f"{name}-indexing-{label}-{suffix}"
+            scratch = session.database.create_container(
+                id=scratch_name,
+                partition_key=PartitionKey(path=partition_key),
+                indexing_policy=policy,
+            )
+            try:
+                results[label] = _measure_container(scratch, docs, queries)
+            finally:
+                session.database.delete_container(scratch_name)
+        default, declared = results["default"], results["declared"]
+        print(f"{name} ({len(docs)} documentos, {len(queries)} consultas):")
+        for metric in ("write_ru_avg", "query_ru_avg"):
+            print(
+                f"  {metric}: por defecto {default[metric]:.2f}, declarada {declared[metric]:.2f} "
+                f"({declared[metric] - default[metric]:+.2f} RU)"
+            )
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command in ("show", "apply", "measure"):
+        subparser = subparsers.add_parser(command)
+        subparser.add_argument("--container", nargs="+", help="contenedores a procesar (por defecto, todos)")
+        if command == "apply":
+            subparser.add_argument("--wait", action="store_true", help="espera a que termine la reindexación")
+        if command == "measure":
+            subparser.add_argument("--samples", type=int, default=50, help="documentos a copiar por contenedor")
+    args = parser.parse_args(argv)
+
+    configure_logging(LogLevels.info)
+    session = init_cosmos_adapter()
+    containers = selected_containers(args.container)
+    try:
+        if args.command == "show":
+            return show(session, containers)
+        if args.command == "apply":
+            return apply(session, containers, args.wait)
+        return measure(session, containers, args.samples)
+    except Exception as e:
+        logging.error(f"Error al procesar las políticas de indexación: {str(e)}")
+        return 1
+    finally:
+        close_cosmos_adapter()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+# scripts/cosmos_provision.py
+"""
+Aprovisiona la base de datos y los contenedores de Cosmos DB de la aplicación.
+
+    python -m scripts.cosmos_provision                                   # todos los contenedores
+    python -m scripts.cosmos_provision --container LeadConversionJobs
+
+Es el paso explícito de despliegue que reemplaza a COSMOS_PROVISION_ON_STARTUP: los
+contenedores que faltan se crean con su política de indexación declarada y en los
+existentes solo se avisa si la política difiere (se aplica con scripts.cosmos_indexing).
+"""
+import argparse
+import logging
+import sys
+from typing import List, Optional
+
+from core.logging_config import LogLevels, configure_logging
+from infrastructure.adapters.cosmos_adapter import close_cosmos_adapter, configured_containers, init_cosmos_adapter
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--container", nargs="+", help="contenedores a aprovisionar (por defecto, todos)")
+    args = parser.parse_args(argv)
+
+    configure_logging(LogLevels.info)
+    containers = {
+        name: partition_key
+        for name, partition_key in configured_containers().items()
+        if not args.container or name in args.container
+    }
+    if not containers:
+        logging.error(f"Ninguno de los contenedores {args.container} está configurado.")
+        return 1
+    try:
+        init_cosmos_adapter().provision(containers)
+        return 0
+    except Exception as e:
+        logging.error(f"Error al aprovisionar Cosmos DB: {str(e)}")
+        return 1
+    finally:
+        close_cosmos_adapter()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+# scripts/opportunity_leads_layout.py
+"""
+Migración de OpportunityLeads del formato embebido (un documento con todos los leads)
+al formato por lead (cabecera más un documento por lead) en COSMOS_OPPORTUNITY_LEAD_DOCUMENTS_CONTAINER.
+
+    python -m scripts.opportunity_leads_layout migrate               # copia lo que falta o cambió
+    python -m scripts.opportunity_leads_layout migrate --dry-run     # solo informa qué copiaría
+    python -m scripts.opportunity_leads_layout verify                # compara ambos formatos, código 1 si difieren
+
+migrate copia cada oportunidad cuyo documento embebido es más reciente (_ts) que su
+cabecera, así que se puede repetir. Secuencia sugerida:
+
+    1. migrate con la aplicación todavía en OPPORTUNITY_LEADS_LAYOUT=embedded.
+    2. Cambiar a OPPORTUNITY_LEADS_LAYOUT=per_lead y reiniciar.
+    3. migrate de nuevo: recoge lo escrito en el formato embebido durante el cambio y
+       no pisa lo que ya se escribió en el formato por lead.
+    4. verify.
+"""
+import argparse
+import logging
+import sys
+from typing import List, Optional
+
+from core.logging_config import LogLevels, configure_logging
+from infrastructure.adapters.cosmos_adapter import close_cosmos_adapter, init_cosmos_adapter
+from infrastructure.repositories.opportunity_leads_repository import OpportunityLeadsRepository
+from infrastructure.repositories.per_lead_opportunity_leads_repository import PerLeadOpportunityLeadsRepository
+from domain.models.opportunity_leads import OpportunityLeads
+
+
+def _comparable(opportunity: Optional[OpportunityLeads]) -> Optional[dict]:
+    # El id y el etag dependen del formato; el resto debe coincidir
+    return opportunity.model_dump(exclude={"id"}) if opportunity is not None else None
+
+
+def migrate(source: OpportunityLeadsRepository, target: PerLeadOpportunityLeadsRepository, agent_ids: Optional[List[int]], dry_run: bool) -> int:
+    copied = skipped = failed = leads = 0
+    for doc in source.container.query_items(query="SELECT * FROM c", enable_cross_partition_query=True):
+        if agent_ids and doc["IdAgte"] not in agent_ids:
+            continue
+        header = target._read_header(doc["OpportunityId"], doc["IdAgte"])
+        if header is not None and header.get("_ts", 0) > doc.get("_ts", 0):
+            skipped += 1
+            continue
+        opportunity = source._map_to_domain(doc)
+        if dry_run:
+            copied += 1
+            leads += len(opportunity.leads)
+            continue
+        try:
+            target.update(opportunity)
+            copied += 1
+            leads += len(opportunity.leads)
+        except Exception as e:
+            failed += 1
+            logging.error(f"No se pudo migrar la oportunidad {opportunity.OpportunityId} del agente {opportunity.IdAgte}: {str(e)}")
+    action = "Se copiarían" if dry_run else "Copiadas"
+    logging.info(f"{action} {copied} oportunidades ({leads} leads); {skipped} ya estaban al día; {failed} con error.")
+    return 1 if failed else 0
+
+
+def verify(source: OpportunityLeadsRepository, target: PerLeadOpportunityLeadsRepository, agent_ids: Optional[List[int]]) -> int:
+    checked = different = 0
+    for opportunity in source.iter_all():
+        if agent_ids and opportunity.IdAgte not in agent_ids:
+            continue
+        checked += 1
+        migrated = target.get_by_opportunity_id_and_agte(opportunity.OpportunityId, opportunity.IdAgte)
+        if _comparable(migrated) != _comparable(opportunity):
+            different += 1
+            state = "no existe" if migrated is None else "difiere"
+            logging.warning(f"Oportunidad {opportunity.OpportunityId} del agente {opportunity.IdAgte}: {state} en el formato por lead.")
+    logging.info(f"{different} de {checked} oportunidades con diferencias.")
+    return 1 if different else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate_parser = subparsers.add_parser("migrate", help="copia al formato por lead lo que falta o cambió")
+    migrate_parser.add_argument("--agent", type=int, nargs="+", help="IdAgte a migrar (por defecto, todos)")
+    migrate_parser.add_argument("--dry-run", action="store_true", help="solo informa qué copiaría")
+    verify_parser = subparsers.add_parser("verify", help="compara el formato embebido con el formato por lead")
+    verify_parser.add_argument("--agent", type=int, nargs="+", help="IdAgte a revisar (por defecto, todos)")
+    args = parser.parse_args(argv)
+
+    configure_logging(LogLevels.info)
+    session = init_cosmos_adapter()
+    source = OpportunityLeadsRepository(session)
+    target = PerLeadOpportunityLeadsRepository(session)
+    try:
+        if args.command == "migrate":
+            return migrate(source, target, args.agent, args.dry_run)
+        return verify(source, target, args.agent)
+    finally:
+        close_cosmos_adapter()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+# scripts/opportunity_summaries.py
+"""
+Mantenimiento del resumen materializado de oportunidades por agente.
+
+    python -m scripts.opportunity_summaries rebuild                 # backfill de todos los agentes
+    python -m scripts.opportunity_summaries rebuild --agent 10 20
+    python -m scripts.opportunity_summaries check                   # informa diferencias, código 1 si hay
+    python -m scripts.opportunity_summaries check --fix             # recalcula los agentes con diferencias
+"""
+import argparse
+import logging
+import sys
+from typing import List, Optional
+
+from core.logging_config import LogLevels, configure_logging
+from application.services.opportunity_summary_service import OpportunitySummaryService
+from application.services.opportunity_summary_store_service import OpportunitySummaryMaintainer
+from infrastructure.adapters.cosmos_adapter import close_cosmos_adapter, init_cosmos_adapter
+from infrastructure.repositories.opportunity_detail_repository import OpportunityDetailRepository
+from infrastructure.repositories.opportunity_leads_layout import create_opportunity_leads_repository
+from infrastructure.repositories.opportunity_summary_store_repository import OpportunitySummaryStoreRepository
+
+
+def build_maintainer() -> tuple:
+    session = init_cosmos_adapter()
+    opportunity_leads_repo = create_opportunity_leads_repository(session)
+    opportunity_detail_repo = OpportunityDetailRepository(session)
+    maintainer = OpportunitySummaryMaintainer(
+        OpportunitySummaryStoreRepository(session),
+        OpportunitySummaryService(opportunity_detail_repo, opportunity_leads_repo),
+        opportunity_detail_repo,
+    )
+    return maintainer, opportunity_leads_repo
+
+
+def rebuild(maintainer: OpportunitySummaryMaintainer, agent_ids: List[int]) -> int:
+    failed = 0
+    for id_agte in agent_ids:
+        try:
+            summary = maintainer.rebuild_agent(id_agte)
+            logging.info(f"Agente {id_agte}: {len(summary.summaries)} oportunidades materializadas.")
+        except Exception as e:
+            failed += 1
+            logging.error(f"No se pudo recalcular el resumen del agente {id_agte}: {str(e)}")
+    logging.info(f"Recalculados {len(agent_ids) - failed} de {len(agent_ids)} agentes.")
+    return 1 if failed else 0
+
+
+def check(maintainer: OpportunitySummaryMaintainer, agent_ids: List[int], fix: bool) -> int:
+    inconsistent = 0
+    for id_agte in agent_ids:
+        differences = maintainer.check(id_agte)
+        if not differences:
+            continue
+        inconsistent += 1
+        logging.warning(f"Agente {id_agte}: el resumen difiere en las oportunidades {differences}.")
+        if fix:
+            maintainer.rebuild_agent(id_agte)
+            logging.info(f"Agente {id_agte}: resumen recalculado.")
+    logging.info(f"{inconsistent} de {len(agent_ids)} agentes con diferencias.")
+    return 1 if inconsistent and not fix else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    rebuild_parser = subparsers.add_parser("rebuild", help="recalcula el resumen desde OpportunityLeads y OpportunityDetail")
+    rebuild_parser.add_argument("--agent", type=int, nargs="+", help="IdAgte a recalcular (por defecto, todos)")
+    check_parser = subparsers.add_parser("check", help="compara el resumen materializado con el calculado")
+    check_parser.add_argument("--agent", type=int, nargs="+", help="IdAgte a revisar (por defecto, todos)")
+    check_parser.add_argument("--fix", action="store_true", help="recalcula los agentes con diferencias")
+    args = parser.parse_args(argv)
+
+    configure_logging(LogLevels.info)
+    maintainer, opportunity_leads_repo = build_maintainer()
+    try:
+        agent_ids = args.agent or opportunity_leads_repo.get_agent_ids()
+        if args.command == "rebuild":
+            return rebuild(maintainer, agent_ids)
+        return check(maintainer, agent_ids, args.fix)
+    finally:
+        close_cosmos_adapter()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+# tests/conftest.py
+from benchmarks.env import configure_env
+
+# core.settings exige la configuración al importarse; las pruebas usan los valores de relleno
+configure_env()
@@ -0,0 +1,90 @@
+# tests/test_azure_auth_adapter.py
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jwt.exceptions import PyJWKClientError
+
+from core.settings import settings
+from infrastructure.adapters import azure_auth_adapter
+from infrastructure.adapters.azure_auth_adapter import AzureAuthAdapter, SigningKeyCache
+
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+class SigningKey:
+    def __init__(self, key_id, key):
+        self.key_id = key_id
+        self.key = key
+
+
+class JWKClient:
+    """Sustituto de PyJWKClient que entrega las llaves indicadas y cuenta las descargas."""
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.fetches = 0
+
+    def get_signing_keys(self, refresh=False):
+        self.fetches += 1
+        return [SigningKey(key_id, key) for key_id, key in self.keys.items()]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(azure_auth_adapter.time, "monotonic", lambda: now[0])
+    return now
+
+
+def signing_key_cache(keys, min_refresh_interval=60.0):
+    cache = SigningKeyCache("https://example.com/keys", max_age=3600.0, min_refresh_interval=min_refresh_interval)
+    cache._client = JWKClient(keys)
+    return cache
+
+
+def make_token(exp, kid="kid-1"):
+    claims = {"aud": settings.AZURE_CLIENT_ID, "preferred_username": "agente1@example.com", "sub": "sub-1", "exp": exp}
+    return jwt.encode(claims, PRIVATE_KEY, algorithm="RS256", headers={"kid": kid})
+
+
+def test_unknown_kid_refetches_at_most_once_per_min_refresh_interval(clock):
+    cache = signing_key_cache({"kid-1": "llave-1"}, min_refresh_interval=60.0)
+    cache.warm()
+
+    for _ in range(3):
+        with pytest.raises(PyJWKClientError):
+            cache.get_signing_key("kid-rotado")
+    assert cache._client.fetches == 1
+
+    # La llave nueva aparece en el JWKS, pero no se vuelve a descargar hasta que pase el intervalo
+    cache._client.keys["kid-rotado"] = "llave-2"
+    clock[0] += 59
+    with pytest.raises(PyJWKClientError):
+        cache.get_signing_key("kid-rotado")
+    clock[0] += 1
+    assert cache.get_signing_key("kid-rotado") == "llave-2"
+    assert cache._client.fetches == 2
+    assert cache.get_signing_key("kid-1") == "llave-1"
+    assert cache._client.fetches == 2
+
+
+def test_cached_token_is_rejected_after_exp():
+    adapter = AzureAuthAdapter()
+    adapter.signing_keys._client = JWKClient({"kid-1": PRIVATE_KEY.public_key()})
+    exp = int(time.time()) + 1
+    token = make_token(exp)
+
+    assert adapter.get_current_user(token)["email"] == "agente1@example.com"
+    assert adapter.get_cached_user(token) is not None
+    assert adapter.signing_keys._client.fetches == 1
+
+    time.sleep(max(0.0, exp - time.time()) + 0.05)
+
+    assert adapter.get_cached_user(token) is None
+    with pytest.raises(HTTPException) as error:
+        adapter.get_current_user(token)
+    assert error.value.status_code == 401
+    assert error.value.detail == "Token expirado."
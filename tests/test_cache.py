@@ -0,0 +1,70 @@
+# tests/test_cache.py
+import pytest
+
+from core import cache
+from core.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_returns_stored_value_and_counts_hits():
+    users = TTLCache(maxsize=10)
+    users.set("ana@example.com", 1)
+
+    assert users.get("ana@example.com") == 1
+    assert users.get("otro@example.com", "sin usuario") == "sin usuario"
+    assert users.stats() == {"size": 1, "maxsize": 10, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_entries_expire_after_ttl(clock):
+    users = TTLCache(maxsize=10, ttl=30)
+    users.set("ana@example.com", 1)
+
+    clock[0] += 29
+    assert users.get("ana@example.com") == 1
+    clock[0] += 1
+    assert users.get("ana@example.com") is None
+    assert len(users) == 0
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    users = TTLCache(maxsize=10, ttl=300)
+    users.set("nadie@example.com", None, ttl=5)
+
+    clock[0] += 6
+    assert users.get("nadie@example.com", "vencido") == "vencido"
+
+
+def test_non_positive_ttl_is_not_stored():
+    users = TTLCache(maxsize=10, ttl=0)
+    users.set("ana@example.com", 1)
+
+    assert len(users) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    users = TTLCache(maxsize=2)
+    users.set("a", 1)
+    users.set("b", 2)
+    users.get("a")
+    users.set("c", 3)
+
+    assert users.get("b") is None
+    assert users.get("a") == 1
+    assert users.get("c") == 3
+
+
+def test_invalidate_and_clear():
+    users = TTLCache(maxsize=10)
+    users.set("a", 1)
+    users.set("b", 2)
+
+    users.invalidate("a")
+    assert users.get("a") is None
+    users.clear()
+    assert len(users) == 0
@@ -0,0 +1,107 @@
+# tests/test_conditional.py
+import hashlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from application.services.opportunity_detail_service import OpportunityDetailService
+from benchmarks.datasets import make_opportunity_detail_docs
+from domain.models.opportunity_detail import OpportunityDetail
+from presentation.conditional import details_etag, strong_etag
+from presentation.routers.opportunity_detail_router import get_opportunity_detail_service, router
+
+
+class DetailRepository:
+    """Repositorio de Details en memoria con los métodos que usan los endpoints condicionales."""
+
+    def __init__(self, details):
+        self.details = details
+
+    def get_all(self):
+        return self.details
+
+    def get_by_opportunity_id(self, opportunity_id):
+        return next((detail for detail in self.details if detail.OpportunityId == opportunity_id), None)
+
+
+def make_details(with_etag=True):
+    details = []
+    for index, doc in enumerate(make_opportunity_detail_docs(3)):
+        detail = OpportunityDetail.model_validate(doc)
+        detail.etag = f'"etag-{index}"' if with_etag else None
+        details.append(detail)
+    return details
+
+
+def client_for(details):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_opportunity_detail_service] = lambda: OpportunityDetailService(DetailRepository(details))
+    return TestClient(app)
+
+
+@pytest.fixture
+def details():
+    return make_details()
+
+
+def test_etag_comes_from_cosmos_etags(details):
+    response = client_for(details).get("/opportunity-detail/")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == details_etag(details)
+    assert len(response.json()) == 3
+
+
+def test_etag_falls_back_to_content_hash_without_cosmos_etags():
+    response = client_for(make_details(with_etag=False)).get("/opportunity-detail/")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == strong_etag(hashlib.sha256(response.content).hexdigest())
+
+
+def test_matching_if_none_match_returns_304(details):
+    client = client_for(details)
+    etag = client.get("/opportunity-detail/").headers["ETag"]
+
+    response = client.get("/opportunity-detail/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert not response.content
+
+
+def test_content_hash_etag_also_returns_304():
+    client = client_for(make_details(with_etag=False))
+    etag = client.get("/opportunity-detail/").headers["ETag"]
+
+    assert client.get("/opportunity-detail/", headers={"If-None-Match": etag}).status_code == 304
+
+
+@pytest.mark.parametrize("header", [
+    'W/{etag}',
+    '"otro", {etag}',
+    '"otro" , W/{etag}',
+    '*',
+])
+def test_weak_and_list_if_none_match_return_304(details, header):
+    client = client_for(details)
+    detail = details[1]
+    etag = client.get(f"/opportunity-detail/{detail.OpportunityId}").headers["ETag"]
+
+    response = client.get(f"/opportunity-detail/{detail.OpportunityId}", headers={"If-None-Match": header.format(etag=etag)})
+
+    assert response.status_code == 304
+
+
+def test_mismatched_if_none_match_returns_200(details):
+    client = client_for(details)
+    etag = client.get("/opportunity-detail/").headers["ETag"]
+    details[0].etag = '"etag-cambiado"'
+
+    response = client.get("/opportunity-detail/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()) == 3
@@ -0,0 +1,237 @@
+# tests/test_lead_job_service.py
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from application.services.lead_job_service import LeadJobService
+from application.services.lead_service import (
+    ACTIVE_STATUS,
+    CONVERTED_STATUS,
+    CONVERTING_STATUS,
+    LeadService,
+    lead_id_for,
+)
+from benchmarks.datasets import make_opportunity_leads_docs
+from benchmarks.fake_cosmos import FakeCosmosAdapter, FakeCosmosContainer
+from core.exceptions import ConflictException, NotFoundException
+from core.settings import settings
+from domain.models.lead_bulk_result import LeadBulkResult
+from domain.models.lead_conversion_job import LeadJobStatus
+from domain.models.user import User
+from infrastructure.repositories.lead_job_repository import LeadJobRepository
+from infrastructure.repositories.opportunity_leads_repository import OpportunityLeadsRepository
+
+USERS = {"agente1@example.com": User(id="user-1", id_agte=1), "otro@example.com": User(id="user-2", id_agte=1)}
+
+
+class LeadRepository:
+    """Tabla de leads en memoria; on_insert se llama en cada bloque antes de insertar."""
+
+    def __init__(self):
+        self.leads = {}
+        self.on_insert = None
+
+    def user_exists(self, user_id):
+        return True
+
+    def get_existing_ids(self, lead_ids):
+        return {lead_id for lead_id in lead_ids if lead_id in self.leads}
+
+    def create_leads_bulk(self, leads, verify_user=True):
+        if self.on_insert is not None:
+            self.on_insert(leads)
+        self.leads.update(leads)
+        return LeadBulkResult(created_ids=list(leads))
+
+
+class UserRepository:
+    def get_user_by_email(self, email):
+        return USERS[email]
+
+
+class Auth:
+    def get_current_user(self, token):
+        # En las pruebas el token es el email del usuario
+        return {"email": token}
+
+
+class Executor:
+    """Guarda los jobs encolados; cada prueba decide cuándo ejecutarlos."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, func, *args):
+        self.submitted.append(args)
+
+
+@pytest.fixture
+def stack():
+    opportunities = FakeCosmosContainer()
+    jobs = FakeCosmosContainer()
+    adapter = FakeCosmosAdapter({
+        settings.COSMOS_OPPORTUNITY_LEADS_CONTAINER: opportunities,
+        settings.COSMOS_LEAD_JOBS_CONTAINER: jobs,
+    })
+    lead_repo = LeadRepository()
+    opportunity_leads = OpportunityLeadsRepository(adapter)
+    job_service = LeadJobService(
+        LeadJobRepository(adapter), lead_repo, opportunity_leads, UserRepository(), Auth(), Executor(), chunk_size=2,
+    )
+    lead_service = LeadService(lead_repo, opportunity_leads, UserRepository(), Auth())
+    return opportunities, job_service, lead_service
+
+
+def load_opportunity(container, leads=5, **fields):
+    doc = make_opportunity_leads_docs(1, leads)[0]
+    doc.update(fields)
+    container.load([doc])
+    return doc
+
+
+def stored(job_service, doc):
+    return job_service.opportunity_leads_repo.get_by_opportunity_id_and_agte(doc["OpportunityId"], doc["IdAgte"])
+
+
+def test_each_chunk_holds_the_claim_until_converted(stack):
+    opportunities, job_service, lead_service = stack
+    doc = load_opportunity(opportunities)
+    job = job_service.start_job(doc["OpportunityId"], "agente1@example.com")
+    seen = []
+    job_service.lead_repo.on_insert = lambda leads: seen.append(stored(job_service, doc))
+
+    job_service.run_job(job.id)
+
+    assert [(opportunity.Status, opportunity.ClaimedBy) for opportunity in seen] == [(CONVERTING_STATUS, f"job:{job.id}")] * 3
+    assert stored(job_service, doc).Status == CONVERTED_STATUS
+    assert job_service.job_repo.get(job.id).status == LeadJobStatus.completed
+
+
+def test_sync_conversion_is_rejected_while_a_job_runs(stack):
+    opportunities, job_service, lead_service = stack
+    doc = load_opportunity(opportunities)
+    job = job_service.start_job(doc["OpportunityId"], "agente1@example.com")
+    rejected = []
+
+    def convert_concurrently(leads):
+        # La conversión síncrona usa el mismo repositorio de leads: no debe volver a entrar aquí
+        job_service.lead_repo.on_insert = None
+        try:
+            lead_service.create_leads_from_opportunity(doc["OpportunityId"], "agente1@example.com")
+        except ConflictException as e:
+            rejected.append(e)
+        finally:
+            job_service.lead_repo.on_insert = convert_concurrently
+
+    job_service.lead_repo.on_insert = convert_concurrently
+    job_service.run_job(job.id)
+
+    assert len(rejected) == 3
+    assert len(job_service.lead_repo.leads) == 5
+
+
+def test_job_fails_when_a_sync_conversion_holds_the_claim(stack):
+    opportunities, job_service, lead_service = stack
+    doc = load_opportunity(
+        opportunities, Status=CONVERTING_STATUS, ClaimedBy="user-2", ClaimedAt=datetime.now(timezone.utc).isoformat()
+    )
+    job = job_service.start_job(doc["OpportunityId"], "agente1@example.com")
+
+    job_service.run_job(job.id)
+
+    finished = job_service.job_repo.get(job.id)
+    assert finished.status == LeadJobStatus.failed
+    assert "ya se está convirtiendo" in finished.errors[-1].error
+    assert not job_service.lead_repo.leads
+
+
+def test_resumed_job_takes_back_its_own_claim(stack):
+    opportunities, job_service, lead_service = stack
+    doc = load_opportunity(opportunities)
+    job = job_service.start_job(doc["OpportunityId"], "agente1@example.com")
+    # El proceso anterior cayó con la oportunidad reclamada por el job
+    claimed = job_service.opportunity_leads_repo.patch_status(stored(job_service, doc), CONVERTING_STATUS, f"job:{job.id}")
+    assert claimed.ClaimedAt > datetime.now(timezone.utc) - timedelta(seconds=5)
+
+    job_service.run_job(job.id)
+
+    assert stored(job_service, doc).Status == CONVERTED_STATUS
+
+
+def test_chunk_error_releases_the_claim(stack):
+    opportunities, job_service, lead_service = stack
+    doc = load_opportunity(opportunities)
+    job = job_service.start_job(doc["OpportunityId"], "agente1@example.com")
+
+    def fail(leads):
+        raise RuntimeError("SQL no responde")
+
+    job_service.lead_repo.on_insert = fail
+    job_service.run_job(job.id)
+
+    assert job_service.job_repo.get(job.id).status == LeadJobStatus.failed
+    assert stored(job_service, doc).Status == ACTIVE_STATUS
+
+
+def test_get_job_is_only_visible_to_its_creator(stack):
+    opportunities, job_service, lead_service = stack
+    doc = load_opportunity(opportunities)
+    job = job_service.start_job(doc["OpportunityId"], "agente1@example.com")
+
+    assert job_service.get_job(job.id, "agente1@example.com").id == job.id
+    with pytest.raises(NotFoundException):
+        job_service.get_job(job.id, "otro@example.com")
+
+
+def test_stop_event_pauses_after_the_current_chunk(stack):
+    opportunities, job_service, lead_service = stack
+    doc = load_opportunity(opportunities)
+    job = job_service.start_job(doc["OpportunityId"], "agente1@example.com")
+    job_service.lead_repo.on_insert = lambda leads: job_service.stop_event.set()
+
+    job_service.run_job(job.id)
+
+    paused = job_service.job_repo.get(job.id)
+    assert paused.status == LeadJobStatus.pending
+    assert paused.processed == paused.created == 2
+    assert len(job_service.lead_repo.leads) == 2
+    # El reclamo se libera para que la oportunidad no quede bloqueada hasta que venza
+    assert stored(job_service, doc).Status == ACTIVE_STATUS
+
+
+def test_resume_unfinished_resubmits_pending_and_running_jobs(stack):
+    opportunities, job_service, lead_service = stack
+    jobs = [
+        job_service.start_job(load_opportunity(opportunities, OpportunityId=opportunity_id)["OpportunityId"], "agente1@example.com")
+        for opportunity_id in (1, 2, 3)
+    ]
+    running = job_service.job_repo.get(jobs[1].id)
+    running.status = LeadJobStatus.running
+    job_service.job_repo.save(running)
+    job_service.run_job(jobs[2].id)
+    job_service.executor.submitted.clear()
+
+    assert job_service.resume_unfinished() == 2
+    assert sorted(job_id for job_id, in job_service.executor.submitted) == sorted([jobs[0].id, jobs[1].id])
+
+
+def test_resumed_job_continues_from_its_checkpoint(stack):
+    opportunities, job_service, lead_service = stack
+    doc = load_opportunity(opportunities)
+    job = job_service.start_job(doc["OpportunityId"], "agente1@example.com")
+    # El proceso anterior confirmó el primer bloque e insertó el segundo sin llegar a guardar el checkpoint
+    interrupted = job_service.job_repo.get(job.id)
+    interrupted.status, interrupted.processed, interrupted.created = LeadJobStatus.running, 2, 2
+    job_service.job_repo.save(interrupted)
+    for index in range(4):
+        job_service.lead_repo.leads[lead_id_for(job.OpportunityId, job.IdAgte, index)] = None
+    inserted = []
+    job_service.lead_repo.on_insert = lambda leads: inserted.append(sorted(leads))
+
+    job_service.run_job(job.id)
+
+    finished = job_service.job_repo.get(job.id)
+    assert finished.status == LeadJobStatus.completed
+    assert (finished.processed, finished.created, finished.failed) == (5, 5, 0)
+    assert inserted == [[], [lead_id_for(job.OpportunityId, job.IdAgte, 4)]]
+    assert stored(job_service, doc).Status == CONVERTED_STATUS
@@ -0,0 +1,139 @@
+# tests/test_lead_repository.py
+import uuid
+
+import pytest
+
+# El repositorio importa el adaptador de SQL Server, que importa pyodbc
+pytest.importorskip("pyodbc", exc_type=ImportError)
+
+from benchmarks.fake_sql import SqliteConnection, SqliteCursor, SqliteDatabase  # noqa: E402
+from domain.models.lead import Lead  # noqa: E402
+from infrastructure.adapters.sql_server_adapter import SqlServerAdapter  # noqa: E402
+from infrastructure.repositories.lead_repository import IN_CLAUSE_CHUNK_SIZE, LeadRepository  # noqa: E402
+
+
+class RecordingCursor(SqliteCursor):
+    """Cursor SQLite que anota cada sentencia que ejecuta."""
+
+    def __init__(self, cursor, latency, calls):
+        super().__init__(cursor, latency)
+        self.calls = calls
+
+    def execute(self, query, params=()):
+        self.calls.append(("execute", " ".join(query.split()), len(params)))
+        return super().execute(query, params)
+
+    def executemany(self, query, rows):
+        rows = list(rows)
+        self.calls.append(("executemany", self.fast_executemany, len(rows)))
+        return super().executemany(query, rows)
+
+
+class RecordingConnection(SqliteConnection):
+    def __init__(self, connection, latency, calls):
+        super().__init__(connection, latency)
+        self.calls = calls
+
+    def cursor(self):
+        return RecordingCursor(self._connection.cursor(), self._latency, self.calls)
+
+
+class RecordingDatabase(SqliteDatabase):
+    """Base SQLite cuyas conexiones anotan las sentencias en calls."""
+
+    def __init__(self, directory):
+        self.calls = []
+        super().__init__(directory)
+
+    def connect(self):
+        return RecordingConnection(self._open(), self.latency, self.calls)
+
+
+@pytest.fixture
+def database(tmp_path):
+    return RecordingDatabase(str(tmp_path))
+
+
+@pytest.fixture
+def repository(database):
+    pool = database.create_pool(max_size=2)
+    yield LeadRepository(SqlServerAdapter(pool))
+    pool.close()
+
+
+def make_leads(count, start=0):
+    return {
+        str(uuid.uuid4()): Lead(
+            CreatedBy="user-1", name=f"Lead {index}", documentNumber=index, source="Oportunidad",
+            stage="new", priority="medium", assignedTo="user-1", tags=["oportunidad"],
+        )
+        for index in range(start, start + count)
+    }
+
+
+def copies_to_raw(calls):
+    return [params for kind, query, params in calls if kind == "execute" and "INSERT INTO dalilm.LeadsRaw" in query]
+
+
+def test_bulk_insert_uses_fast_executemany(database, repository):
+    leads = make_leads(5)
+    database.calls.clear()
+
+    result = repository.create_leads_bulk(leads, verify_user=False)
+
+    assert result.created_ids == list(leads)
+    assert not result.failures
+    assert [call for call in database.calls if call[0] == "executemany"] == [("executemany", True, 5)]
+    assert copies_to_raw(database.calls) == [5]
+    assert database.count("Leads") == database.count("LeadsRaw") == 5
+
+
+def test_copy_to_raw_is_chunked_by_in_clause_limit(database, repository):
+    leads = make_leads(2 * IN_CLAUSE_CHUNK_SIZE + 1)
+    database.calls.clear()
+
+    result = repository.create_leads_bulk(leads, verify_user=False)
+
+    assert len(result.created_ids) == len(leads)
+    assert copies_to_raw(database.calls) == [IN_CLAUSE_CHUNK_SIZE, IN_CLAUSE_CHUNK_SIZE, 1]
+    assert database.count("LeadsRaw") == len(leads)
+
+
+def test_failed_batch_is_retried_row_by_row(database, repository):
+    duplicate = make_leads(1, start=100)
+    repository.create_leads_bulk(duplicate, verify_user=False)
+    leads = make_leads(3)
+    leads.update(duplicate)
+
+    result = repository.create_leads_bulk(leads, verify_user=False)
+
+    # El lote se revierte completo y cada fila se reintenta en su propia transacción
+    duplicate_id = next(iter(duplicate))
+    assert sorted(result.created_ids) == sorted(lead_id for lead_id in leads if lead_id != duplicate_id)
+    assert [(failure.lead_id, failure.documentNumber) for failure in result.failures] == [(duplicate_id, 100)]
+    assert database.count("Leads") == 4
+    assert database.count("LeadsRaw") == 4
+
+
+def test_get_existing_ids_returns_lowercase_ids(database, repository):
+    # SQL Server devuelve los UNIQUEIDENTIFIER en mayúsculas; los ids de la aplicación van en minúsculas
+    leads = {lead_id.upper(): lead for lead_id, lead in make_leads(2).items()}
+    repository.create_leads_bulk(leads, verify_user=False)
+    missing = str(uuid.uuid4()).upper()
+
+    existing = repository.get_existing_ids(list(leads) + [missing])
+
+    assert existing == {lead_id.lower() for lead_id in leads}
+
+
+def test_get_existing_ids_is_chunked_by_in_clause_limit(database, repository):
+    leads = make_leads(IN_CLAUSE_CHUNK_SIZE + 1)
+    repository.create_leads_bulk(leads, verify_user=False)
+    database.calls.clear()
+
+    existing = repository.get_existing_ids(list(leads))
+
+    assert existing == set(leads)
+    assert [params for kind, query, params in database.calls if "SELECT Id FROM dalilm.Leads" in query] == [
+        IN_CLAUSE_CHUNK_SIZE, 1,
+    ]
@@ -0,0 +1,119 @@
+# tests/test_lead_service.py
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from application.services.lead_service import ACTIVE_STATUS, CONVERTED_STATUS, CONVERTING_STATUS, LeadService
+from benchmarks.datasets import make_opportunity_leads_docs
+from benchmarks.fake_cosmos import FakeCosmosAdapter, FakeCosmosContainer
+from core.exceptions import ConflictException, ConnectionErrorException
+from core.settings import settings
+from domain.models.lead_bulk_result import LeadBulkResult
+from domain.models.user import User
+from infrastructure.repositories.opportunity_leads_repository import OpportunityLeadsRepository
+
+EMAIL = "agente1@example.com"
+
+
+class LeadRepository:
+    """Tabla de leads en memoria con la interfaz que usa LeadService."""
+
+    def __init__(self):
+        self.leads = {}
+
+    def user_exists(self, user_id):
+        return True
+
+    def get_existing_ids(self, lead_ids):
+        return {lead_id for lead_id in lead_ids if lead_id in self.leads}
+
+    def create_leads_bulk(self, leads, verify_user=True):
+        self.leads.update(leads)
+        return LeadBulkResult(created_ids=list(leads))
+
+
+class UserRepository:
+    def get_user_by_email(self, email):
+        return User(id="user-1", id_agte=1)
+
+
+class Auth:
+    def get_current_user(self, token):
+        return {"email": EMAIL}
+
+
+class FailingConvertedRepository(OpportunityLeadsRepository):
+    """Falla al marcar la oportunidad como convertida, después de insertar los leads."""
+
+    def patch_status(self, opportunity_lead, status, claimed_by=None):
+        if status == CONVERTED_STATUS:
+            raise ConnectionErrorException("No se pudo actualizar el OpportunityLead.")
+        return super().patch_status(opportunity_lead, status, claimed_by)
+
+
+def service(doc, repository_class=OpportunityLeadsRepository, claim_lease=900.0):
+    container = FakeCosmosContainer()
+    container.load([doc])
+    opportunity_leads = repository_class(FakeCosmosAdapter({settings.COSMOS_OPPORTUNITY_LEADS_CONTAINER: container}))
+    return LeadService(LeadRepository(), opportunity_leads, UserRepository(), Auth(), claim_lease=claim_lease)
+
+
+def stored(lead_service, doc):
+    return lead_service.opportunity_leads_repo.get_by_opportunity_id_and_agte(doc["OpportunityId"], doc["IdAgte"])
+
+
+def claimed_doc(age: timedelta, leads: int = 3) -> dict:
+    doc = make_opportunity_leads_docs(1, leads)[0]
+    doc.update(Status=CONVERTING_STATUS, ClaimedBy="otro", ClaimedAt=(datetime.now(timezone.utc) - age).isoformat())
+    return doc
+
+
+def test_conversion_claims_then_marks_converted():
+    doc = make_opportunity_leads_docs(1, 3)[0]
+    lead_service = service(doc)
+
+    leads = lead_service.create_leads_from_opportunity(doc["OpportunityId"], "token")
+
+    assert len(leads) == 3
+    opportunity = stored(lead_service, doc)
+    assert opportunity.Status == CONVERTED_STATUS
+    assert opportunity.ClaimedBy == "user-1"
+    assert opportunity.ClaimedAt is not None
+
+
+def test_live_claim_is_rejected():
+    doc = claimed_doc(timedelta(seconds=10))
+    lead_service = service(doc)
+
+    with pytest.raises(ConflictException):
+        lead_service.create_leads_from_opportunity(doc["OpportunityId"], "token")
+    assert not lead_service.lead_repo.leads
+
+
+def test_expired_claim_is_taken_over():
+    doc = claimed_doc(timedelta(seconds=120))
+    lead_service = service(doc, claim_lease=60)
+
+    leads = lead_service.create_leads_from_opportunity(doc["OpportunityId"], "token")
+
+    assert len(leads) == 3
+    assert stored(lead_service, doc).Status == CONVERTED_STATUS
+
+
+def test_claim_without_timestamp_is_taken_over():
+    doc = make_opportunity_leads_docs(1, 2)[0]
+    doc["Status"] = CONVERTING_STATUS
+    lead_service = service(doc)
+
+    assert len(lead_service.create_leads_from_opportunity(doc["OpportunityId"], "token")) == 2
+
+
+def test_failed_converted_patch_releases_the_claim():
+    doc = make_opportunity_leads_docs(1, 3)[0]
+    lead_service = service(doc, FailingConvertedRepository)
+
+    with pytest.raises(ConnectionErrorException):
+        lead_service.create_leads_from_opportunity(doc["OpportunityId"], "token")
+
+    assert stored(lead_service, doc).Status == ACTIVE_STATUS
+    assert len(lead_service.lead_repo.leads) == 3
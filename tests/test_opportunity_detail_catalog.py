@@ -0,0 +1,72 @@
+# tests/test_opportunity_detail_catalog.py
+import pytest
+
+from benchmarks.datasets import make_opportunity_detail_docs
+from benchmarks.fake_cosmos import FakeCosmosAdapter, FakeCosmosContainer
+from core.settings import settings
+from infrastructure.repositories import opportunity_detail_catalog
+from infrastructure.repositories.opportunity_detail_catalog import OpportunityDetailCatalog
+from infrastructure.repositories.opportunity_detail_repository import OpportunityDetailRepository
+
+
+class CountingRepository(OpportunityDetailRepository):
+    """Repositorio de Details que cuenta las cargas completas y las lecturas puntuales."""
+
+    def __init__(self, session):
+        super().__init__(session)
+        self.full_loads = 0
+        self.point_reads = 0
+
+    def get_all(self):
+        self.full_loads += 1
+        return super().get_all()
+
+    def get_by_opportunity_id(self, opportunity_id):
+        self.point_reads += 1
+        return super().get_by_opportunity_id(opportunity_id)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(opportunity_detail_catalog.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def catalog(clock):
+    container = FakeCosmosContainer()
+    container.load(make_opportunity_detail_docs(3))
+    repository = CountingRepository(FakeCosmosAdapter({settings.COSMOS_OPPORTUNITY_DETAIL_CONTAINER: container}))
+    catalog = OpportunityDetailCatalog(repository, ttl=300.0, refresh_interval=30.0)
+    catalog.load()
+    return catalog
+
+
+def test_background_refresh_reloads_before_the_ttl_expires(catalog, clock):
+    clock[0] += 269
+    assert not catalog.needs_reload
+    clock[0] += 1
+    assert catalog.needs_reload
+    assert catalog.is_fresh
+
+
+def test_expired_catalog_falls_back_to_point_reads_without_reloading(catalog, clock):
+    clock[0] += 300
+
+    assert catalog.get_by_opportunity_id(2).OpportunityId == 2
+    assert [detail.OpportunityId for detail in catalog.get_by_opportunity_ids([1, 3])] == [1, 3]
+
+    # Las peticiones no recargan el catálogo: eso lo hace el hilo de refresco
+    assert catalog.repository.full_loads == 1
+    assert catalog.repository.point_reads == 1
+    assert not catalog.is_fresh
+
+
+def test_fresh_catalog_serves_from_memory(catalog, clock):
+    clock[0] += 100
+
+    assert catalog.get_by_opportunity_id(2).OpportunityId == 2
+    assert len(catalog.get_all()) == 3
+    assert catalog.repository.full_loads == 1
+    assert catalog.repository.point_reads == 0
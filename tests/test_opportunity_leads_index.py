@@ -0,0 +1,103 @@
+# tests/test_opportunity_leads_index.py
+import json
+import time
+
+import pytest
+
+from benchmarks.datasets import make_opportunity_leads_docs
+from benchmarks.fake_cosmos import FakeCosmosAdapter, FakeCosmosContainer
+from core.settings import settings
+from infrastructure.repositories.opportunity_leads_index import SNAPSHOT_VERSION, OpportunityLeadsIndex
+from infrastructure.repositories.opportunity_leads_repository import OpportunityLeadsRepository
+
+ID_AGTE = 1
+
+
+@pytest.fixture
+def container():
+    container = FakeCosmosContainer()
+    container.load(make_opportunity_leads_docs(3, 2))
+    return container
+
+
+@pytest.fixture
+def repository(container):
+    return OpportunityLeadsRepository(FakeCosmosAdapter({settings.COSMOS_OPPORTUNITY_LEADS_CONTAINER: container}))
+
+
+def make_index(repository, snapshot_path=None, max_staleness=60.0):
+    return OpportunityLeadsIndex(
+        repository, refresh_interval=1.0, max_staleness=max_staleness, reload_interval=3600.0,
+        snapshot_path=snapshot_path,
+    )
+
+
+def write(container, opportunity_id, **fields):
+    """Modifica el documento en Cosmos sin pasar por el índice."""
+    doc = container.read_item(f"{opportunity_id}-{ID_AGTE}")
+    doc.update(fields)
+    container.load([doc])
+
+
+def indexed(index):
+    return sorted((opportunity.OpportunityId, len(opportunity.leads)) for opportunity in index.get_by_agte_id(ID_AGTE))
+
+
+def test_change_feed_updates_are_applied(container, repository):
+    index = make_index(repository)
+    index.load()
+    write(container, 1, Status=0)
+    write(container, 2, leads=container.read_item(f"2-{ID_AGTE}")["leads"][:1])
+    container.load(make_opportunity_leads_docs(4, 3)[3:])
+
+    assert indexed(index) == [(1, 2), (2, 2), (3, 2)]
+    assert index.apply_changes() == 3
+    assert indexed(index) == [(2, 1), (3, 2), (4, 3)]
+    assert index.fallbacks == 0
+
+
+def test_snapshot_is_restored_and_caught_up(container, repository, tmp_path):
+    path = str(tmp_path / "index.json")
+    index = make_index(repository, path)
+    index.load()
+    index.save_snapshot()
+    write(container, 3, Status=0)
+
+    restored = make_index(repository, path)
+
+    assert restored.restore_snapshot()
+    # Se pone al día con el change feed desde el token guardado
+    assert indexed(restored) == [(1, 2), (2, 2)]
+    etags = {opportunity.OpportunityId: opportunity.etag for opportunity in restored.get_by_agte_id(ID_AGTE)}
+    assert etags == {opportunity_id: container.read_item(f"{opportunity_id}-{ID_AGTE}")["_etag"] for opportunity_id in (1, 2)}
+
+
+def test_snapshot_from_an_older_version_is_rejected(container, repository, tmp_path):
+    path = tmp_path / "index.json"
+    index = make_index(repository, str(path))
+    index.load()
+    index.save_snapshot()
+    snapshot = json.loads(path.read_text(encoding="utf-8"))
+    path.write_text(json.dumps(dict(snapshot, version=SNAPSHOT_VERSION - 1)), encoding="utf-8")
+
+    restored = make_index(repository, str(path))
+
+    assert not restored.restore_snapshot()
+    assert len(restored) == 0
+    assert restored.lag is None
+
+
+def test_reads_fall_back_to_cosmos_when_lag_exceeds_max_staleness(container, repository):
+    index = make_index(repository, max_staleness=5.0)
+    index.load()
+    write(container, 1, Status=0)
+
+    # Sin aplicar el change feed el índice todavía sirve la oportunidad desactivada
+    assert indexed(index) == [(1, 2), (2, 2), (3, 2)]
+    assert index.hits == 1
+
+    # La última sincronización quedó más atrás que max_staleness
+    index._synced_at = time.monotonic() - 10
+    assert not index.is_current
+    assert indexed(index) == [(2, 2), (3, 2)]
+    assert index.fallbacks == 1
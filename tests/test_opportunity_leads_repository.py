@@ -0,0 +1,155 @@
+# tests/test_opportunity_leads_repository.py
+import pytest
+
+from benchmarks.datasets import make_opportunity_leads_docs
+from benchmarks.fake_cosmos import FakeCosmosAdapter, FakeCosmosContainer
+from core.exceptions import ConflictException, ConnectionErrorException
+from core.settings import settings
+from domain.models.opportunity_lead import OpportunityLead
+from infrastructure.repositories.opportunity_leads_repository import OpportunityLeadsRepository
+from infrastructure.repositories.per_lead_opportunity_leads_repository import (
+    TRANSACTIONAL_BATCH_LIMIT,
+    PerLeadOpportunityLeadsRepository,
+)
+
+
+class CountingContainer(FakeCosmosContainer):
+    """Contenedor en memoria que guarda los batch transaccionales que recibe."""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def execute_item_batch(self, batch_operations, partition_key=None, **kwargs):
+        self.batches.append(list(batch_operations))
+        return super().execute_item_batch(batch_operations, partition_key, **kwargs)
+
+
+def embedded_repository(docs):
+    container = FakeCosmosContainer()
+    container.load(docs)
+    return OpportunityLeadsRepository(FakeCosmosAdapter({settings.COSMOS_OPPORTUNITY_LEADS_CONTAINER: container}))
+
+
+class HeaderContainer(FakeCosmosContainer):
+    """Contenedor en memoria que entrega al response_hook de patch_item las cabeceras indicadas."""
+
+    def __init__(self, headers):
+        super().__init__()
+        self.headers = headers
+
+    def patch_item(self, item, partition_key, patch_operations, response_hook=None, **kwargs):
+        response = super().patch_item(item, partition_key, patch_operations, **kwargs)
+        response_hook(self.headers(self.read_item(item)["_etag"]), None)
+        return response
+
+
+def per_lead_repository():
+    container = CountingContainer()
+    return PerLeadOpportunityLeadsRepository(FakeCosmosAdapter({settings.COSMOS_OPPORTUNITY_LEAD_DOCUMENTS_CONTAINER: container}))
+
+
+def opportunity(leads: int):
+    doc = make_opportunity_leads_docs(1, leads)[0]
+    return embedded_repository([])._map_to_domain(doc)
+
+
+def test_get_leads_reads_wrapped_and_bare_leads():
+    doc = make_opportunity_leads_docs(1, 3)[0]
+    # Documentos antiguos guardan el lead sin envolver en {"lead": ...}
+    doc["leads"][1] = doc["leads"][1]["lead"]
+    repository = embedded_repository([doc])
+
+    page = repository.get_leads(doc["OpportunityId"], doc["IdAgte"])
+
+    assert page.items == [OpportunityLead.model_validate(l.get("lead", l)) for l in doc["leads"]]
+
+
+def test_get_leads_pages_with_continuation():
+    doc = make_opportunity_leads_docs(1, 5)[0]
+    repository = embedded_repository([doc])
+
+    first = repository.get_leads(doc["OpportunityId"], doc["IdAgte"], page_size=3)
+    second = repository.get_leads(doc["OpportunityId"], doc["IdAgte"], first.continuation, page_size=3)
+
+    assert len(first.items) == 3
+    assert len(second.items) == 2
+    assert second.continuation is None
+
+
+def test_per_lead_update_splits_into_transactional_batches():
+    repository = per_lead_repository()
+    large = opportunity(250)
+
+    repository.update(large)
+
+    batches = repository.container.batches
+    assert all(len(batch) <= TRANSACTIONAL_BATCH_LIMIT for batch in batches)
+    assert len(batches) == 3
+    # Cada batch lleva una operación sobre la cabecera; la nueva cabecera solo va en el último
+    assert [batch[-1][0] for batch in batches] == ["upsert", "upsert", "create"]
+    stored = repository.get_by_opportunity_id_and_agte(large.OpportunityId, large.IdAgte)
+    assert stored.leads == large.leads
+
+
+def test_per_lead_update_conditions_every_batch_on_the_header_etag():
+    repository = per_lead_repository()
+    large = opportunity(250)
+    repository.update(large)
+    repository.container.batches.clear()
+
+    repository.update(large.model_copy(update={"Priority": 9}))
+
+    headers = [batch[-1] for batch in repository.container.batches]
+    assert all(operation[0] == "replace" and operation[2]["if_match_etag"] for operation in headers)
+    assert len({operation[2]["if_match_etag"] for operation in headers}) == len(headers)
+    assert repository.get_by_opportunity_id_and_agte(large.OpportunityId, large.IdAgte).Priority == 9
+
+
+def test_per_lead_update_removes_leftover_leads():
+    repository = per_lead_repository()
+    large = opportunity(120)
+    repository.update(large)
+
+    small = large.model_copy(update={"leads": large.leads[:10]})
+    repository.update(small)
+
+    lead_docs = [doc for doc in repository.container.query_items("SELECT * FROM c") if doc["docType"] == "lead"]
+    assert len(lead_docs) == 10
+    assert repository.get_by_opportunity_id_and_agte(small.OpportunityId, small.IdAgte).leads == small.leads
+
+
+def test_per_lead_update_conflicts_when_header_changed(monkeypatch):
+    repository = per_lead_repository()
+    original = opportunity(3)
+    repository.update(original)
+    stale = repository._read_header(original.OpportunityId, original.IdAgte)
+    repository.update(original.model_copy(update={"Priority": 7}))
+    monkeypatch.setattr(repository, "_read_header", lambda opportunity_id, id_agte: stale)
+
+    with pytest.raises(ConflictException):
+        repository.update(original.model_copy(update={"Priority": 8}))
+
+    assert repository.get_by_opportunity_id_and_agte(original.OpportunityId, original.IdAgte).Priority == 7
+
+
+def test_patch_status_reads_etag_header_in_any_case():
+    doc = make_opportunity_leads_docs(1, 1)[0]
+    container = HeaderContainer(lambda etag: {"ETag": etag})
+    container.load([doc])
+    repository = OpportunityLeadsRepository(FakeCosmosAdapter({settings.COSMOS_OPPORTUNITY_LEADS_CONTAINER: container}))
+
+    claimed = repository.patch_status(repository._map_to_domain(container.read_item(doc["id"])), 2)
+
+    assert claimed.etag == container.read_item(doc["id"])["_etag"]
+    assert repository.patch_status(claimed, 1).Status == 1
+
+
+def test_patch_status_fails_without_etag_header():
+    doc = make_opportunity_leads_docs(1, 1)[0]
+    container = HeaderContainer(lambda etag: {})
+    container.load([doc])
+    repository = OpportunityLeadsRepository(FakeCosmosAdapter({settings.COSMOS_OPPORTUNITY_LEADS_CONTAINER: container}))
+
+    with pytest.raises(ConnectionErrorException):
+        repository.patch_status(repository._map_to_domain(container.read_item(doc["id"])), 2)
@@ -0,0 +1,129 @@
+# tests/test_opportunity_summary_store_service.py
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from application.services.opportunity_summary_service import OpportunitySummaryService
+from application.services.opportunity_summary_store_service import (
+    MAX_SAVE_ATTEMPTS,
+    MaterializedOpportunitySummaryService,
+    OpportunitySummaryMaintainer,
+    materialize,
+)
+from benchmarks.datasets import make_opportunity_detail_docs, make_opportunity_leads_docs
+from benchmarks.fake_cosmos import FakeCosmosAdapter, FakeCosmosContainer
+from core.settings import settings
+from infrastructure.repositories.opportunity_detail_repository import OpportunityDetailRepository
+from infrastructure.repositories.opportunity_leads_repository import OpportunityLeadsRepository
+from infrastructure.repositories.opportunity_summary_store_repository import OpportunitySummaryStoreRepository
+
+ID_AGTE = 1
+
+
+class ConflictingContainer(FakeCosmosContainer):
+    """Antes de cada replace condicionado, otro proceso modifica el documento mientras quedan conflicts."""
+
+    def __init__(self):
+        super().__init__()
+        self.conflicts = 0
+        self.replaces = 0
+
+    def replace_item(self, item, body, etag=None, match_condition=None, **kwargs):
+        self.replaces += 1
+        if self.conflicts:
+            self.conflicts -= 1
+            self.load([self.read_item(item)])
+        return super().replace_item(item, body, etag, match_condition, **kwargs)
+
+
+@pytest.fixture
+def containers():
+    opportunities = FakeCosmosContainer()
+    opportunities.load(make_opportunity_leads_docs(3, 2))
+    details = FakeCosmosContainer()
+    details.load(make_opportunity_detail_docs(3))
+    return opportunities, details, ConflictingContainer()
+
+
+@pytest.fixture
+def maintainer(containers):
+    opportunities, details, summaries = containers
+    adapter = FakeCosmosAdapter({
+        settings.COSMOS_OPPORTUNITY_LEADS_CONTAINER: opportunities,
+        settings.COSMOS_OPPORTUNITY_DETAIL_CONTAINER: details,
+        settings.COSMOS_OPPORTUNITY_SUMMARY_CONTAINER: summaries,
+    })
+    detail_repo = OpportunityDetailRepository(adapter)
+    return OpportunitySummaryMaintainer(
+        OpportunitySummaryStoreRepository(adapter),
+        OpportunitySummaryService(detail_repo, OpportunityLeadsRepository(adapter)),
+        detail_repo,
+    )
+
+
+def opportunity(containers, maintainer, opportunity_id, **fields):
+    """Escribe el cambio directamente en Cosmos y devuelve la oportunidad actualizada."""
+    doc = containers[0].read_item(f"{opportunity_id}-{ID_AGTE}")
+    doc.update(fields)
+    containers[0].load([doc])
+    return maintainer.summary_service.opportunity_leads_repository.get_by_opportunity_id_and_agte(opportunity_id, ID_AGTE)
+
+
+def stored_ids(maintainer):
+    return [summary.OpportunityId for summary in maintainer.store.get(ID_AGTE).summaries]
+
+
+def test_opportunity_change_retries_on_etag_conflict(containers, maintainer):
+    maintainer.rebuild_agent(ID_AGTE)
+    rebuilt_at = maintainer.store.get(ID_AGTE).rebuilt_at
+    containers[2].conflicts = MAX_SAVE_ATTEMPTS - 1
+
+    maintainer.apply_opportunity_change(opportunity(containers, maintainer, 2, Status=0))
+
+    assert containers[2].replaces == MAX_SAVE_ATTEMPTS
+    assert stored_ids(maintainer) == [1, 3]
+    # Se aplicó de forma incremental: el último recálculo completo no cambia
+    assert maintainer.store.get(ID_AGTE).rebuilt_at == rebuilt_at
+
+
+def test_repeated_conflicts_fall_back_to_a_full_rebuild(containers, maintainer):
+    maintainer.rebuild_agent(ID_AGTE)
+    rebuilt_at = maintainer.store.get(ID_AGTE).rebuilt_at
+    containers[2].conflicts = MAX_SAVE_ATTEMPTS
+
+    maintainer.apply_opportunity_change(opportunity(containers, maintainer, 2, Status=0))
+
+    assert containers[2].replaces == MAX_SAVE_ATTEMPTS
+    assert stored_ids(maintainer) == [1, 3]
+    assert maintainer.store.get(ID_AGTE).rebuilt_at > rebuilt_at
+
+
+def test_expired_summary_is_rebuilt(containers, maintainer):
+    expected = maintainer.summary_service.list_opportunity_summary_by_agte_id(ID_AGTE)
+    # Resumen guardado hace una hora con una entrada que ya no existe en OpportunityLeads
+    stale = materialize(ID_AGTE, expected[:1], rebuilt_at=datetime.now(timezone.utc) - timedelta(hours=1))
+    maintainer.store.save(stale)
+    service = MaterializedOpportunitySummaryService(maintainer.store, maintainer, max_age=60)
+
+    assert [summary.OpportunityId for summary in service.list_opportunity_summary_by_agte_id(ID_AGTE)] == [1, 2, 3]
+    assert maintainer.store.get(ID_AGTE).rebuilt_at > stale.rebuilt_at
+
+
+def test_fresh_summary_is_served_without_rebuild(containers, maintainer):
+    expected = maintainer.summary_service.list_opportunity_summary_by_agte_id(ID_AGTE)
+    maintainer.store.save(materialize(ID_AGTE, expected[:1]))
+    service = MaterializedOpportunitySummaryService(maintainer.store, maintainer, max_age=60)
+
+    assert [summary.OpportunityId for summary in service.list_opportunity_summary_by_agte_id(ID_AGTE)] == [1]
+
+
+def test_check_reports_differing_opportunities(containers, maintainer):
+    assert maintainer.check(ID_AGTE) == [1, 2, 3]
+
+    maintainer.rebuild_agent(ID_AGTE)
+    assert maintainer.check(ID_AGTE) == []
+
+    # Cambios escritos por otro proceso sin pasar por el mantenedor
+    opportunity(containers, maintainer, 1, Status=0)
+    opportunity(containers, maintainer, 3, Priority=9)
+    assert maintainer.check(ID_AGTE) == [1, 3]
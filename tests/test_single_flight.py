@@ -0,0 +1,226 @@
+# tests/test_single_flight.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.settings import settings
+from core.single_flight import AsyncSingleFlight, SingleFlight, single_flight
+
+KEY = ("opportunity", 1)
+
+
+def wait_for_followers(group: SingleFlight, key, followers: int, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with group._lock:
+            call = group._calls.get(key)
+            if call is not None and call.followers >= followers:
+                return
+        time.sleep(0.001)
+    raise AssertionError(f"No se unieron {followers} seguidoras a tiempo")
+
+
+def run_threads(count: int, target) -> list:
+    results = [None] * count
+
+    def run(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_concurrent_calls_share_one_execution():
+    group = SingleFlight("test_threads")
+    release = threading.Event()
+    executions = []
+
+    def fetch():
+        executions.append(1)
+        release.wait(2)
+        return {"leads": [1, 2, 3]}
+
+    threads, results = run_threads(5, lambda: group.do(KEY, fetch))
+    wait_for_followers(group, KEY, 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(executions) == 1
+    assert all(result == {"leads": [1, 2, 3]} for result in results)
+    assert group.stats()["coalesced"] == 4
+
+
+def test_error_reaches_every_caller():
+    group = SingleFlight("test_threads_error")
+    release = threading.Event()
+
+    def fetch():
+        release.wait(2)
+        raise ValueError("cosmos no responde")
+
+    threads, results = run_threads(4, lambda: group.do(KEY, fetch))
+    wait_for_followers(group, KEY, 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(isinstance(result, ValueError) and str(result) == "cosmos no responde" for result in results)
+    # Tras el fallo la clave queda libre y la siguiente llamada vuelve a ejecutar
+    assert group.do(KEY, lambda: "ok") == "ok"
+
+
+def test_callers_receive_independent_copies():
+    group = SingleFlight("test_threads_copies")
+    release = threading.Event()
+
+    def fetch():
+        release.wait(2)
+        return {"leads": [1, 2, 3]}
+
+    def mutate():
+        result = group.do(KEY, fetch)
+        result["leads"].append(4)
+        return result
+
+    threads, results = run_threads(3, mutate)
+    wait_for_followers(group, KEY, 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(result["leads"] == [1, 2, 3, 4] for result in results)
+    assert len({id(result) for result in results}) == 3
+    assert len({id(result["leads"]) for result in results}) == 3
+
+
+def test_different_keys_do_not_coalesce():
+    group = SingleFlight("test_threads_keys")
+    assert group.do(("a",), lambda: 1) == 1
+    assert group.do(("b",), lambda: 2) == 2
+    assert group.stats()["executions"] == 2
+
+
+def test_async_concurrent_calls_share_one_execution():
+    group = AsyncSingleFlight("test_async")
+    executions = []
+
+    async def fetch():
+        executions.append(1)
+        await asyncio.sleep(0.05)
+        return {"leads": [1, 2, 3]}
+
+    async def main():
+        return await asyncio.gather(*(group.do(KEY, fetch) for _ in range(5)))
+
+    results = asyncio.run(main())
+
+    assert len(executions) == 1
+    assert all(result == {"leads": [1, 2, 3]} for result in results)
+    assert group.stats()["coalesced"] == 4
+
+
+def test_async_error_reaches_every_caller():
+    group = AsyncSingleFlight("test_async_error")
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("cosmos no responde")
+
+    async def main():
+        return await asyncio.gather(*(group.do(KEY, fetch) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_async_leader_cancellation_does_not_cancel_followers():
+    group = AsyncSingleFlight("test_async_cancel")
+    executions = []
+
+    async def fetch():
+        executions.append(1)
+        await asyncio.sleep(0.05)
+        return "resultado"
+
+    async def main():
+        leader = asyncio.ensure_future(group.do(KEY, fetch))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(group.do(KEY, fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    assert asyncio.run(main()) == ["resultado", "resultado"]
+    assert len(executions) == 1
+
+
+def test_async_callers_receive_independent_copies():
+    group = AsyncSingleFlight("test_async_copies")
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return {"leads": [1, 2, 3]}
+
+    async def mutate():
+        result = await group.do(KEY, fetch)
+        result["leads"].append(4)
+        return result
+
+    async def main():
+        return await asyncio.gather(*(mutate() for _ in range(3)))
+
+    results = asyncio.run(main())
+
+    assert all(result["leads"] == [1, 2, 3, 4] for result in results)
+    assert len({id(result["leads"]) for result in results}) == 3
+
+
+class Repository:
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+
+    @single_flight
+    def get(self, opportunity_id: int):
+        self.calls += 1
+        self.release.wait(2)
+        return [opportunity_id]
+
+
+def test_decorator_coalesces_across_instances():
+    first, second = Repository(), Repository()
+    threads, results = run_threads(2, lambda: first.get(7))
+    time.sleep(0.05)
+    other_thread, other_results = run_threads(1, lambda: second.get(7))
+    time.sleep(0.05)
+    first.release.set()
+    second.release.set()
+    for thread in threads + other_thread:
+        thread.join()
+
+    assert results + other_results == [[7], [7], [7]]
+    assert first.calls + second.calls == 1
+
+
+def test_decorator_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "SINGLE_FLIGHT_ENABLED", False)
+    repository = Repository()
+    repository.release.set()
+
+    threads, results = run_threads(3, lambda: repository.get(7))
+    for thread in threads:
+        thread.join()
+
+    assert results == [[7], [7], [7]]
+    assert repository.calls == 3
@@ -0,0 +1,163 @@
+# tests/test_sql_connection_pool.py
+import threading
+import time
+
+import pytest
+
+# El módulo del pool importa pyodbc, que necesita el driver ODBC del sistema
+pytest.importorskip("pyodbc", exc_type=ImportError)
+
+from core.exceptions import ConnectionErrorException  # noqa: E402
+from infrastructure.adapters import sql_server_adapter  # noqa: E402
+from infrastructure.adapters.sql_server_adapter import SqlConnectionPool  # noqa: E402
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, query, *params):
+        if self.connection.broken:
+            raise RuntimeError("conexión perdida")
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.broken = False
+        self.closed = False
+        self.rollback_fails = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        if self.rollback_fails:
+            raise RuntimeError("rollback imposible")
+
+    def close(self):
+        self.closed = True
+
+
+class Connector:
+    def __init__(self):
+        self.connections = []
+
+    def __call__(self):
+        connection = FakeConnection()
+        self.connections.append(connection)
+        return connection
+
+
+@pytest.fixture
+def connector():
+    return Connector()
+
+
+def test_open_creates_min_size_connections(connector):
+    pool = SqlConnectionPool(connector, min_size=2, max_size=5)
+    pool.open()
+
+    assert len(connector.connections) == 2
+    assert pool.stats()["idle"] == 2
+
+
+def test_connections_are_reused(connector):
+    pool = SqlConnectionPool(connector, min_size=0, max_size=5)
+    for _ in range(3):
+        with pool.connection():
+            pass
+
+    assert len(connector.connections) == 1
+    assert pool.stats()["checkouts"] == 3
+
+
+def test_acquire_times_out_when_pool_is_exhausted(connector):
+    pool = SqlConnectionPool(connector, min_size=0, max_size=1, timeout=0.05)
+    pool.acquire()
+
+    with pytest.raises(ConnectionErrorException):
+        pool.acquire()
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_waiter_gets_released_connection(connector):
+    pool = SqlConnectionPool(connector, min_size=0, max_size=1, timeout=2)
+    held = pool.acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.05)
+
+    pool.release(held)
+    waiter.join()
+
+    assert acquired[0] is held
+    assert len(connector.connections) == 1
+
+
+def test_failed_rollback_discards_connection(connector):
+    pool = SqlConnectionPool(connector, min_size=0, max_size=2)
+
+    with pytest.raises(ValueError):
+        with pool.connection() as connection:
+            connection.rollback_fails = True
+            raise ValueError("consulta fallida")
+
+    assert connector.connections[0].closed
+    assert pool.stats()["idle"] == 0
+    with pool.connection() as connection:
+        assert connection is connector.connections[1]
+
+
+def test_invalid_idle_connection_is_replaced(connector, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sql_server_adapter.time, "monotonic", lambda: now[0])
+    pool = SqlConnectionPool(connector, min_size=0, max_size=2, validation_interval=30, idle_timeout=300)
+    with pool.connection() as connection:
+        pass
+    connection.broken = True
+
+    now[0] += 31
+    with pool.connection() as replacement:
+        pass
+
+    assert replacement is not connection
+    assert connection.closed
+    assert pool.stats()["discarded"] == 1
+
+
+def test_idle_connections_above_min_size_are_evicted(connector, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sql_server_adapter.time, "monotonic", lambda: now[0])
+    pool = SqlConnectionPool(connector, min_size=1, max_size=3, idle_timeout=60, validation_interval=600)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+
+    now[0] += 61
+    pooled = pool.acquire()
+
+    assert first.connection.closed
+    assert pooled is second
+    assert pool.stats()["size"] == 1
+
+
+def test_close_rejects_new_checkouts(connector):
+    pool = SqlConnectionPool(connector, min_size=1, max_size=2)
+    pool.open()
+    pool.close()
+
+    assert connector.connections[0].closed
+    with pytest.raises(ConnectionErrorException):
+        pool.acquire()
+
+
+def test_invalid_sizes_are_rejected(connector):
+    with pytest.raises(ValueError):
+        SqlConnectionPool(connector, min_size=3, max_size=2)